@@ -1,8 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 from ...domain.entities.task import Task
+from ...domain.repositories.task_repository import TaskSummary
 from ...domain.value_objects.task_status import TaskStatus
 
 
@@ -17,6 +18,8 @@ class TaskDTO:
     user_id: str
     created_at: Optional[str]
     updated_at: Optional[str]
+    # タスクの現在の版（レスポンス用。更新の条件には使わず、変更前の版は `expected_version` で別に指定する）
+    version: Optional[int] = None
 
     @classmethod
     def from_entity(cls, task: Task) -> "TaskDTO":
@@ -30,6 +33,7 @@ class TaskDTO:
             user_id=task.user_id,
             created_at=task.created_at.isoformat() if task.created_at else None,
             updated_at=task.updated_at.isoformat() if task.updated_at else None,
+            version=task.version,
         )
 
     def to_entity(self) -> Task:
@@ -43,4 +47,27 @@ class TaskDTO:
             user_id=self.user_id,
             created_at=datetime.fromisoformat(self.created_at) if self.created_at else None,
             updated_at=datetime.fromisoformat(self.updated_at) if self.updated_at else None,
+            # 版は書き込みのたびにリポジトリが進めるため、エンティティの値は新しいタスクの初期値としてのみ使われる
+            version=self.version if self.version is not None else 1,
+        )
+
+
+@dataclass
+class TaskPageDTO:
+    """タスク一覧の1ページ分のデータ転送オブジェクト"""
+    tasks: List[TaskDTO] = field(default_factory=list)
+    next_token: Optional[str] = None
+
+
+@dataclass
+class TaskSummaryDTO:
+    """ユーザーのステータスごとのタスク数のデータ転送オブジェクト"""
+    total: int
+    by_status: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_summary(cls, summary: TaskSummary) -> "TaskSummaryDTO":
+        return cls(
+            total=summary.total,
+            by_status={status.value: summary.counts.get(status, 0) for status in TaskStatus},
         )
@@ -1,10 +1,22 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 
 from ...domain.entities.task import Task
+from ...domain.repositories.task_repository import TaskChangePage, TaskItemPage
 from ...domain.services.task_service import TaskService
 from ...domain.value_objects.task_status import TaskStatus
-from ..dtos.task_dto import TaskDTO
+from ...shared import tracing
+from ..dtos.task_dto import TaskDTO, TaskPageDTO, TaskSummaryDTO
+
+# 一覧取得時のページサイズ
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+# 一括操作の1リクエストあたりの上限
+MAX_BATCH_SIZE = 100
+# 一覧の並べ替え（値は降順かどうか）
+SORT_ORDERS = {None: False, 'due_date': False, '-due_date': True}
+# 作成順の並べ替え（タスクIDの順）
+CREATED_SORT_ORDERS = {'created_at': False, '-created_at': True}
 
 
 class TaskUseCases:
@@ -13,38 +25,183 @@ class TaskUseCases:
     def __init__(self, task_service: TaskService):
         self._task_service = task_service
 
+    @tracing.traced('use_case.create_task')
     def create_task(self, task_dto: TaskDTO) -> TaskDTO:
         """新しいタスクを作成する"""
         task = task_dto.to_entity()
         created_task = self._task_service.create_task(task)
         return TaskDTO.from_entity(created_task)
 
+    @tracing.traced('use_case.create_tasks')
+    def create_tasks(self, task_dtos: List[TaskDTO]) -> List[TaskDTO]:
+        """複数のタスクを一括で作成する"""
+        self._validate_batch_size(len(task_dtos))
+        tasks = [task_dto.to_entity() for task_dto in task_dtos]
+        created_tasks = self._task_service.create_tasks(tasks)
+        return [TaskDTO.from_entity(task) for task in created_tasks]
+
+    @tracing.traced('use_case.get_task')
     def get_task(self, task_id: str, user_id: str) -> Optional[TaskDTO]:
         """特定のタスクを取得する"""
         task = self._task_service._task_repository.find_by_id(task_id, user_id)
         return TaskDTO.from_entity(task) if task else None
 
-    def get_all_tasks(self, user_id: str) -> List[TaskDTO]:
-        """ユーザーのすべてのタスクを取得する"""
-        tasks = self._task_service._task_repository.find_all_by_user_id(user_id)
+    @tracing.traced('use_case.get_tasks')
+    def get_tasks(self, task_ids: List[str], user_id: str) -> List[TaskDTO]:
+        """複数のタスクを一括で取得する"""
+        self._validate_batch_size(len(task_ids))
+        tasks = self._task_service._task_repository.find_many(task_ids, user_id)
         return [TaskDTO.from_entity(task) for task in tasks]
 
-    def update_task(self, task_dto: TaskDTO) -> TaskDTO:
-        """タスクを更新する"""
-        task = task_dto.to_entity()
-        updated_task = self._task_service.update_task(task)
-        return TaskDTO.from_entity(updated_task)
+    @tracing.traced('use_case.get_all_tasks')
+    def get_all_tasks(
+        self, user_id: str, limit: Optional[int] = None, next_token: Optional[str] = None
+    ) -> TaskPageDTO:
+        """ユーザーのタスクをページ単位で取得する"""
+        page = self._task_service._task_repository.find_page_by_user_id(
+            user_id, self._resolve_limit(limit), next_token
+        )
+        return TaskPageDTO(
+            tasks=[TaskDTO.from_entity(task) for task in page.tasks],
+            next_token=page.next_token
+        )
+
+    @tracing.traced('use_case.get_all_task_items')
+    def get_all_task_items(
+        self, user_id: str, limit: Optional[int] = None, next_token: Optional[str] = None
+    ) -> TaskItemPage:
+        """ユーザーのタスクを読み取り専用の属性の辞書としてページ単位で取得する
+
+        エンティティやDTOを構築しないため、そのままレスポンスにエンコードできる。
+        """
+        return self._task_service._task_repository.find_item_page_by_user_id(
+            user_id, self._resolve_limit(limit), next_token
+        )
+
+    @tracing.traced('use_case.get_task_changes')
+    def get_task_changes(
+        self, user_id: str, since: str, limit: Optional[int] = None, next_token: Optional[str] = None
+    ) -> TaskChangePage:
+        """指定した時刻（ISO 8601）以降に変更・削除されたタスクを取得する"""
+        since_datetime = self._parse_timestamp(since, 'since')
+        return self._task_service._task_repository.find_changes_since(
+            user_id, since_datetime, self._resolve_limit(limit), next_token
+        )
+
+    @tracing.traced('use_case.search_task_items')
+    def search_task_items(
+        self,
+        user_id: str,
+        status: Optional[str] = None,
+        due_after: Optional[str] = None,
+        due_before: Optional[str] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        next_token: Optional[str] = None,
+        created_after: Optional[str] = None
+    ) -> TaskItemPage:
+        """ステータス・期限で絞り込み、期限順に並べたタスクをページ単位で取得する
+
+        `sort` は `due_date`（昇順）または `-due_date`（降順）。
+        `sort` に `created_at` / `-created_at` を指定するか `created_after` を指定した場合は、
+        作成順（タスクIDの順）に取得する（ステータス・期限の絞り込みとは併用できない。
+        作成順になるのはUUIDv7のIDのタスクのみ）。
+        """
+        if sort not in SORT_ORDERS and sort not in CREATED_SORT_ORDERS:
+            orders = [order for order in SORT_ORDERS if order] + list(CREATED_SORT_ORDERS)
+            raise ValueError(f"sort must be one of: {', '.join(orders)}")
+        resolved_limit = self._resolve_limit(limit)
+        repository = self._task_service._task_repository
+
+        if created_after or sort in CREATED_SORT_ORDERS:
+            if status or due_after or due_before:
+                raise ValueError('created_after and sort=created_at cannot be combined with status or due date filters')
+            created_after_datetime = self._parse_timestamp(created_after, 'created_after') if created_after else None
+            return repository.find_created_after(
+                user_id, created_after_datetime, resolved_limit, next_token, CREATED_SORT_ORDERS.get(sort, False)
+            )
+
+        descending = SORT_ORDERS[sort]
+        due_after_datetime = self._parse_timestamp(due_after, 'due_after') if due_after else None
+        due_before_datetime = self._parse_timestamp(due_before, 'due_before') if due_before else None
+        if due_after_datetime and due_before_datetime and due_after_datetime > due_before_datetime:
+            raise ValueError('due_after must not be later than due_before')
 
+        if status:
+            return repository.find_by_user_and_status(
+                user_id, TaskStatus(status), resolved_limit, next_token,
+                due_after_datetime, due_before_datetime, descending
+            )
+        return repository.find_due_between(
+            user_id, due_after_datetime, due_before_datetime, resolved_limit, next_token, descending
+        )
+
+    @tracing.traced('use_case.get_task_summary')
+    def get_task_summary(self, user_id: str) -> TaskSummaryDTO:
+        """ユーザーのステータスごとのタスク数を取得する（タスク数によらず1回の読み込み）"""
+        summary = self._task_service._task_repository.get_summary(user_id)
+        return TaskSummaryDTO.from_summary(summary)
+
+    @tracing.traced('use_case.delete_task')
     def delete_task(self, task_id: str, user_id: str) -> bool:
         """タスクを削除する"""
         return self._task_service.delete_task(task_id, user_id)
 
-    def update_task_status(self, task_id: str, user_id: str, status: str) -> TaskDTO:
-        """タスクのステータスを更新する"""
-        task = self._task_service._task_repository.find_by_id(task_id, user_id)
-        if not task:
-            raise ValueError(f"Task with ID {task_id} not found")
-        
-        task.update_status(TaskStatus(status))
-        updated_task = self._task_service._task_repository.save(task)
+    @tracing.traced('use_case.delete_tasks')
+    def delete_tasks(self, task_ids: List[str], user_id: str) -> int:
+        """複数のタスクを一括で削除する"""
+        self._validate_batch_size(len(task_ids))
+        return self._task_service.delete_tasks(task_ids, user_id)
+
+    @tracing.traced('use_case.patch_task')
+    def patch_task(
+        self, task_id: str, user_id: str, changes: Dict[str, Any], expected_version: Optional[int] = None
+    ) -> TaskDTO:
+        """タスクの一部のフィールドを更新する"""
+        updated_task = self._task_service.update_task_fields(
+            task_id, user_id, self._to_domain_changes(changes), expected_version
+        )
         return TaskDTO.from_entity(updated_task)
+
+    @tracing.traced('use_case.update_task_status')
+    def update_task_status(
+        self, task_id: str, user_id: str, status: str, expected_version: Optional[int] = None
+    ) -> TaskDTO:
+        """タスクのステータスを更新する"""
+        return self.patch_task(task_id, user_id, {'status': status}, expected_version)
+
+    @staticmethod
+    def _to_domain_changes(changes: Dict[str, Any]) -> Dict[str, Any]:
+        """APIの値をエンティティの型に変換する"""
+        domain_changes: Dict[str, Any] = {}
+        for name, value in changes.items():
+            if name == 'status':
+                value = TaskStatus(value)
+            elif name == 'due_date':
+                value = datetime.fromisoformat(value) if value else None
+            domain_changes[name] = value
+        return domain_changes
+
+    @staticmethod
+    def _validate_batch_size(size: int) -> None:
+        if size < 1 or size > MAX_BATCH_SIZE:
+            raise ValueError(f"Batch size must be between 1 and {MAX_BATCH_SIZE}")
+
+    @staticmethod
+    def _parse_timestamp(value: str, name: str) -> datetime:
+        """ISO 8601の時刻を、保存している形式（タイムゾーンなしのUTC）に変換する"""
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError as e:
+            raise ValueError(f'{name} must be an ISO 8601 timestamp') from e
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+
+    @staticmethod
+    def _resolve_limit(limit: Optional[int]) -> int:
+        if limit is None:
+            return DEFAULT_PAGE_LIMIT
+        if limit < 1 or limit > MAX_PAGE_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_LIMIT}")
+        return limit
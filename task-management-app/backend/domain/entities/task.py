@@ -1,13 +1,33 @@
 from datetime import datetime
-from typing import Optional, List
-from uuid import uuid4
+from typing import ClassVar, Optional, List
 
+from ..value_objects.task_id import TaskIdGenerator, uuid7
 from ..value_objects.task_status import TaskStatus
 
 
+# 値からステータスへの変換表（Enumの呼び出しより高速）
+_STATUS_BY_VALUE = {status.value: status for status in TaskStatus}
+
+
 class Task:
     """タスクエンティティ"""
 
+    # インスタンスごとの__dict__を持たない
+    __slots__ = (
+        '_task_id',
+        '_title',
+        '_description',
+        '_status',
+        '_due_date',
+        '_user_id',
+        '_created_at',
+        '_updated_at',
+        '_version',
+    )
+
+    # 新しいタスクのIDを生成する関数（既定は作成順に並ぶUUIDv7。差し替える場合はクラス属性を置き換える）
+    id_generator: ClassVar[TaskIdGenerator] = uuid7
+
     def __init__(
         self,
         title: str,
@@ -18,8 +38,9 @@ class Task:
         due_date: Optional[datetime] = None,
         created_at: Optional[datetime] = None,
         updated_at: Optional[datetime] = None,
+        version: int = 1,
     ):
-        self._task_id = task_id if task_id else str(uuid4())
+        self._task_id = task_id if task_id else type(self).id_generator()
         self._title = title
         self._description = description
         self._status = status
@@ -27,6 +48,8 @@ class Task:
         self._user_id = user_id
         self._created_at = created_at if created_at else datetime.now()
         self._updated_at = updated_at if updated_at else datetime.now()
+        # 書き込みのたびに1ずつ増える版（楽観的排他制御に使用する）
+        self._version = version
 
     @property
     def task_id(self) -> str:
@@ -60,6 +83,10 @@ class Task:
     def updated_at(self) -> datetime:
         return self._updated_at
 
+    @property
+    def version(self) -> int:
+        return self._version
+
     def update_title(self, title: str) -> None:
         self._title = title
         self._updated_at = datetime.now()
@@ -86,17 +113,36 @@ class Task:
             "user_id": self._user_id,
             "created_at": self._created_at.isoformat(),
             "updated_at": self._updated_at.isoformat(),
+            "version": self._version,
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> "Task":
-        return cls(
-            task_id=data.get("task_id"),
-            title=data.get("title"),
-            description=data.get("description"),
-            status=TaskStatus(data.get("status")),
-            due_date=datetime.fromisoformat(data.get("due_date")) if data.get("due_date") else None,
-            user_id=data.get("user_id"),
-            created_at=datetime.fromisoformat(data.get("created_at")) if data.get("created_at") else None,
-            updated_at=datetime.fromisoformat(data.get("updated_at")) if data.get("updated_at") else None,
-        )
+        """辞書からエンティティを復元する
+
+        __init__を経由せず、各キーを1回だけ参照してスロットに直接設定する。
+        """
+        get = data.get
+        task = cls.__new__(cls)
+
+        task._task_id = get("task_id") or cls.id_generator()
+        task._title = get("title")
+        task._description = get("description")
+
+        status = get("status")
+        try:
+            task._status = _STATUS_BY_VALUE[status]
+        except (KeyError, TypeError):
+            task._status = TaskStatus(status)
+
+        due_date = get("due_date")
+        task._due_date = datetime.fromisoformat(due_date) if due_date else None
+        task._user_id = get("user_id")
+
+        created_at = get("created_at")
+        updated_at = get("updated_at")
+        task._created_at = datetime.fromisoformat(created_at) if created_at else datetime.now()
+        task._updated_at = datetime.fromisoformat(updated_at) if updated_at else datetime.now()
+        # 版のない項目（版の導入前に作成されたタスク）は0とする。DynamoDBの数値はDecimalで返される
+        task._version = int(get("version") or 0)
+        return task
@@ -0,0 +1,22 @@
+class TaskNotFoundError(ValueError):
+    """対象のタスクが存在しない"""
+
+    def __init__(self, task_id: str):
+        super().__init__(f"Task with ID {task_id} not found")
+        self.task_id = task_id
+
+
+class TaskBatchError(Exception):
+    """一括操作の一部が再試行後も処理されなかった"""
+
+    def __init__(self, unprocessed_count: int):
+        super().__init__(f"{unprocessed_count} items were not processed")
+        self.unprocessed_count = unprocessed_count
+
+
+class TaskConflictError(Exception):
+    """並行した変更との競合が再試行後も解消しなかった"""
+
+    def __init__(self, task_id: str):
+        super().__init__(f"Task with ID {task_id} was modified concurrently")
+        self.task_id = task_id
@@ -1,7 +1,44 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
 
 from ..entities.task import Task
+from ..value_objects.task_status import TaskStatus
+
+
+@dataclass
+class TaskPage:
+    """タスク一覧の1ページ分の結果"""
+    tasks: List[Task] = field(default_factory=list)
+    next_token: Optional[str] = None
+
+
+@dataclass
+class TaskItemPage:
+    """タスク一覧の1ページ分の読み取り専用の属性"""
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    next_token: Optional[str] = None
+
+
+@dataclass
+class TaskChangePage:
+    """指定した時刻以降に変更・削除されたタスクの1ページ分の結果"""
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    deleted_task_ids: List[str] = field(default_factory=list)
+    # このページで最後に評価した変更の時刻（次回の同期の起点）
+    last_updated_at: Optional[str] = None
+    next_token: Optional[str] = None
+
+
+@dataclass
+class TaskSummary:
+    """ユーザーのステータスごとのタスク数"""
+    counts: Dict[TaskStatus, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
 
 
 class TaskRepository(ABC):
@@ -12,17 +49,115 @@ class TaskRepository(ABC):
         """タスクを保存する"""
         pass
 
+    @abstractmethod
+    def save_many(self, tasks: List[Task]) -> List[Task]:
+        """複数のタスクを一括で保存する"""
+        pass
+
+    @abstractmethod
+    def update_fields(
+        self, task_id: str, user_id: str, changes: Dict[str, Any], expected_version: Optional[int] = None
+    ) -> Optional[Task]:
+        """指定したフィールドのみを更新する（存在しない場合はNone）
+
+        `expected_version` を指定した場合、現在の版が一致しなければTaskConflictErrorとする。
+        """
+        pass
+
     @abstractmethod
     def find_by_id(self, task_id: str, user_id: str) -> Optional[Task]:
         """IDによるタスクの検索"""
         pass
 
+    @abstractmethod
+    def find_many(self, task_ids: List[str], user_id: str) -> List[Task]:
+        """複数のIDによるタスクの一括検索（存在しないIDは結果に含まれない）"""
+        pass
+
     @abstractmethod
     def find_all_by_user_id(self, user_id: str) -> List[Task]:
         """ユーザーIDに基づくすべてのタスクの取得"""
         pass
 
+    @abstractmethod
+    def iter_by_user_id(self, user_id: str, page_size: Optional[int] = None) -> Iterator[Task]:
+        """ユーザーIDに基づくタスクを逐次取得する"""
+        pass
+
+    @abstractmethod
+    def find_page_by_user_id(
+        self, user_id: str, limit: int, next_token: Optional[str] = None
+    ) -> TaskPage:
+        """ユーザーIDに基づくタスクをページ単位で取得する"""
+        pass
+
+    @abstractmethod
+    def find_item_page_by_user_id(
+        self, user_id: str, limit: int, next_token: Optional[str] = None
+    ) -> TaskItemPage:
+        """ユーザーIDに基づくタスクを、エンティティを構築せずに属性の辞書として取得する"""
+        pass
+
+    @abstractmethod
+    def find_by_user_and_status(
+        self,
+        user_id: str,
+        status: TaskStatus,
+        limit: int,
+        next_token: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        descending: bool = False
+    ) -> TaskItemPage:
+        """指定したステータスのタスクを期限順に取得する（期限の範囲で絞り込み可能）"""
+        pass
+
+    @abstractmethod
+    def find_due_between(
+        self,
+        user_id: str,
+        due_after: Optional[datetime],
+        due_before: Optional[datetime],
+        limit: int,
+        next_token: Optional[str] = None,
+        descending: bool = False
+    ) -> TaskItemPage:
+        """期限が範囲内のタスクを期限順に取得する"""
+        pass
+
+    @abstractmethod
+    def find_created_after(
+        self,
+        user_id: str,
+        created_after: Optional[datetime],
+        limit: int,
+        next_token: Optional[str] = None,
+        descending: bool = False
+    ) -> TaskItemPage:
+        """指定した時刻より後に作成されたタスクを作成順に取得する（Noneの場合はすべてのタスク）
+
+        作成順はタスクIDの順のため、作成時刻を含むID（UUIDv7）のタスクのみ正しく並ぶ。
+        """
+        pass
+
+    @abstractmethod
+    def find_changes_since(
+        self, user_id: str, since: datetime, limit: int, next_token: Optional[str] = None
+    ) -> TaskChangePage:
+        """指定した時刻以降に変更・削除されたタスクを変更の古い順に取得する（`since` と同じ時刻の変更を含む）"""
+        pass
+
+    @abstractmethod
+    def get_summary(self, user_id: str) -> TaskSummary:
+        """ユーザーのステータスごとのタスク数を取得する"""
+        pass
+
     @abstractmethod
     def delete(self, task_id: str, user_id: str) -> bool:
         """タスクの削除"""
         pass
+
+    @abstractmethod
+    def delete_many(self, task_ids: List[str], user_id: str) -> int:
+        """複数のタスクを一括で削除し、実際に削除した件数を返す（存在しないIDは数えない）"""
+        pass
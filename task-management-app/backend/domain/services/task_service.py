@@ -1,5 +1,9 @@
+from typing import Any, Dict, List, Optional
+
 from ..repositories.task_repository import TaskRepository
 from ..entities.task import Task
+from ..exceptions.task_exceptions import TaskNotFoundError
+from ...shared import tracing
 
 
 class TaskService:
@@ -8,20 +12,34 @@ class TaskService:
     def __init__(self, task_repository: TaskRepository):
         self._task_repository = task_repository
 
+    @tracing.traced('service.create_task')
     def create_task(self, task: Task) -> Task:
         """新しいタスクを作成する"""
         return self._task_repository.save(task)
 
-    def update_task(self, task: Task) -> Task:
-        """既存のタスクを更新する"""
-        existing_task = self._task_repository.find_by_id(task.task_id, task.user_id)
-        if not existing_task:
-            raise ValueError(f"Task with ID {task.task_id} not found")
-        return self._task_repository.save(task)
+    @tracing.traced('service.create_tasks')
+    def create_tasks(self, tasks: List[Task]) -> List[Task]:
+        """複数のタスクを一括で作成する"""
+        return self._task_repository.save_many(tasks)
 
+    @tracing.traced('service.update_task_fields')
+    def update_task_fields(
+        self, task_id: str, user_id: str, changes: Dict[str, Any], expected_version: Optional[int] = None
+    ) -> Task:
+        """既存のタスクの一部のフィールドを更新する"""
+        updated_task = self._task_repository.update_fields(task_id, user_id, changes, expected_version)
+        if not updated_task:
+            raise TaskNotFoundError(task_id)
+        return updated_task
+
+    @tracing.traced('service.delete_task')
     def delete_task(self, task_id: str, user_id: str) -> bool:
         """タスクを削除する"""
-        existing_task = self._task_repository.find_by_id(task_id, user_id)
-        if not existing_task:
-            raise ValueError(f"Task with ID {task_id} not found")
-        return self._task_repository.delete(task_id, user_id)
+        if not self._task_repository.delete(task_id, user_id):
+            raise TaskNotFoundError(task_id)
+        return True
+
+    @tracing.traced('service.delete_tasks')
+    def delete_tasks(self, task_ids: List[str], user_id: str) -> int:
+        """複数のタスクを一括で削除する"""
+        return self._task_repository.delete_many(task_ids, user_id)
@@ -0,0 +1,93 @@
+"""タスクIDの生成と解析
+
+既定の形式はUUIDv7（RFC 9562）。先頭48ビットが作成時刻（Unixミリ秒）のため、文字列の辞書順が作成順になり、
+ソートキーの範囲で作成時刻による絞り込みや新しい順の取得ができる。
+形式は従来のUUIDv4と同じ36文字のため、既存のIDと混在できる。
+"""
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+from uuid import uuid4
+
+# 引数なしで新しいタスクIDを返す関数
+TaskIdGenerator = Callable[[], str]
+
+_EPOCH = datetime(1970, 1, 1)
+# 時刻の後ろの74ビット（rand_a + rand_b）
+_COUNTER_BITS = 74
+_RAND_B_BITS = 62
+
+
+def _format(value: int) -> str:
+    digits = f'{value:032x}'
+    return f'{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}'
+
+
+def _uuid7_value(timestamp_ms: int, counter: int) -> int:
+    rand_a = counter >> _RAND_B_BITS
+    rand_b = counter & ((1 << _RAND_B_BITS) - 1)
+    return (timestamp_ms << 80) | (0x7 << 76) | (rand_a << 64) | (0b10 << 62) | rand_b
+
+
+class UUIDv7Generator:
+    """同じミリ秒内でも単調増加するUUIDv7を生成する（スレッドセーフ）
+
+    ミリ秒が変わると時刻の後ろの74ビットを乱数から始め、同じミリ秒内（または時計が戻った場合）は
+    直前の値に1を加える（RFC 9562 6.2 の方法2）。乱数の最上位ビットは0にし、桁あふれを起こりにくくする。
+    """
+
+    def __init__(self, clock: Callable[[], int] = time.time_ns):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._counter = 0
+
+    def __call__(self) -> str:
+        with self._lock:
+            timestamp_ms = self._clock() // 1_000_000
+            if timestamp_ms > self._last_ms:
+                self._last_ms = timestamp_ms
+                self._counter = secrets.randbits(_COUNTER_BITS - 1)
+            else:
+                self._counter += 1
+                if self._counter >> _COUNTER_BITS:
+                    # 1ミリ秒に生成できる数を超えた場合は、次のミリ秒の値として扱う
+                    self._last_ms += 1
+                    self._counter = secrets.randbits(_COUNTER_BITS - 1)
+            return _format(_uuid7_value(self._last_ms, self._counter))
+
+
+uuid7: TaskIdGenerator = UUIDv7Generator()
+
+
+def random_task_id() -> str:
+    """従来の形式（UUIDv4）のタスクID"""
+    return str(uuid4())
+
+
+def _to_naive_utc(moment: datetime) -> datetime:
+    if moment.tzinfo is not None:
+        return moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def created_at_from_task_id(task_id: str) -> Optional[datetime]:
+    """UUIDv7のタスクIDから作成時刻（タイムゾーンなしのUTC、ミリ秒単位）を取り出す
+
+    時刻を含まない形式のIDの場合はNone。
+    """
+    if len(task_id) != 36 or task_id[14] != '7' or task_id[8] != '-':
+        return None
+    try:
+        timestamp_ms = int(task_id[:8] + task_id[9:13], 16)
+    except ValueError:
+        return None
+    return _EPOCH + timedelta(milliseconds=timestamp_ms)
+
+
+def min_task_id_at(moment: datetime) -> str:
+    """指定した時刻（タイムゾーンなしの場合はUTC）以降に生成されるUUIDv7のタスクIDの下限"""
+    timestamp_ms = max(0, (_to_naive_utc(moment) - _EPOCH) // timedelta(milliseconds=1))
+    return _format(_uuid7_value(timestamp_ms, 0))
@@ -1,52 +1,126 @@
 import os
 import json
-import base64
+import threading
+import time
 import urllib.request
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
-import boto3
 import jwt
 from jwt.algorithms import RSAAlgorithm
 
+from ...shared import structured_logging, tracing
+from .verified_token_cache import VerifiedTokenCache
+
+
+# JWKSキャッシュの有効期間（秒）
+DEFAULT_JWKS_TTL_SECONDS = 3600
+# 未知のkidによる強制再取得の最小間隔（秒）
+DEFAULT_JWKS_MIN_REFRESH_INTERVAL_SECONDS = 60
+# 検証済みトークンキャッシュの最大エントリ数（0で無効）
+DEFAULT_TOKEN_CACHE_SIZE = 1024
+
+logger = structured_logging.get_logger('auth')
+
 
 class CognitoAuthService:
     """Cognitoを使用した認証サービス"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        jwks_ttl: float = DEFAULT_JWKS_TTL_SECONDS,
+        jwks_min_refresh_interval: float = DEFAULT_JWKS_MIN_REFRESH_INTERVAL_SECONDS,
+        token_cache_size: int = DEFAULT_TOKEN_CACHE_SIZE,
+    ):
         self._region = os.environ.get('REGION_NAME', 'us-east-1')
         self._user_pool_id = os.environ.get('COGNITO_USER_POOL_ID')
         self._client_id = os.environ.get('COGNITO_CLIENT_ID')
-        self._cognito_idp = boto3.client('cognito-idp')
-        self._jwks = None
+        # ローカルの署名鍵などを使用する場合はJWKSのURLを直接指定する
+        self._jwks_url = os.environ.get('COGNITO_JWKS_URL') or (
+            f'https://cognito-idp.{self._region}.amazonaws.com/{self._user_pool_id}/.well-known/jwks.json'
+        )
+        self._jwks_ttl = jwks_ttl
+        self._jwks_min_refresh_interval = jwks_min_refresh_interval
+        # kid -> 構築済みの公開鍵
+        self._public_keys: Dict[str, Any] = {}
+        self._jwks_fetched_at: Optional[float] = None
+        self._jwks_lock = threading.Lock()
+        self._refreshing = False
+        self._token_cache = VerifiedTokenCache(token_cache_size)
 
-    def _get_jwks(self):
+    def _fetch_jwks(self) -> List[Dict[str, Any]]:
         """JWKSを取得する"""
-        if self._jwks is None:
-            keys_url = f'https://cognito-idp.{self._region}.amazonaws.com/{self._user_pool_id}/.well-known/jwks.json'
-            with urllib.request.urlopen(keys_url) as f:
-                response = f.read()
-            self._jwks = json.loads(response.decode('utf-8'))['keys']
-        return self._jwks
+        with urllib.request.urlopen(self._jwks_url) as f:
+            response = f.read()
+        return json.loads(response.decode('utf-8'))['keys']
+
+    def _refresh_public_keys(self) -> None:
+        """JWKSを再取得し、kidごとの公開鍵を構築し直す"""
+        public_keys = {
+            jwk['kid']: RSAAlgorithm.from_jwk(jwk)
+            for jwk in self._fetch_jwks()
+        }
+        with self._jwks_lock:
+            self._public_keys = public_keys
+            self._jwks_fetched_at = time.monotonic()
+
+    def _start_background_refresh(self) -> None:
+        """有効期限切れのJWKSをバックグラウンドで再取得する"""
+        with self._jwks_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+    def _refresh_in_background(self) -> None:
+        """バックグラウンドスレッドでの再取得処理"""
+        try:
+            self._refresh_public_keys()
+        except Exception as e:
+            # 既存の鍵で検証を続ける
+            logger.warning('JWKS refresh failed', extra={'fields': {'error': str(e)}})
+        finally:
+            with self._jwks_lock:
+                self._refreshing = False
 
+    def _get_public_key(self, kid: str) -> Optional[Any]:
+        """kidに対応する公開鍵を取得する"""
+        now = time.monotonic()
+        fetched_at = self._jwks_fetched_at
+
+        # 初回は同期的に取得する
+        if fetched_at is None:
+            self._refresh_public_keys()
+            return self._public_keys.get(kid)
+
+        public_key = self._public_keys.get(kid)
+        if public_key is None:
+            # 鍵のローテーションに追従するため、間隔を空けて強制的に再取得する
+            if now - fetched_at >= self._jwks_min_refresh_interval:
+                self._refresh_public_keys()
+                public_key = self._public_keys.get(kid)
+            return public_key
+
+        if now - fetched_at >= self._jwks_ttl:
+            self._start_background_refresh()
+        return public_key
+
+    @tracing.traced('auth.verify_token')
     def verify_token(self, token: str) -> Optional[Dict]:
         """JWTトークンを検証する"""
+        # 検証済みのトークンは署名検証を省略する
+        cached_payload = self._token_cache.get(token)
+        if cached_payload is not None:
+            return cached_payload
+
         # ヘッダーからキーIDを取得
         header = jwt.get_unverified_header(token)
         kid = header['kid']
-        
-        # JWKSから対応する公開鍵を見つける
-        key = None
-        for jwk in self._get_jwks():
-            if jwk['kid'] == kid:
-                key = jwk
-                break
-                
-        if not key:
+
+        # キャッシュから対応する公開鍵を取得
+        public_key = self._get_public_key(kid)
+        if public_key is None:
             return None
-            
-        # 公開鍵を作成
-        public_key = RSAAlgorithm.from_jwk(json.dumps(key))
-        
+
         try:
             # トークンを検証
             payload = jwt.decode(
@@ -56,9 +130,10 @@ class CognitoAuthService:
                 audience=self._client_id,
                 options={'verify_exp': True}
             )
+            self._token_cache.put(token, payload)
             return payload
         except Exception as e:
-            print(f"Token verification failed: {str(e)}")
+            logger.info('Token verification failed', extra={'fields': {'error': str(e)}})
             return None
 
     def get_user_id_from_token(self, token: str) -> Optional[str]:
@@ -66,6 +141,6 @@ class CognitoAuthService:
         payload = self.verify_token(token)
         if not payload:
             return None
-        
+
         # CognitoのJWTからsubクレームを取得（ユーザーID）
         return payload.get('sub')
@@ -0,0 +1,59 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class VerifiedTokenCache:
+    """検証済みトークンのクレームを保持するLRUキャッシュ
+
+    トークンそのものではなくSHA-256ダイジェストをキーとし、
+    各エントリはトークンの `exp` を過ぎると無効になる。
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        """有効期限内のクレームを取得する"""
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return dict(claims)
+
+    def put(self, token: str, claims: Dict) -> None:
+        """検証済みのクレームを登録する（expのないトークンは登録しない）"""
+        expires_at = claims.get('exp')
+        if self._max_size <= 0 or not isinstance(expires_at, (int, float)):
+            return
+
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = (float(expires_at), dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """すべてのエントリを削除する"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,213 @@
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from ...domain.entities.task import Task
+from ...domain.repositories.task_repository import (
+    TaskChangePage, TaskItemPage, TaskPage, TaskRepository, TaskSummary
+)
+from ...domain.value_objects.task_status import TaskStatus
+from .task_cache_store import TaskCacheStore
+
+
+@dataclass
+class CacheStats:
+    """キャッシュのヒット・ミスの回数"""
+    hits: int = 0
+    misses: int = 0
+
+
+class CachingTaskRepository(TaskRepository):
+    """読み込みをキャッシュするタスクリポジトリのデコレーター
+
+    `find_by_id` と一覧の取得結果を有効期間付きでキャッシュし、書き込み時に無効化する。
+    一覧のキーにはユーザーごとの世代番号を含め、書き込みのたびに世代を進めることで
+    そのユーザーのすべてのページをまとめて無効化する。
+    """
+
+    def __init__(self, repository: TaskRepository, store: TaskCacheStore, ttl_seconds: float):
+        self._repository = repository
+        self._store = store
+        self._ttl_seconds = ttl_seconds
+        self._stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        """ヒット・ミスの回数"""
+        return CacheStats(hits=self._stats.hits, misses=self._stats.misses)
+
+    # キャッシュのキー
+
+    @staticmethod
+    def _task_key(task_id: str, user_id: str) -> str:
+        return f'task:{user_id}:{task_id}'
+
+    def _list_key(self, user_id: str, *parts: Any) -> str:
+        generation = self._store.get_counter(f'generation:{user_id}')
+        return ':'.join(['list', user_id, str(generation), *(str(part) for part in parts)])
+
+    def _get_cached(self, key: str) -> Optional[Any]:
+        value = self._store.get(key)
+        with self._stats_lock:
+            if value is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+        return value
+
+    def _invalidate_lists(self, user_id: str) -> None:
+        self._store.incr(f'generation:{user_id}')
+
+    def _cache_task(self, task: Task) -> None:
+        self._store.set(self._task_key(task.task_id, task.user_id), task.to_dict(), self._ttl_seconds)
+
+    # 書き込み（キャッシュを更新・無効化する）
+
+    def save(self, task: Task) -> Task:
+        saved_task = self._repository.save(task)
+        self._cache_task(saved_task)
+        self._invalidate_lists(saved_task.user_id)
+        return saved_task
+
+    def save_many(self, tasks: List[Task]) -> List[Task]:
+        saved_tasks = self._repository.save_many(tasks)
+        for user_id in {task.user_id for task in saved_tasks}:
+            self._invalidate_lists(user_id)
+        for task in saved_tasks:
+            self._store.delete(self._task_key(task.task_id, task.user_id))
+        return saved_tasks
+
+    def update_fields(
+        self, task_id: str, user_id: str, changes: Dict[str, Any], expected_version: Optional[int] = None
+    ) -> Optional[Task]:
+        self._store.delete(self._task_key(task_id, user_id))
+        updated_task = self._repository.update_fields(task_id, user_id, changes, expected_version)
+        if updated_task:
+            self._cache_task(updated_task)
+            self._invalidate_lists(user_id)
+        return updated_task
+
+    def delete(self, task_id: str, user_id: str) -> bool:
+        result = self._repository.delete(task_id, user_id)
+        self._store.delete(self._task_key(task_id, user_id))
+        self._invalidate_lists(user_id)
+        return result
+
+    def delete_many(self, task_ids: List[str], user_id: str) -> int:
+        result = self._repository.delete_many(task_ids, user_id)
+        for task_id in task_ids:
+            self._store.delete(self._task_key(task_id, user_id))
+        self._invalidate_lists(user_id)
+        return result
+
+    # 読み込み（キャッシュを経由する）
+
+    def find_by_id(self, task_id: str, user_id: str) -> Optional[Task]:
+        key = self._task_key(task_id, user_id)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return Task.from_dict(cached)
+
+        task = self._repository.find_by_id(task_id, user_id)
+        if task:
+            self._store.set(key, task.to_dict(), self._ttl_seconds)
+        return task
+
+    def find_all_by_user_id(self, user_id: str) -> List[Task]:
+        key = self._list_key(user_id, 'all')
+        cached = self._get_cached(key)
+        if cached is not None:
+            return [Task.from_dict(item) for item in cached]
+
+        tasks = self._repository.find_all_by_user_id(user_id)
+        self._store.set(key, [task.to_dict() for task in tasks], self._ttl_seconds)
+        return tasks
+
+    def find_page_by_user_id(
+        self, user_id: str, limit: int, next_token: Optional[str] = None
+    ) -> TaskPage:
+        key = self._list_key(user_id, 'page', limit, next_token or '')
+        cached = self._get_cached(key)
+        if cached is not None:
+            return TaskPage(
+                tasks=[Task.from_dict(item) for item in cached['tasks']],
+                next_token=cached['next_token']
+            )
+
+        page = self._repository.find_page_by_user_id(user_id, limit, next_token)
+        self._store.set(
+            key,
+            {'tasks': [task.to_dict() for task in page.tasks], 'next_token': page.next_token},
+            self._ttl_seconds
+        )
+        return page
+
+    def find_item_page_by_user_id(
+        self, user_id: str, limit: int, next_token: Optional[str] = None
+    ) -> TaskItemPage:
+        key = self._list_key(user_id, 'items', limit, next_token or '')
+        cached = self._get_cached(key)
+        if cached is not None:
+            return TaskItemPage(items=cached['items'], next_token=cached['next_token'])
+
+        page = self._repository.find_item_page_by_user_id(user_id, limit, next_token)
+        self._store.set(
+            key, {'items': page.items, 'next_token': page.next_token}, self._ttl_seconds
+        )
+        return page
+
+    # キャッシュしない読み込み
+
+    def iter_by_user_id(self, user_id: str, page_size: Optional[int] = None) -> Iterator[Task]:
+        return self._repository.iter_by_user_id(user_id, page_size)
+
+    def find_many(self, task_ids: List[str], user_id: str) -> List[Task]:
+        return self._repository.find_many(task_ids, user_id)
+
+    def find_created_after(
+        self,
+        user_id: str,
+        created_after: Optional[datetime],
+        limit: int,
+        next_token: Optional[str] = None,
+        descending: bool = False
+    ) -> TaskItemPage:
+        return self._repository.find_created_after(user_id, created_after, limit, next_token, descending)
+
+    def find_changes_since(
+        self, user_id: str, since: datetime, limit: int, next_token: Optional[str] = None
+    ) -> TaskChangePage:
+        return self._repository.find_changes_since(user_id, since, limit, next_token)
+
+    def get_summary(self, user_id: str) -> TaskSummary:
+        # 集計は1回の読み込みで取得でき、書き込みのたびに変わるためキャッシュしない
+        return self._repository.get_summary(user_id)
+
+    def find_by_user_and_status(
+        self,
+        user_id: str,
+        status: TaskStatus,
+        limit: int,
+        next_token: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        descending: bool = False
+    ) -> TaskItemPage:
+        return self._repository.find_by_user_and_status(
+            user_id, status, limit, next_token, due_after, due_before, descending
+        )
+
+    def find_due_between(
+        self,
+        user_id: str,
+        due_after: Optional[datetime],
+        due_before: Optional[datetime],
+        limit: int,
+        next_token: Optional[str] = None,
+        descending: bool = False
+    ) -> TaskItemPage:
+        return self._repository.find_due_between(
+            user_id, due_after, due_before, limit, next_token, descending
+        )
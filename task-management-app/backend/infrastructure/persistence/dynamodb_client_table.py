@@ -0,0 +1,184 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+from boto3.dynamodb.conditions import ConditionExpressionBuilder
+from boto3.dynamodb.types import DYNAMODB_CONTEXT, TypeDeserializer, TypeSerializer
+
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+# 条件式の引数名と、キー条件かどうか
+_CONDITION_PARAMETERS = (
+    ('KeyConditionExpression', True),
+    ('FilterExpression', False),
+    ('ConditionExpression', False),
+)
+
+
+def serialize(value: Any) -> Dict[str, Any]:
+    """Pythonの値をDynamoDBの属性値に変換する
+
+    項目で使う型（文字列・真偽値・None・整数・辞書・リスト）は型ごとの分岐で直接変換し、
+    それ以外は `TypeSerializer` に任せる。
+    """
+    value_type = type(value)
+    if value_type is str:
+        return {'S': value}
+    if value is None:
+        return {'NULL': True}
+    if value_type is bool:
+        return {'BOOL': value}
+    if value_type is int:
+        return {'N': str(value)}
+    if value_type is dict:
+        return {'M': {key: serialize(item) for key, item in value.items()}}
+    if value_type is list:
+        return {'L': [serialize(item) for item in value]}
+    return _serializer.serialize(value)
+
+
+def _deserialize_number(value: str) -> Decimal:
+    return DYNAMODB_CONTEXT.create_decimal(value)
+
+
+def _deserialize_map(value: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: deserialize(item) for key, item in value.items()}
+
+
+def _deserialize_list(value: List[Any]) -> List[Any]:
+    return [deserialize(item) for item in value]
+
+
+# 型ごとの変換関数（型記述子の参照1回で変換方法が決まる）
+_DESERIALIZERS: Dict[str, Callable[[Any], Any]] = {
+    'S': lambda value: value,
+    'N': _deserialize_number,
+    'BOOL': lambda value: value,
+    'NULL': lambda value: None,
+    'M': _deserialize_map,
+    'L': _deserialize_list,
+}
+
+
+def deserialize(attribute_value: Dict[str, Any]) -> Any:
+    """DynamoDBの属性値をPythonの値に変換する"""
+    for type_name, value in attribute_value.items():
+        converter = _DESERIALIZERS.get(type_name)
+        if converter is not None:
+            return converter(value)
+        break
+    return _deserializer.deserialize(attribute_value)
+
+
+def serialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: serialize(value) for key, value in item.items()}
+
+
+def deserialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: deserialize(value) for key, value in item.items()}
+
+
+def _prepare_request(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """リソースAPIと同じ形式の引数を、低レベルのクライアントの引数に変換する"""
+    request = dict(kwargs)
+    names: Dict[str, str] = dict(request.get('ExpressionAttributeNames') or {})
+    values: Dict[str, Any] = dict(request.get('ExpressionAttributeValues') or {})
+
+    builder = ConditionExpressionBuilder()
+    for parameter, is_key_condition in _CONDITION_PARAMETERS:
+        condition = request.get(parameter)
+        if condition is None or isinstance(condition, str):
+            continue
+        built = builder.build_expression(condition, is_key_condition=is_key_condition)
+        request[parameter] = built.condition_expression
+        names.update(built.attribute_name_placeholders)
+        values.update(built.attribute_value_placeholders)
+
+    if names:
+        request['ExpressionAttributeNames'] = names
+    if values:
+        request['ExpressionAttributeValues'] = {key: serialize(value) for key, value in values.items()}
+    for parameter in ('Item', 'Key', 'ExclusiveStartKey'):
+        if parameter in request:
+            request[parameter] = serialize_item(request[parameter])
+    return request
+
+
+def _parse_response(response: Dict[str, Any]) -> Dict[str, Any]:
+    """低レベルのクライアントのレスポンスを、リソースAPIと同じ形式に変換する"""
+    for parameter in ('Item', 'Attributes', 'LastEvaluatedKey'):
+        if parameter in response:
+            response[parameter] = deserialize_item(response[parameter])
+    if 'Items' in response:
+        response['Items'] = [deserialize_item(item) for item in response['Items']]
+    return response
+
+
+class DynamoDBClientTable:
+    """低レベルのクライアントを使用し、`Table` リソースと同じ呼び出し方を提供するテーブル
+
+    リソースAPIが呼び出しのたびに行うモデルの走査と変換処理を省き、
+    型ごとの分岐による変換だけを行う。
+    """
+
+    def __init__(self, client: Any, table_name: str):
+        self._client = client
+        self.name = table_name
+
+    def _call(self, operation: Callable[..., Dict[str, Any]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        request = _prepare_request(kwargs)
+        request['TableName'] = self.name
+        return _parse_response(operation(**request))
+
+    def put_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call(self._client.put_item, kwargs)
+
+    def get_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call(self._client.get_item, kwargs)
+
+    def update_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call(self._client.update_item, kwargs)
+
+    def delete_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call(self._client.delete_item, kwargs)
+
+    def query(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call(self._client.query, kwargs)
+
+    def scan(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call(self._client.scan, kwargs)
+
+
+class DynamoDBClientResource:
+    """低レベルのクライアントを使用し、`dynamodb` リソースと同じ呼び出し方を提供する"""
+
+    def __init__(self, client: Any):
+        self.meta = SimpleNamespace(client=client)
+
+    def Table(self, table_name: str) -> DynamoDBClientTable:
+        return DynamoDBClientTable(self.meta.client, table_name)
+
+    def batch_get_item(self, RequestItems: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        request_items = {
+            table_name: {**request, 'Keys': [serialize_item(key) for key in request['Keys']]}
+            for table_name, request in RequestItems.items()
+        }
+        response = self.meta.client.batch_get_item(RequestItems=request_items, **kwargs)
+        response['Responses'] = {
+            table_name: [deserialize_item(item) for item in items]
+            for table_name, items in response.get('Responses', {}).items()
+        }
+        response['UnprocessedKeys'] = {
+            table_name: {**request, 'Keys': [deserialize_item(key) for key in request['Keys']]}
+            for table_name, request in (response.get('UnprocessedKeys') or {}).items()
+        }
+        return response
+
+    def transact_write_items(self, TransactItems: List[Dict[str, Any]], **kwargs: Any) -> Dict[str, Any]:
+        transact_items = [
+            {action: _prepare_request(request) for action, request in item.items()}
+            for item in TransactItems
+        ]
+        return self.meta.client.transact_write_items(TransactItems=transact_items, **kwargs)
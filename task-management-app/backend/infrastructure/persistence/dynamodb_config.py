@@ -0,0 +1,75 @@
+import os
+from typing import Optional
+
+from botocore.config import Config
+
+
+# Lambdaの実行時間（30秒）に対して、既定の60秒のタイムアウトは長すぎるため短くする
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 1.0
+DEFAULT_READ_TIMEOUT_SECONDS = 3.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_MODE = 'adaptive'
+# 移行のセグメントごとのスレッドなど、1つのクライアントを共有するスレッドの数より大きくしておく
+DEFAULT_MAX_POOL_CONNECTIONS = 16
+
+# DynamoDBへのアクセス方法（resource: boto3のリソースAPI、client: 低レベルのクライアントAPI）
+CLIENT_MODE_RESOURCE = 'resource'
+CLIENT_MODE_CLIENT = 'client'
+
+# テーブルのキーの構成
+# task: task_id（パーティションキー）+ user_id（ソートキー）。ユーザーごとの一覧はUserIdIndexをクエリする
+# user: user_id（パーティションキー）+ task_id（ソートキー）。ユーザーごとの一覧はテーブルを強い整合性でクエリする
+KEY_LAYOUT_TASK = 'task'
+KEY_LAYOUT_USER = 'user'
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None or value == '':
+        return default
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def build_client_config() -> Config:
+    """環境変数からDynamoDBクライアントの設定を作成する
+
+    - `DYNAMODB_MAX_POOL_CONNECTIONS`: コネクションプールのサイズ
+    - `DYNAMODB_TCP_KEEPALIVE`: TCPキープアライブ（既定は有効）
+    - `DYNAMODB_RETRY_MODE` / `DYNAMODB_MAX_ATTEMPTS`: 再試行のモード（既定はadaptive）と最大試行回数
+    - `DYNAMODB_CONNECT_TIMEOUT` / `DYNAMODB_READ_TIMEOUT`: 接続・読み込みのタイムアウト（秒）
+    """
+    return Config(
+        max_pool_connections=int(
+            os.environ.get('DYNAMODB_MAX_POOL_CONNECTIONS', DEFAULT_MAX_POOL_CONNECTIONS)
+        ),
+        tcp_keepalive=_env_bool('DYNAMODB_TCP_KEEPALIVE', True),
+        retries={
+            'mode': os.environ.get('DYNAMODB_RETRY_MODE', DEFAULT_RETRY_MODE),
+            'max_attempts': int(os.environ.get('DYNAMODB_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)),
+        },
+        connect_timeout=float(
+            os.environ.get('DYNAMODB_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT_SECONDS)
+        ),
+        read_timeout=float(os.environ.get('DYNAMODB_READ_TIMEOUT', DEFAULT_READ_TIMEOUT_SECONDS)),
+    )
+
+
+def get_client_mode() -> str:
+    """`DYNAMODB_CLIENT_MODE` からアクセス方法を取得する"""
+    mode = os.environ.get('DYNAMODB_CLIENT_MODE', CLIENT_MODE_RESOURCE).lower()
+    if mode not in (CLIENT_MODE_RESOURCE, CLIENT_MODE_CLIENT):
+        raise ValueError(f'Unsupported DYNAMODB_CLIENT_MODE: {mode}')
+    return mode
+
+
+def get_key_layout() -> str:
+    """`TASK_TABLE_KEY_LAYOUT` からテーブルのキーの構成を取得する"""
+    layout = os.environ.get('TASK_TABLE_KEY_LAYOUT', KEY_LAYOUT_TASK).lower()
+    if layout not in (KEY_LAYOUT_TASK, KEY_LAYOUT_USER):
+        raise ValueError(f'Unsupported TASK_TABLE_KEY_LAYOUT: {layout}')
+    return layout
+
+
+def get_endpoint_url() -> Optional[str]:
+    """`DYNAMODB_ENDPOINT_URL`（DynamoDB Localなど）を取得する"""
+    return os.environ.get('DYNAMODB_ENDPOINT_URL') or None
@@ -1,32 +1,484 @@
+import base64
+import binascii
+import json
 import os
+import time
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import boto3
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
 
 from ...domain.entities.task import Task
-from ...domain.repositories.task_repository import TaskRepository
+from ...domain.exceptions.task_exceptions import TaskBatchError, TaskConflictError
+from ...domain.repositories.task_repository import (
+    TaskChangePage, TaskItemPage, TaskPage, TaskRepository, TaskSummary
+)
+from ...domain.value_objects.task_id import min_task_id_at
 from ...domain.value_objects.task_status import TaskStatus
+from ...shared import tracing
+from .dynamodb_client_table import DynamoDBClientResource, deserialize_item
+from .dynamodb_config import (
+    CLIENT_MODE_CLIENT, KEY_LAYOUT_USER, build_client_config, get_client_mode, get_endpoint_url, get_key_layout
+)
+
+
+# 環境変数 TASK_TABLE_NAME を指定しない場合のタスクテーブル名
+DEFAULT_TABLE_NAME = 'Tasks'
+
+# APIで公開するタスクの属性
+TASK_ATTRIBUTES = (
+    'task_id', 'title', 'description', 'status', 'due_date', 'user_id', 'created_at', 'updated_at', 'version'
+)
+
+# 部分更新が可能な属性
+UPDATABLE_FIELDS = ('title', 'description', 'status', 'due_date')
+# 書き込みのたびに1ずつ加算する版の属性（版の導入前の項目は属性がなく、0として扱う）
+VERSION_ATTRIBUTE = 'version'
+
+# BatchGetItem の1リクエストあたりの上限
+BATCH_GET_SIZE = 100
+# 未処理項目の再試行
+BATCH_MAX_RETRIES = 5
+BATCH_RETRY_BASE_DELAY_SECONDS = 0.05
+
+# TransactWriteItems の1リクエストあたりの上限
+TRANSACT_MAX_ITEMS = 100
+# 他のトランザクションとの競合や、並行した変更による条件の不一致の再試行
+TRANSACT_MAX_ATTEMPTS = 6
+
+# ユーザーごとのステータス別のタスク数は、タスクとは別の集計テーブル（パーティションキー: user_id）に保持する
+# （ステータスごとの件数は not_started などの数値属性。タスクのテーブルのGSIには含まれない）
+DEFAULT_SUMMARY_TABLE_NAME = 'TaskSummaries'
+# 集計の加減算のたびに1ずつ加算する改訂番号（作り直しで並行する加減算を上書きしないための条件に使う）
+SUMMARY_REVISION_ATTRIBUTE = 'revision'
+
+# 絞り込み・並べ替え用のGSIのキー属性（各属性は単一のフィールドから導出できるため、部分更新でも読み込みが不要）
+# UserStatusIndex: user_status（"{user_id}#{status}"）+ due_sort
+# UserDueDateIndex: user_id + due_sort
+USER_STATUS_ATTRIBUTE = 'user_status'
+DUE_SORT_ATTRIBUTE = 'due_sort'
+# 期限のないタスクのdue_sort（ISO 8601の日時より後に並ぶ）
+NO_DUE_DATE_SORT_KEY = '~'
+# 期限の範囲を片側だけ指定した場合の境界
+MIN_DUE_SORT_KEY = datetime.min.isoformat()
+MAX_DUE_SORT_KEY = datetime.max.isoformat()
+
+# 削除したタスクは差分同期のために墓標（tombstone）として残し、TTLで自動削除する
+DEFAULT_TOMBSTONE_TTL_SECONDS = 30 * 24 * 60 * 60
+# 墓標ではない項目の条件
+ACTIVE_CONDITION = Attr('deleted').not_exists()
+
+
+def user_status_key(user_id: str, status: str) -> str:
+    """UserStatusIndexのパーティションキー"""
+    return f'{user_id}#{status}'
+
+
+def due_sort_key(due_date: Optional[str]) -> str:
+    """UserStatusIndex・UserDueDateIndexのソートキー（期限のないタスクは最後に並ぶ）"""
+    return due_date or NO_DUE_DATE_SORT_KEY
 
 
 class DynamoDBTaskRepository(TaskRepository):
-    """DynamoDBを使用したタスクリポジトリの実装"""
+    """DynamoDBを使用したタスクリポジトリの実装
+
+    テーブルのキーの構成（`TASK_TABLE_KEY_LAYOUT`）は、task（task_id + user_id）とuser（user_id + task_id）の
+    どちらにも対応する。項目の属性は共通のため、キーの辞書や条件式はどちらの構成でも同じものを使う。
+    """
 
-    def __init__(self):
-        self._dynamodb = boto3.resource('dynamodb')
-        self._table_name = os.environ.get('TASK_TABLE_NAME', 'Tasks')
+    def __init__(self, session: Optional[boto3.session.Session] = None, table_name: Optional[str] = None):
+        # boto3のリソースはスレッドセーフではないため、スレッドごとに使う場合はセッションを分ける
+        factory: Any = session if session is not None else boto3
+        client_kwargs = {'endpoint_url': get_endpoint_url(), 'config': build_client_config()}
+        if get_client_mode() == CLIENT_MODE_CLIENT:
+            # 低レベルのクライアントで型変換を直接行う
+            self._dynamodb = DynamoDBClientResource(factory.client('dynamodb', **client_kwargs))
+        else:
+            self._dynamodb = factory.resource('dynamodb', **client_kwargs)
+        self._table_name = table_name or os.environ.get('TASK_TABLE_NAME', DEFAULT_TABLE_NAME)
         self._table = self._dynamodb.Table(self._table_name)
+        self._key_layout = get_key_layout()
+        # 集計はキーの構成によらず同じテーブルに保持する
+        self._summary_table_name = os.environ.get('TASK_SUMMARY_TABLE_NAME', DEFAULT_SUMMARY_TABLE_NAME)
+        self._summary_table = self._dynamodb.Table(self._summary_table_name)
+        # リソースのクライアントは属性値の変換を行うため、トランザクションも同じ形式の値で指定できる
+        self._transact_write_items = (
+            self._dynamodb.transact_write_items if isinstance(self._dynamodb, DynamoDBClientResource)
+            else self._dynamodb.meta.client.transact_write_items
+        )
+        self._tombstone_ttl_seconds = int(
+            os.environ.get('TASK_TOMBSTONE_TTL_SECONDS', DEFAULT_TOMBSTONE_TTL_SECONDS)
+        )
 
     def save(self, task: Task) -> Task:
-        """タスクを保存する"""
-        task_dict = task.to_dict()
-        self._table.put_item(Item=task_dict)
+        """タスクを保存し、ユーザーの集計を同じトランザクションで加算する"""
+        self._transact_write([
+            self._put_new_action(task),
+            self._summary_action(task.user_id, {task.status.value: 1}),
+        ])
         return task
 
+    def save_many(self, tasks: List[Task]) -> List[Task]:
+        """複数のタスクを一括で保存する
+
+        1つのトランザクションにタスクと、ユーザーごとの集計の加算をまとめる（上限を超える場合は分割する）。
+        """
+        for chunk in self._transaction_chunks(tasks):
+            deltas: Dict[str, Dict[str, int]] = {}
+            for task in chunk:
+                user_deltas = deltas.setdefault(task.user_id, {})
+                user_deltas[task.status.value] = user_deltas.get(task.status.value, 0) + 1
+            self._transact_write([
+                *(self._put_new_action(task) for task in chunk),
+                *(self._summary_action(user_id, user_deltas) for user_id, user_deltas in deltas.items()),
+            ])
+        return tasks
+
+    def update_fields(
+        self, task_id: str, user_id: str, changes: Dict[str, Any], expected_version: Optional[int] = None
+    ) -> Optional[Task]:
+        """指定したフィールドのみを更新する（存在しない場合はNone、版が一致しない場合はTaskConflictError）
+
+        変更された属性と `updated_at` だけをUpdateExpressionで書き込む。
+        """
+        unknown_fields = set(changes) - set(UPDATABLE_FIELDS)
+        if unknown_fields:
+            raise ValueError(f"Fields cannot be updated: {', '.join(sorted(unknown_fields))}")
+
+        values = {name: self._to_attribute_value(value) for name, value in changes.items()}
+        values['updated_at'] = datetime.now().isoformat()
+        return self._update_item(task_id, user_id, values, expected_version)
+
+    def _update_item(
+        self, task_id: str, user_id: str, values: Dict[str, Any], expected_version: Optional[int] = None
+    ) -> Optional[Task]:
+        """属性を更新して版を1つ進め、更新後のタスクを返す（存在しない場合はNone）
+
+        ステータスを変更する場合は、まず変更前と同じステータスであることを条件に更新する
+        （ステータスが変わらない場合は集計の更新が不要なため、1回の書き込みで済む）。
+        条件を満たさなかった場合は現在のステータスを取得し、タスクの更新と集計の移動を
+        1つのトランザクションで行う。
+        `expected_version` を指定した場合は版の一致も条件に含め、読み込みなしで更新の競合を検出する
+        （条件を満たさなかった項目の版が異なる場合はTaskConflictError）。
+        """
+        # GSIのキー属性を変更に合わせて更新する
+        if 'status' in values:
+            values[USER_STATUS_ATTRIBUTE] = self._user_status(user_id, values['status'])
+        if 'due_date' in values:
+            values[DUE_SORT_ATTRIBUTE] = self._due_sort(values['due_date'])
+
+        new_status = values.get('status')
+        expected_status = new_status
+        for attempt in range(TRANSACT_MAX_ATTEMPTS):
+            if expected_status == new_status:
+                try:
+                    response = self._request(
+                        'update_item', self._table.update_item,
+                        **self._update_expression(task_id, user_id, values, expected_status, expected_version),
+                        ReturnValues='ALL_NEW',
+                        ReturnValuesOnConditionCheckFailure='ALL_OLD'
+                    )
+                    return Task.from_dict(response['Attributes'])
+                except ClientError as e:
+                    if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                        raise
+                    current = self._current_item_from_error(e, task_id, user_id)
+            else:
+                update_action = self._update_expression(
+                    task_id, user_id, values, expected_status, expected_version
+                )
+                try:
+                    self._transact_write([
+                        {'Update': {'TableName': self._table_name, **update_action}},
+                        self._summary_action(user_id, {expected_status: -1, new_status: 1}),
+                    ])
+                    return Task.from_dict({
+                        **current, **values, VERSION_ATTRIBUTE: self._version_of(current) + 1
+                    })
+                except ClientError as e:
+                    if not self._is_condition_failure(e):
+                        raise
+                    self._backoff(attempt)
+                    current = self._get_current_item(task_id, user_id)
+
+            if current is None:
+                return None
+            if expected_version is not None and self._version_of(current) != expected_version:
+                raise TaskConflictError(task_id)
+            if new_status is None:
+                return None
+            expected_status = current['status']
+
+        raise TaskConflictError(task_id)
+
+    @staticmethod
+    def _version_of(item: Dict[str, Any]) -> int:
+        return int(item.get(VERSION_ATTRIBUTE) or 0)
+
+    def _update_expression(
+        self,
+        task_id: str,
+        user_id: str,
+        values: Dict[str, Any],
+        expected_status: Optional[str],
+        expected_version: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """UpdateItemの引数
+
+        存在し削除されていないこと、指定時はステータス・版が一致することを条件とし、版を1つ進める。
+        """
+        attribute_names: Dict[str, str] = {}
+        attribute_values: Dict[str, Any] = {}
+        assignments: List[str] = []
+        for index, (name, value) in enumerate(values.items()):
+            attribute_names[f'#f{index}'] = name
+            attribute_values[f':v{index}'] = value
+            assignments.append(f'#f{index} = :v{index}')
+
+        condition = 'attribute_exists(task_id) AND attribute_not_exists(deleted)'
+        if expected_status is not None:
+            attribute_names['#expected_status'] = 'status'
+            attribute_values[':expected_status'] = expected_status
+            condition += ' AND #expected_status = :expected_status'
+        attribute_names['#version'] = VERSION_ATTRIBUTE
+        attribute_values[':version_increment'] = 1
+        if expected_version == 0:
+            # 版の導入前の項目は属性を持たない
+            condition += ' AND attribute_not_exists(#version)'
+        elif expected_version is not None:
+            attribute_values[':expected_version'] = expected_version
+            condition += ' AND #version = :expected_version'
+
+        return {
+            'Key': {'task_id': task_id, 'user_id': user_id},
+            'UpdateExpression': 'SET ' + ', '.join(assignments) + ' ADD #version :version_increment',
+            'ConditionExpression': condition,
+            'ExpressionAttributeNames': attribute_names,
+            'ExpressionAttributeValues': attribute_values,
+        }
+
+    def _put_new_action(self, task: Task) -> Dict[str, Any]:
+        """新しいタスクを書き込むトランザクションの操作（同じIDの項目があれば失敗する）"""
+        return {'Put': {
+            'TableName': self._table_name,
+            'Item': self._to_item(task),
+            'ConditionExpression': 'attribute_not_exists(task_id)',
+        }}
+
+    def _tombstone_action(self, task_id: str, user_id: str, status: str) -> Dict[str, Any]:
+        """タスクを墓標で置き換えるトランザクションの操作（ステータスが変わっていれば失敗する）"""
+        return {'Put': {
+            'TableName': self._table_name,
+            'Item': self._tombstone(task_id, user_id),
+            'ConditionExpression': (
+                'attribute_exists(task_id) AND attribute_not_exists(deleted) AND #status = :status'
+            ),
+            'ExpressionAttributeNames': {'#status': 'status'},
+            'ExpressionAttributeValues': {':status': status},
+        }}
+
+    def _summary_action(self, user_id: str, deltas: Dict[str, int]) -> Dict[str, Any]:
+        """集計テーブルのユーザーの項目のステータスごとの件数をADDで加減算するトランザクションの操作"""
+        attribute_names: Dict[str, str] = {}
+        attribute_values: Dict[str, Any] = {}
+        additions: List[str] = []
+        for index, (status, delta) in enumerate(deltas.items()):
+            attribute_names[f'#c{index}'] = self._counter_attribute(status)
+            attribute_values[f':c{index}'] = delta
+            additions.append(f'#c{index} :c{index}')
+        attribute_names['#revision'] = SUMMARY_REVISION_ATTRIBUTE
+        attribute_values[':revision_increment'] = 1
+        additions.append('#revision :revision_increment')
+        return {'Update': {
+            'TableName': self._summary_table_name,
+            'Key': self._summary_key(user_id),
+            'UpdateExpression': 'ADD ' + ', '.join(additions),
+            'ExpressionAttributeNames': attribute_names,
+            'ExpressionAttributeValues': attribute_values,
+        }}
+
+    @staticmethod
+    def _summary_key(user_id: str) -> Dict[str, str]:
+        return {'user_id': user_id}
+
+    @staticmethod
+    def _counter_attribute(status: str) -> str:
+        return TaskStatus(status).name.lower()
+
+    @staticmethod
+    def _transaction_chunks(tasks: List[Task]) -> Iterator[List[Task]]:
+        """タスクと、ユーザーごとの集計の操作が1つのトランザクションの上限に収まるように分割する"""
+        chunk: List[Task] = []
+        user_ids: set = set()
+        for task in tasks:
+            extra = 0 if task.user_id in user_ids else 1
+            if len(chunk) + len(user_ids) + 1 + extra > TRANSACT_MAX_ITEMS:
+                yield chunk
+                chunk, user_ids = [], set()
+            chunk.append(task)
+            user_ids.add(task.user_id)
+        if chunk:
+            yield chunk
+
+    def _transact_write(self, actions: List[Dict[str, Any]]) -> None:
+        """TransactWriteItemsを実行する（他のトランザクションとの競合のみ指数バックオフで再試行する）"""
+        for attempt in range(TRANSACT_MAX_ATTEMPTS):
+            try:
+                self._request('transact_write_items', self._transact_write_items, TransactItems=actions)
+                return
+            except ClientError as e:
+                if not self._has_cancellation_reason(e, 'TransactionConflict') or attempt == TRANSACT_MAX_ATTEMPTS - 1:
+                    raise
+                self._backoff(attempt)
+
+    @staticmethod
+    def _has_cancellation_reason(error: ClientError, code: str) -> bool:
+        if error.response['Error']['Code'] != 'TransactionCanceledException':
+            return False
+        return any(reason.get('Code') == code for reason in error.response.get('CancellationReasons') or [])
+
+    @classmethod
+    def _is_condition_failure(cls, error: ClientError) -> bool:
+        return cls._has_cancellation_reason(error, 'ConditionalCheckFailed')
+
+    def _get_current_item(self, task_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """強い整合性で現在の項目を取得する（存在しない・削除済みの場合はNone）"""
+        response = self._request(
+            'get_item', self._table.get_item,
+            Key={'task_id': task_id, 'user_id': user_id},
+            ConsistentRead=True
+        )
+        item = response.get('Item')
+        if not item or item.get('deleted'):
+            return None
+        return item
+
+    def _current_item_from_error(self, error: ClientError, task_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """条件を満たさなかった書き込みのエラーから現在の項目を取り出す
+
+        `ReturnValuesOnConditionCheckFailure` の項目は型付きの属性値のまま返される。
+        含まれていない場合は読み込み直す。
+        """
+        item = error.response.get('Item')
+        if item is None:
+            return self._get_current_item(task_id, user_id)
+        current = deserialize_item(item)
+        if current.get('deleted'):
+            return None
+        return current
+
+    def get_summary(self, user_id: str) -> TaskSummary:
+        """ユーザーのステータスごとのタスク数を集計テーブルから取得する
+
+        集計の導入前に作成されたタスクを削除・ステータス変更すると、減算のみが反映されて件数が負になる場合がある
+        （書き込みのトランザクションは失敗させない）。負の件数は0として返し、`rebuild_summary` で作り直す。
+        """
+        response = self._request('get_item', self._summary_table.get_item, Key=self._summary_key(user_id))
+        item = response.get('Item') or {}
+        return TaskSummary(counts={
+            status: max(0, int(item.get(self._counter_attribute(status.value), 0))) for status in TaskStatus
+        })
+
+    def rebuild_summary(self, user_id: str) -> TaskSummary:
+        """ユーザーのタスクを数え直し、集計テーブルの項目を作り直す
+
+        集計の導入前に作成されたタスクの反映や、不整合の修正に使用する。タスクは一覧と同じクエリで数えるため、
+        GSI（UserStatusIndex）のキー属性を持たないタスクも含む。
+        集計の加減算はすべて改訂番号を1つ進めるため、数える前に読み込んだ改訂番号が変わっていないことを条件に
+        書き込み、間に加減算があった場合は数え直す（並行する書き込みの加減算を上書きしない）。
+        task構成のUserIdIndexは結果整合性のため、作り直す直前に書き込まれたタスクは数えられない場合がある。
+        """
+        attempt = 0
+        while True:
+            response = self._request(
+                'get_item', self._summary_table.get_item, Key=self._summary_key(user_id), ConsistentRead=True
+            )
+            revision = (response.get('Item') or {}).get(SUMMARY_REVISION_ATTRIBUTE)
+            counts = self._count_by_status(user_id)
+
+            item: Dict[str, Any] = dict(self._summary_key(user_id))
+            item.update({self._counter_attribute(status.value): count for status, count in counts.items()})
+            item[SUMMARY_REVISION_ATTRIBUTE] = int(revision or 0) + 1
+            condition = (
+                Attr(SUMMARY_REVISION_ATTRIBUTE).not_exists() if revision is None
+                else Attr(SUMMARY_REVISION_ATTRIBUTE).eq(revision)
+            )
+            try:
+                self._request('put_item', self._summary_table.put_item, Item=item, ConditionExpression=condition)
+                return TaskSummary(counts=counts)
+            except ClientError as e:
+                if (
+                    e.response['Error']['Code'] != 'ConditionalCheckFailedException'
+                    or attempt == TRANSACT_MAX_ATTEMPTS - 1
+                ):
+                    raise
+                self._backoff(attempt)
+                attempt += 1
+
+    def _count_by_status(self, user_id: str) -> Dict[TaskStatus, int]:
+        """ユーザーのタスク（墓標を除く）をステータスごとに数える"""
+        counts = {status: 0 for status in TaskStatus}
+        query_kwargs: Dict[str, Any] = {
+            **self._user_query_kwargs(user_id),
+            'FilterExpression': ACTIVE_CONDITION & Attr('status').exists(),
+            'ProjectionExpression': '#status',
+            'ExpressionAttributeNames': {'#status': 'status'},
+        }
+        while True:
+            response = self._request('query', self._table.query, **query_kwargs)
+            for item in response.get('Items', []):
+                counts[TaskStatus(item['status'])] += 1
+            last_evaluated_key = response.get('LastEvaluatedKey')
+            if not last_evaluated_key:
+                return counts
+            query_kwargs['ExclusiveStartKey'] = last_evaluated_key
+
+    @staticmethod
+    def _request(name: str, operation: Callable[..., Dict[str, Any]], **kwargs: Any) -> Dict[str, Any]:
+        """DynamoDBへのリクエストを実行する
+
+        計測中は所要時間をspanとして記録し、消費キャパシティ（ReturnConsumedCapacity）を集計する。
+        """
+        if tracing.current_trace() is None:
+            return operation(**kwargs)
+
+        with tracing.span(f'dynamodb.{name}') as attributes:
+            response = operation(ReturnConsumedCapacity='TOTAL', **kwargs)
+            tracing.record_consumed_capacity(response)
+            attributes['consumed_capacity'] = tracing.consumed_capacity_units(response)
+        return response
+
+    @classmethod
+    def _to_item(cls, task: Task) -> Dict[str, Any]:
+        """エンティティをGSIのキー属性を含むDynamoDBの項目に変換する"""
+        item = task.to_dict()
+        item[USER_STATUS_ATTRIBUTE] = cls._user_status(task.user_id, item['status'])
+        item[DUE_SORT_ATTRIBUTE] = cls._due_sort(item['due_date'])
+        return item
+
+    @staticmethod
+    def _user_status(user_id: str, status: str) -> str:
+        return user_status_key(user_id, status)
+
+    @staticmethod
+    def _due_sort(due_date: Optional[str]) -> str:
+        return due_sort_key(due_date)
+
+    @staticmethod
+    def _to_attribute_value(value: Any) -> Any:
+        """エンティティの値をDynamoDBの属性値に変換する"""
+        if isinstance(value, TaskStatus):
+            return value.value
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
     def find_by_id(self, task_id: str, user_id: str) -> Optional[Task]:
         """IDによるタスクの検索"""
-        response = self._table.get_item(
+        response = self._request(
+            'get_item', self._table.get_item,
             Key={
                 'task_id': task_id,
                 'user_id': user_id
@@ -34,29 +486,392 @@ class DynamoDBTaskRepository(TaskRepository):
         )
         
         item = response.get('Item')
-        if not item:
+        if not item or item.get('deleted'):
             return None
             
         return Task.from_dict(item)
 
+    def find_many(self, task_ids: List[str], user_id: str) -> List[Task]:
+        """複数のIDによるタスクの一括検索（存在しないIDは結果に含まれない）"""
+        unique_ids = list(dict.fromkeys(task_ids))
+        items_by_id: Dict[str, Dict[str, Any]] = {}
+
+        for start in range(0, len(unique_ids), BATCH_GET_SIZE):
+            keys = [
+                {'task_id': task_id, 'user_id': user_id}
+                for task_id in unique_ids[start:start + BATCH_GET_SIZE]
+            ]
+            request_items: Dict[str, Any] = {self._table_name: {'Keys': keys}}
+
+            for attempt in range(BATCH_MAX_RETRIES + 1):
+                response = self._request('batch_get_item', self._dynamodb.batch_get_item, RequestItems=request_items)
+                for item in response.get('Responses', {}).get(self._table_name, []):
+                    if not item.get('deleted'):
+                        items_by_id[item['task_id']] = item
+
+                request_items = response.get('UnprocessedKeys') or {}
+                if not request_items:
+                    break
+                if attempt < BATCH_MAX_RETRIES:
+                    self._backoff(attempt)
+            else:
+                raise TaskBatchError(len(request_items[self._table_name]['Keys']))
+
+        # 要求された順序で返す
+        return [Task.from_dict(items_by_id[task_id]) for task_id in unique_ids if task_id in items_by_id]
+
     def find_all_by_user_id(self, user_id: str) -> List[Task]:
         """ユーザーIDに基づくすべてのタスクの取得"""
-        response = self._table.query(
-            IndexName='UserIdIndex',
-            KeyConditionExpression=Key('user_id').eq(user_id)
+        return list(self.iter_by_user_id(user_id))
+
+    def iter_by_user_id(self, user_id: str, page_size: Optional[int] = None) -> Iterator[Task]:
+        """ユーザーIDに基づくタスクを逐次取得する
+
+        LastEvaluatedKeyを辿り、必要になった時点で次のページを取得する。
+        """
+        query_kwargs: Dict[str, Any] = {
+            **self._user_query_kwargs(user_id),
+            'FilterExpression': ACTIVE_CONDITION
+        }
+        if page_size:
+            query_kwargs['Limit'] = page_size
+
+        while True:
+            response = self._request('query', self._table.query, **query_kwargs)
+            for item in response.get('Items', []):
+                yield Task.from_dict(item)
+
+            last_evaluated_key = response.get('LastEvaluatedKey')
+            if not last_evaluated_key:
+                return
+            query_kwargs['ExclusiveStartKey'] = last_evaluated_key
+
+    def find_page_by_user_id(
+        self, user_id: str, limit: int, next_token: Optional[str] = None
+    ) -> TaskPage:
+        """ユーザーIDに基づくタスクをページ単位で取得する"""
+        items, next_token = self._query_page(user_id, limit, next_token)
+        return TaskPage(tasks=[Task.from_dict(item) for item in items], next_token=next_token)
+
+    def find_item_page_by_user_id(
+        self, user_id: str, limit: int, next_token: Optional[str] = None
+    ) -> TaskItemPage:
+        """ユーザーIDに基づくタスクを、エンティティを構築せずに属性の辞書として取得する"""
+        items, next_token = self._query_page(user_id, limit, next_token, projection=True)
+        return TaskItemPage(items=items, next_token=next_token)
+
+    def _query_page(
+        self, user_id: str, limit: int, next_token: Optional[str], projection: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """ユーザーのタスクを1ページ分クエリし、項目と次のページのトークンを返す"""
+        query_kwargs: Dict[str, Any] = {
+            **self._user_query_kwargs(user_id),
+            'FilterExpression': ACTIVE_CONDITION
+        }
+        if projection:
+            query_kwargs['ProjectionExpression'] = ', '.join(
+                f'#{name}' for name in TASK_ATTRIBUTES
+            )
+            query_kwargs['ExpressionAttributeNames'] = {f'#{name}': name for name in TASK_ATTRIBUTES}
+        if next_token:
+            query_kwargs['ExclusiveStartKey'] = self._decode_next_token(next_token, user_id)
+
+        items, last_evaluated_key = self._query_up_to(query_kwargs, limit)
+        return items, self._encode_next_token(last_evaluated_key) if last_evaluated_key else None
+
+    def _query_up_to(
+        self, query_kwargs: Dict[str, Any], limit: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """条件に一致する項目が `limit` 件になるか、最後の項目に達するまでクエリを繰り返す
+
+        FilterExpressionはLimitの件数を読み込んだ後に適用されるため、除外された項目（墓標など）の分だけ
+        1回のクエリの結果は少なくなる。残りの件数をLimitにして続きから読み込み、
+        最後に読み込んだ項目のキー（LastEvaluatedKey）を次のページの開始キーとして返す。
+        """
+        items: List[Dict[str, Any]] = []
+        while True:
+            query_kwargs['Limit'] = limit - len(items)
+            response = self._request('query', self._table.query, **query_kwargs)
+            items.extend(response.get('Items', []))
+            last_evaluated_key = response.get('LastEvaluatedKey')
+            if not last_evaluated_key or len(items) >= limit:
+                return items, last_evaluated_key
+            query_kwargs['ExclusiveStartKey'] = last_evaluated_key
+
+    def scan_items(
+        self,
+        segment: int,
+        total_segments: int,
+        limit: Optional[int] = None,
+        exclusive_start_key: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """テーブルの1セグメントを1ページ分Scanし、タスクの項目と次のページの開始キーを返す
+
+        並列のScan（`Segment` / `TotalSegments`）による全ユーザーのエクスポートに使用する。
+        墓標と集計項目（ステータスの属性を持たない）は含まない。
+        """
+        scan_kwargs: Dict[str, Any] = {
+            'Segment': segment,
+            'TotalSegments': total_segments,
+            'FilterExpression': ACTIVE_CONDITION & Attr('status').exists(),
+        }
+        if limit:
+            scan_kwargs['Limit'] = limit
+        if exclusive_start_key:
+            scan_kwargs['ExclusiveStartKey'] = exclusive_start_key
+
+        response = self._request('scan', self._table.scan, **scan_kwargs)
+        return response.get('Items', []), response.get('LastEvaluatedKey')
+
+    def _user_query_kwargs(self, user_id: str) -> Dict[str, Any]:
+        """ユーザーのすべてのタスクを対象とするクエリの引数
+
+        user構成ではユーザーIDがパーティションキーのため、テーブルを強い整合性でクエリできる
+        （作成直後のタスクも一覧に含まれる）。task構成ではUserIdIndexをクエリする。
+        """
+        if self._key_layout == KEY_LAYOUT_USER:
+            return {'KeyConditionExpression': Key('user_id').eq(user_id), 'ConsistentRead': True}
+        return {'IndexName': 'UserIdIndex', 'KeyConditionExpression': Key('user_id').eq(user_id)}
+
+    def find_changes_since(
+        self, user_id: str, since: datetime, limit: int, next_token: Optional[str] = None
+    ) -> TaskChangePage:
+        """指定した時刻以降に変更・削除されたタスクを変更の古い順に取得する
+
+        (user_id, updated_at) のUserIdUpdatedAtIndexをクエリするため、
+        読み込みのコストは一覧の件数ではなく変更の件数に比例する。
+        前回のページの最後と同じ時刻に変更されたタスクを取りこぼさないように、`since` と同じ時刻の変更も含める
+        （前回受け取った変更が再び含まれる場合があるため、利用側はタスクIDで重複を除いて反映する）。
+        同じ時刻の変更がページの境界をまたぐ場合も、`next_token` では続きの項目から取得する。
+        """
+        attributes = (*TASK_ATTRIBUTES, 'deleted')
+        query_kwargs: Dict[str, Any] = {
+            'IndexName': 'UserIdUpdatedAtIndex',
+            'KeyConditionExpression': (
+                Key('user_id').eq(user_id) & Key('updated_at').gte(since.isoformat())
+            ),
+            'ProjectionExpression': ', '.join(f'#{name}' for name in attributes),
+            'ExpressionAttributeNames': {f'#{name}': name for name in attributes},
+            'Limit': limit
+        }
+        if next_token:
+            query_kwargs['ExclusiveStartKey'] = self._decode_next_token(next_token, user_id)
+
+        response = self._request('query', self._table.query, **query_kwargs)
+        page = TaskChangePage()
+        for item in response.get('Items', []):
+            if item.pop('deleted', False):
+                page.deleted_task_ids.append(item['task_id'])
+            else:
+                page.items.append(item)
+            page.last_updated_at = item['updated_at']
+
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if last_evaluated_key:
+            page.next_token = self._encode_next_token(last_evaluated_key)
+        return page
+
+    def find_by_user_and_status(
+        self,
+        user_id: str,
+        status: TaskStatus,
+        limit: int,
+        next_token: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        descending: bool = False
+    ) -> TaskItemPage:
+        """指定したステータスのタスクを期限順に取得する（期限のないタスクは最後）
+
+        UserStatusIndexのキー条件で絞り込むため、条件に一致する項目だけが読み込まれる。
+        """
+        key_condition = Key(USER_STATUS_ATTRIBUTE).eq(self._user_status(user_id, status.value))
+        due_condition = self._due_sort_condition(due_after, due_before)
+        if due_condition is not None:
+            key_condition = key_condition & due_condition
+        return self._query_index_page(
+            'UserStatusIndex', key_condition, user_id, limit, next_token, descending
         )
-        
-        items = response.get('Items', [])
-        return [Task.from_dict(item) for item in items]
 
-    def delete(self, task_id: str, user_id: str) -> bool:
-        """タスクの削除"""
-        response = self._table.delete_item(
-            Key={
-                'task_id': task_id,
-                'user_id': user_id
-            },
-            ReturnValues='ALL_OLD'
+    def find_due_between(
+        self,
+        user_id: str,
+        due_after: Optional[datetime],
+        due_before: Optional[datetime],
+        limit: int,
+        next_token: Optional[str] = None,
+        descending: bool = False
+    ) -> TaskItemPage:
+        """期限が範囲内のタスクを期限順に取得する
+
+        範囲を指定しない場合は、期限のないタスクも含めてすべてのタスクを期限順に返す。
+        """
+        key_condition = Key('user_id').eq(user_id)
+        due_condition = self._due_sort_condition(due_after, due_before)
+        if due_condition is not None:
+            key_condition = key_condition & due_condition
+        return self._query_index_page(
+            'UserDueDateIndex', key_condition, user_id, limit, next_token, descending
         )
-        
-        return 'Attributes' in response
+
+    def find_created_after(
+        self,
+        user_id: str,
+        created_after: Optional[datetime],
+        limit: int,
+        next_token: Optional[str] = None,
+        descending: bool = False
+    ) -> TaskItemPage:
+        """指定した時刻より後に作成されたタスクを、タスクIDの順（作成順）に取得する
+
+        user構成ではタスクIDがソートキーのため、UUIDv7のタスクIDの下限をキー条件にしてテーブルをクエリする。
+        作成順と `created_after` の判定が正しいのは、UUIDv7のIDのタスクのみ。時刻を含まない従来のID（UUIDv4）の
+        タスクはIDの順（作成順とは無関係）に並び、IDが下限より小さいものは `created_after` より後に作成されていても
+        含まれない（`created_at` のフィルターは、下限より大きいUUIDv4のIDの古いタスクを除くためのもの）。
+        """
+        if self._key_layout != KEY_LAYOUT_USER:
+            raise ValueError('Ordering by creation time requires TASK_TABLE_KEY_LAYOUT=user')
+        key_condition = Key('user_id').eq(user_id)
+        filter_condition = ACTIVE_CONDITION
+        if created_after is not None:
+            key_condition = key_condition & Key('task_id').gte(min_task_id_at(created_after))
+            filter_condition = filter_condition & Attr('created_at').gt(created_after.isoformat())
+        return self._query_index_page(
+            None, key_condition, user_id, limit, next_token, descending, filter_condition
+        )
+
+    @staticmethod
+    def _due_sort_condition(
+        due_after: Optional[datetime], due_before: Optional[datetime]
+    ) -> Optional[Any]:
+        """期限の範囲（両端を含む）をdue_sortのキー条件に変換する"""
+        if due_after is None and due_before is None:
+            return None
+        return Key(DUE_SORT_ATTRIBUTE).between(
+            due_after.isoformat() if due_after else MIN_DUE_SORT_KEY,
+            due_before.isoformat() if due_before else MAX_DUE_SORT_KEY
+        )
+
+    def _query_index_page(
+        self,
+        index_name: Optional[str],
+        key_condition: Any,
+        user_id: str,
+        limit: int,
+        next_token: Optional[str],
+        descending: bool,
+        filter_condition: Optional[Any] = None
+    ) -> TaskItemPage:
+        """GSI（Noneの場合はテーブル）を1ページ分クエリし、公開属性を射影した辞書として返す"""
+        query_kwargs: Dict[str, Any] = {
+            'KeyConditionExpression': key_condition,
+            'ProjectionExpression': ', '.join(f'#{name}' for name in TASK_ATTRIBUTES),
+            'ExpressionAttributeNames': {f'#{name}': name for name in TASK_ATTRIBUTES},
+            'ScanIndexForward': not descending
+        }
+        if index_name:
+            query_kwargs['IndexName'] = index_name
+        else:
+            query_kwargs['ConsistentRead'] = True
+        if filter_condition is not None:
+            query_kwargs['FilterExpression'] = filter_condition
+        if next_token:
+            query_kwargs['ExclusiveStartKey'] = self._decode_next_token(next_token, user_id)
+
+        items, last_evaluated_key = self._query_up_to(query_kwargs, limit)
+        return TaskItemPage(
+            items=items,
+            next_token=self._encode_next_token(last_evaluated_key) if last_evaluated_key else None
+        )
+
+    @staticmethod
+    def _encode_next_token(last_evaluated_key: Dict[str, Any]) -> str:
+        """LastEvaluatedKeyを不透明なトークンに変換する"""
+        raw = json.dumps(last_evaluated_key, separators=(',', ':'), default=str)
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def _decode_next_token(next_token: str, user_id: str) -> Dict[str, Any]:
+        """トークンをExclusiveStartKeyに復元する"""
+        try:
+            raw = base64.urlsafe_b64decode(next_token.encode('ascii'))
+            key = json.loads(raw.decode('utf-8'))
+        except (UnicodeError, binascii.Error, ValueError) as e:
+            raise ValueError('Invalid next_token') from e
+
+        # 他のユーザーのトークンは受け付けない
+        if not isinstance(key, dict) or key.get('user_id') != user_id:
+            raise ValueError('Invalid next_token')
+        return key
+
+    def delete(self, task_id: str, user_id: str) -> bool:
+        """タスクの削除
+
+        項目を墓標で置き換え、差分同期で削除を通知できるようにする。
+        集計の減算は同じトランザクションで行う（削除の間にステータスが変わった場合は読み込み直す）。
+        """
+        current = self._get_current_item(task_id, user_id)
+        for attempt in range(TRANSACT_MAX_ATTEMPTS):
+            if current is None:
+                return False
+            try:
+                self._transact_write([
+                    self._tombstone_action(task_id, user_id, current['status']),
+                    self._summary_action(user_id, {current['status']: -1}),
+                ])
+                return True
+            except ClientError as e:
+                if not self._is_condition_failure(e):
+                    raise
+                self._backoff(attempt)
+                current = self._get_current_item(task_id, user_id)
+        raise TaskConflictError(task_id)
+
+    def delete_many(self, task_ids: List[str], user_id: str) -> int:
+        """複数のタスクを一括で削除し、実際に削除した件数を返す
+
+        存在するタスクのステータスを取得し、墓標の書き込みと集計の減算を1つのトランザクションにまとめる。
+        ステータスが変わっていたトランザクションは読み込み直して再試行する
+        （その間に削除されたタスクは数えない）。
+        """
+        pending = list(dict.fromkeys(task_ids))
+        deleted = 0
+        for attempt in range(TRANSACT_MAX_ATTEMPTS):
+            failed: List[str] = []
+            tasks = self.find_many(pending, user_id)
+            for start in range(0, len(tasks), TRANSACT_MAX_ITEMS - 1):
+                chunk = tasks[start:start + TRANSACT_MAX_ITEMS - 1]
+                deltas: Dict[str, int] = {}
+                for task in chunk:
+                    deltas[task.status.value] = deltas.get(task.status.value, 0) - 1
+                try:
+                    self._transact_write([
+                        *(self._tombstone_action(task.task_id, user_id, task.status.value) for task in chunk),
+                        self._summary_action(user_id, deltas),
+                    ])
+                except ClientError as e:
+                    if not self._is_condition_failure(e):
+                        raise
+                    failed.extend(task.task_id for task in chunk)
+                else:
+                    deleted += len(chunk)
+
+            if not failed:
+                return deleted
+            pending = failed
+            self._backoff(attempt)
+        raise TaskBatchError(len(pending))
+
+    def _tombstone(self, task_id: str, user_id: str) -> Dict[str, Any]:
+        """削除したタスクの墓標（`expires_at` を過ぎるとTTLで削除される）"""
+        return {
+            'task_id': task_id,
+            'user_id': user_id,
+            'deleted': True,
+            'updated_at': datetime.now().isoformat(),
+            'expires_at': int(time.time()) + self._tombstone_ttl_seconds
+        }
+
+    @staticmethod
+    def _backoff(attempt: int) -> None:
+        time.sleep(BATCH_RETRY_BASE_DELAY_SECONDS * (2 ** attempt))
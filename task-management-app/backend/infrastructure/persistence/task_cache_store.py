@@ -0,0 +1,139 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+
+def _json_default(obj: Any) -> Any:
+    # DynamoDBの数値型はDecimalで返される
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class TaskCacheStore(ABC):
+    """タスクキャッシュの保存先のインターフェース
+
+    値はJSONで表現できるオブジェクト（辞書・リスト・文字列など）に限る。
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """値を取得する（存在しない・期限切れの場合はNone）"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        """有効期間付きで値を保存する"""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """値を削除する"""
+        pass
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """カウンターを1増やし、増加後の値を返す（LRUによる削除の対象外）"""
+        pass
+
+    @abstractmethod
+    def get_counter(self, key: str) -> int:
+        """カウンターの値を取得する（存在しない場合は0）"""
+        pass
+
+
+class InMemoryTaskCacheStore(TaskCacheStore):
+    """コンテナ内で保持する、サイズ上限付きのTTL付きLRUキャッシュ"""
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+    def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisTaskCacheStore(TaskCacheStore):
+    """Redis互換のストアを使用し、複数のコンテナでキャッシュを共有する
+
+    `get` / `set(px=)` / `delete` / `incr` / `expire` を持つクライアント（redis-pyなど）を受け取る。
+    """
+
+    # カウンターは値のキャッシュよりも十分長く保持する
+    COUNTER_TTL_SECONDS = 86400
+
+    def __init__(self, client: Any, prefix: str = 'task-cache:'):
+        self._client = client
+        self._prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = 'task-cache:') -> "RedisTaskCacheStore":
+        """URLからクライアントを作成する（redisパッケージが必要）"""
+        import redis
+
+        return cls(redis.Redis.from_url(url), prefix)
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self._client.get(self._prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        self._client.set(
+            self._prefix + key,
+            json.dumps(value, separators=(',', ':'), default=_json_default),
+            px=max(1, int(ttl_seconds * 1000))
+        )
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self._prefix + key)
+
+    def incr(self, key: str) -> int:
+        value = int(self._client.incr(self._prefix + key))
+        self._client.expire(self._prefix + key, self.COUNTER_TTL_SECONDS)
+        return value
+
+    def get_counter(self, key: str) -> int:
+        raw = self._client.get(self._prefix + key)
+        return int(raw) if raw is not None else 0
@@ -0,0 +1,300 @@
+"""タスクテーブル全体のエクスポート
+
+`DynamoDBTaskRepository.scan_items` の並列のScan（セグメントごとに1つのワーカー）で全ユーザーのタスクを読み込み、
+`Task.from_dict` で復元した行を、セグメントごとに分割したファイル（NDJSONまたはParquet）に書き出す。
+
+- ファイルはページの区切りで `rows_per_file` 行ごとに分割し、書き終えたファイルのみ最終的な名前に変更する
+- 各セグメントの進捗（確定したファイルの次のページの開始キーとファイル番号）は、ファイルを確定するたびに
+  `_checkpoints/segment-NNNN.json` に保存する。中断した場合は同じ出力先を指定して再開（`resume`）すると、
+  確定していないファイルの分から再開する。再開を指定しない場合は、チェックポイントのある出力先には書き出さない。
+  チェックポイントにはテーブル名とエクスポートの開始時刻も保存し、異なるテーブル・異なる回のエクスポートの
+  チェックポイントでは再開しない
+- メモリに保持するのは1ページ分の項目と、Parquetの場合は1行グループ分の列のみ
+"""
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import boto3
+
+from ...domain.entities.task import Task
+from ...shared import structured_logging
+from .dynamodb_task_repository import DEFAULT_TABLE_NAME, TASK_ATTRIBUTES, DynamoDBTaskRepository
+
+logger = structured_logging.get_logger('export')
+
+FORMAT_NDJSON = 'ndjson'
+FORMAT_PARQUET = 'parquet'
+EXECUTOR_THREAD = 'thread'
+EXECUTOR_PROCESS = 'process'
+
+DEFAULT_ROWS_PER_FILE = 100_000
+DEFAULT_ROW_GROUP_SIZE = 10_000
+CHECKPOINT_DIR = '_checkpoints'
+MANIFEST_FILE = '_manifest.json'
+# 書き込み中のファイルの接尾辞（確定したファイルと区別する）
+PARTIAL_SUFFIX = '.partial'
+
+
+@dataclass
+class ExportOptions:
+    """エクスポートの設定（プロセスプールのワーカーにも渡すため、pickleできる値のみ持つ）"""
+    output_dir: str
+    output_format: str = FORMAT_NDJSON
+    total_segments: int = 8
+    rows_per_file: int = DEFAULT_ROWS_PER_FILE
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE
+    page_size: Optional[int] = None
+    table_name: str = field(default_factory=lambda: os.environ.get('TASK_TABLE_NAME', DEFAULT_TABLE_NAME))
+    # エクスポートの開始時刻（ISO 8601、UTC）。`TaskExport.run` が新規の場合は現在時刻、再開の場合はチェックポイントから設定する
+    started_at: Optional[str] = None
+
+
+@dataclass
+class SegmentExportProgress:
+    """Scanの1セグメントのエクスポートの進捗"""
+    segment: int
+    output_format: str
+    total_segments: int
+    # 確定したファイルの次のページの開始キー
+    last_evaluated_key: Optional[Dict[str, Any]] = None
+    next_part: int = 0
+    rows: int = 0
+    files: List[str] = field(default_factory=list)
+    done: bool = False
+    table_name: Optional[str] = None
+    started_at: Optional[str] = None
+
+
+def _write_json_atomic(path: str, data: Any) -> None:
+    # 書き込み中に中断しても壊れたファイルが残らないように、一時ファイルから置き換える
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+class NdjsonPartWriter:
+    """1行1タスクのJSON（NDJSON）のファイル"""
+
+    extension = 'ndjson'
+
+    def __init__(self, path: str, _options: ExportOptions):
+        self.path = path
+        self.rows = 0
+        self._file = open(path + PARTIAL_SUFFIX, 'w', encoding='utf-8')
+
+    def write(self, task: Task) -> None:
+        self._file.write(json.dumps(task.to_dict(), ensure_ascii=False, separators=(',', ':')))
+        self._file.write('\n')
+        self.rows += 1
+
+    def close(self) -> None:
+        self._file.close()
+        os.replace(self.path + PARTIAL_SUFFIX, self.path)
+
+
+class ParquetPartWriter:
+    """列指向のParquetのファイル（pyarrowが必要）
+
+    `row_group_size` 行ごとに列をまとめて行グループとして書き出す。日時の属性はタイムスタンプ型、版は整数型の列にする。
+    """
+
+    extension = 'parquet'
+
+    def __init__(self, path: str, options: ExportOptions):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self.path = path
+        self.rows = 0
+        self._row_group_size = options.row_group_size
+        types = {name: pa.timestamp('us') for name in ('due_date', 'created_at', 'updated_at')}
+        types['version'] = pa.int64()
+        self._schema = pa.schema([(name, types.get(name, pa.string())) for name in TASK_ATTRIBUTES])
+        self._columns: Dict[str, List[Any]] = {name: [] for name in TASK_ATTRIBUTES}
+        self._writer = pq.ParquetWriter(path + PARTIAL_SUFFIX, self._schema)
+
+    def write(self, task: Task) -> None:
+        columns = self._columns
+        columns['task_id'].append(task.task_id)
+        columns['title'].append(task.title)
+        columns['description'].append(task.description)
+        columns['status'].append(task.status.value)
+        columns['due_date'].append(task.due_date)
+        columns['user_id'].append(task.user_id)
+        columns['created_at'].append(task.created_at)
+        columns['updated_at'].append(task.updated_at)
+        columns['version'].append(task.version)
+        self.rows += 1
+        if len(columns['task_id']) >= self._row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._columns['task_id']:
+            return
+        self._writer.write_table(self._pa.table(self._columns, schema=self._schema))
+        self._columns = {name: [] for name in TASK_ATTRIBUTES}
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+        os.replace(self.path + PARTIAL_SUFFIX, self.path)
+
+
+_WRITERS = {FORMAT_NDJSON: NdjsonPartWriter, FORMAT_PARQUET: ParquetPartWriter}
+
+
+def _checkpoint_path(options: ExportOptions, segment: int) -> str:
+    return os.path.join(options.output_dir, CHECKPOINT_DIR, f'segment-{segment:04d}.json')
+
+
+def _load_progress(options: ExportOptions, segment: int) -> SegmentExportProgress:
+    path = _checkpoint_path(options, segment)
+    if not os.path.exists(path):
+        return SegmentExportProgress(
+            segment=segment,
+            output_format=options.output_format,
+            total_segments=options.total_segments,
+            table_name=options.table_name,
+            started_at=options.started_at,
+        )
+    with open(path, encoding='utf-8') as f:
+        progress = SegmentExportProgress(**json.load(f))
+    # 異なる設定・テーブル・回のエクスポートのチェックポイントでは再開しない
+    # （テーブル名・開始時刻のない以前のチェックポイントも、同じエクスポートか確認できないため再開しない）
+    if (progress.output_format, progress.total_segments, progress.table_name, progress.started_at) != (
+        options.output_format, options.total_segments, options.table_name, options.started_at
+    ):
+        raise ValueError(f'Checkpoint {path} belongs to a different export')
+    return progress
+
+
+def _saved_started_ats(options: ExportOptions) -> List[Optional[str]]:
+    """出力先に保存済みのチェックポイントの、エクスポートの開始時刻の一覧を返す"""
+    started_ats = []
+    for segment in range(options.total_segments):
+        path = _checkpoint_path(options, segment)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                started_ats.append(json.load(f).get('started_at'))
+    return started_ats
+
+
+def export_segment(options: ExportOptions, segment: int) -> SegmentExportProgress:
+    """1セグメントをエクスポートする（プロセスプールから呼び出せるようにモジュールの関数にする）"""
+    progress = _load_progress(options, segment)
+    if progress.done:
+        return progress
+
+    writer_class = _WRITERS[options.output_format]
+    os.makedirs(os.path.join(options.output_dir, CHECKPOINT_DIR), exist_ok=True)
+    # boto3のリソースはスレッドセーフではないため、セグメントごとにセッションを分ける
+    repository = DynamoDBTaskRepository(session=boto3.session.Session(), table_name=options.table_name)
+    checkpoint_path = _checkpoint_path(options, segment)
+    start_key = progress.last_evaluated_key
+    writer: Optional[Any] = None
+
+    while True:
+        items, start_key = repository.scan_items(
+            segment, options.total_segments, options.page_size, start_key
+        )
+        for item in items:
+            if writer is None:
+                name = f'tasks-{segment:04d}-{progress.next_part:05d}.{writer_class.extension}'
+                writer = writer_class(os.path.join(options.output_dir, name), options)
+            writer.write(Task.from_dict(item))
+
+        finished = start_key is None
+        if finished or (writer is not None and writer.rows >= options.rows_per_file):
+            if writer is not None:
+                writer.close()
+                progress.files.append(os.path.basename(writer.path))
+                progress.rows += writer.rows
+                progress.next_part += 1
+                writer = None
+            progress.last_evaluated_key = start_key
+            progress.done = finished
+            _write_json_atomic(checkpoint_path, asdict(progress))
+        if finished:
+            break
+
+    logger.info('Segment exported', extra={'fields': {
+        'segment': segment, 'rows': progress.rows, 'files': len(progress.files)
+    }})
+    return progress
+
+
+class TaskExport:
+    """全ユーザーのタスクを並列のScanでファイルにエクスポートする
+
+    セグメントはスレッドプールまたはプロセスプール（`executor`）で並行に処理する。
+    DynamoDBの待ち時間が中心の場合はスレッド、JSON・Parquetへの変換が中心の場合はプロセスが適している。
+    中断したエクスポートは `resume` を指定した場合のみ、出力先のチェックポイントから再開する。
+    """
+
+    def __init__(
+        self,
+        options: ExportOptions,
+        executor: str = EXECUTOR_THREAD,
+        max_workers: Optional[int] = None,
+        resume: bool = False
+    ):
+        if options.output_format not in _WRITERS:
+            raise ValueError(f'Unsupported format: {options.output_format}')
+        if executor not in (EXECUTOR_THREAD, EXECUTOR_PROCESS):
+            raise ValueError(f'Unsupported executor: {executor}')
+        self._options = options
+        self._executor = executor
+        self._max_workers = max_workers or options.total_segments
+        self._resume = resume
+
+    def _create_executor(self) -> Executor:
+        if self._executor == EXECUTOR_PROCESS:
+            return ProcessPoolExecutor(max_workers=self._max_workers)
+        return ThreadPoolExecutor(max_workers=self._max_workers)
+
+    def run(self) -> Dict[str, Any]:
+        """すべてのセグメントをエクスポートし、ファイルの一覧（マニフェスト）を返す"""
+        options = self._options
+        if os.path.exists(os.path.join(options.output_dir, MANIFEST_FILE)):
+            raise ValueError(f'{options.output_dir} already contains a completed export')
+        if options.started_at is None:
+            options = replace(options, started_at=self._started_at(options))
+        with self._create_executor() as executor:
+            futures = [
+                executor.submit(export_segment, options, segment) for segment in range(options.total_segments)
+            ]
+            segments = [future.result() for future in futures]
+
+        manifest = {
+            'table': options.table_name,
+            'started_at': options.started_at,
+            'format': options.output_format,
+            'total_segments': options.total_segments,
+            'rows': sum(progress.rows for progress in segments),
+            'files': [name for progress in segments for name in progress.files],
+        }
+        _write_json_atomic(os.path.join(options.output_dir, MANIFEST_FILE), manifest)
+        return manifest
+
+    def _started_at(self, options: ExportOptions) -> str:
+        """新規の場合は現在時刻、再開の場合はチェックポイントのエクスポートの開始時刻を返す"""
+        saved = _saved_started_ats(options)
+        if not self._resume:
+            # 以前のエクスポートの出力先に気づかずに書き出さないように、再開の指定がなければ拒否する
+            if saved:
+                raise ValueError(
+                    f'{options.output_dir} already contains checkpoints; resume or use another directory'
+                )
+            return datetime.now(timezone.utc).isoformat()
+        if not saved:
+            raise ValueError(f'{options.output_dir} has no checkpoints to resume')
+        # 異なる回のチェックポイントが混在する場合や、開始時刻のない以前のチェックポイントでは再開しない
+        if None in saved or len(set(saved)) != 1:
+            raise ValueError(f'Checkpoints in {options.output_dir} belong to different exports')
+        return saved[0]
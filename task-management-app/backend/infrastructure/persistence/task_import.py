@@ -0,0 +1,349 @@
+"""CSV・NDJSONのファイルからのタスクの一括インポート
+
+既存のタスクを多数持つ利用者の移行に使用する。ファイルを1行ずつ読み込み、`TaskDTO` に検証した行を
+チャンクごとに `Task` に変換して `save_many` で書き込む。チャンクはタスクとユーザーごとの集計の加算が
+1つのトランザクションに収まる大きさにするため、書き込みはチャンク単位で成功か失敗のどちらかになる。
+
+- 書き込みはユーザーIDごとに決まるレーン（1スレッドずつ）で並行に実行する。同じユーザーのチャンクは同じレーンで
+  順に書き込むため、ユーザーの集計項目への加算のトランザクションが互いに競合しない
+- 書き込み中・待機中のチャンク数が上限に達すると読み込みを止める（背圧）
+- スループットの超過（スロットリング）では同時に書き込むチャンク数を半分にして待ってから再試行し、
+  成功が続くと1つずつ戻す。アプリケーションの書き込みとのトランザクションの競合も、待ってから再試行する
+- 検証に失敗した行と、再試行後も書き込めなかったチャンクの行は、行番号と理由を失敗の一覧（NDJSON）に書き出す
+"""
+import contextlib
+import csv
+import json
+import random
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import IO, Any, Callable, Iterable, Iterator, List, Optional, Set, Tuple
+
+import boto3
+from botocore.exceptions import ClientError
+
+from ...application.dtos.task_dto import TaskDTO
+from ...domain.repositories.task_repository import TaskRepository
+from ...domain.value_objects.task_status import TaskStatus
+from ...shared import structured_logging
+from .dynamodb_task_repository import TRANSACT_MAX_ITEMS, DynamoDBTaskRepository
+
+logger = structured_logging.get_logger('import')
+
+FORMAT_CSV = 'csv'
+FORMAT_NDJSON = 'ndjson'
+
+DEFAULT_MAX_WORKERS = 4
+# スロットリングによるチャンクごとの再試行
+THROTTLE_MAX_RETRIES = 8
+THROTTLE_BASE_DELAY_SECONDS = 0.1
+THROTTLE_MAX_DELAY_SECONDS = 5.0
+# 同時に書き込むチャンク数を1つ戻すまでの連続した成功の数
+THROTTLE_RECOVERY_SUCCESSES = 10
+# 進捗をログに書き出す間隔
+PROGRESS_INTERVAL_SECONDS = 10.0
+
+# スループットの超過を表すエラーコード
+_THROTTLE_CODES = frozenset((
+    'ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded'
+))
+_VALID_STATUSES = frozenset(status.value for status in TaskStatus)
+
+# (行番号, 行の内容)
+Row = Tuple[int, Any]
+# (行番号, 行の内容, 検証したDTO)
+_ChunkRow = Tuple[int, Any, TaskDTO]
+
+
+def _create_thread_repository() -> TaskRepository:
+    return DynamoDBTaskRepository(session=boto3.session.Session())
+
+
+@dataclass
+class ImportReport:
+    """インポートの結果"""
+    rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    # スロットリングによる再試行の回数
+    throttled: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.imported / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+def is_throttling_error(error: ClientError) -> bool:
+    """スループットの超過によるエラーか（トランザクションではキャンセルの理由に含まれる）"""
+    code = error.response['Error']['Code']
+    if code in _THROTTLE_CODES:
+        return True
+    if code != 'TransactionCanceledException':
+        return False
+    return any(
+        reason.get('Code') == 'ThrottlingError' for reason in error.response.get('CancellationReasons') or []
+    )
+
+
+def is_transaction_conflict(error: ClientError) -> bool:
+    """他のトランザクションとの競合によるキャンセルか"""
+    if error.response['Error']['Code'] != 'TransactionCanceledException':
+        return False
+    return any(
+        reason.get('Code') == 'TransactionConflict' for reason in error.response.get('CancellationReasons') or []
+    )
+
+
+def read_rows(stream: IO[str], input_format: str) -> Iterator[Row]:
+    """ファイルから1行ずつ読み込む
+
+    CSVは1行目を列名とし、空の値はNoneとする。NDJSONの解析できない行は文字列のまま返す（検証で失敗する）。
+    """
+    if input_format == FORMAT_CSV:
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, {key: value if value != '' else None for key, value in row.items()}
+    elif input_format == FORMAT_NDJSON:
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, line.rstrip('\n')
+    else:
+        raise ValueError(f'Unsupported format: {input_format}')
+
+
+def _parse_due_date(value: Any) -> Optional[str]:
+    """期限を保存している形式（タイムゾーンなしのUTC）のISO 8601に変換する"""
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ValueError('due_date must be an ISO 8601 timestamp')
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as e:
+        raise ValueError('due_date must be an ISO 8601 timestamp') from e
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat()
+
+
+def validate_row(row: Any, default_user_id: Optional[str] = None) -> TaskDTO:
+    """1行を新しいタスクのDTOに検証する（不正な行はValueError）"""
+    if not isinstance(row, dict):
+        raise ValueError('Row must be an object')
+    title = row.get('title')
+    if not isinstance(title, str) or not title.strip():
+        raise ValueError('Title is required')
+    user_id = row.get('user_id') or default_user_id
+    if not isinstance(user_id, str):
+        raise ValueError('user_id is required')
+    description = row.get('description')
+    if description is not None and not isinstance(description, str):
+        raise ValueError('description must be a string')
+    status = row.get('status') or TaskStatus.NOT_STARTED.value
+    if status not in _VALID_STATUSES:
+        raise ValueError(f'Invalid status: {status}')
+
+    return TaskDTO(
+        task_id=None,
+        title=title,
+        description=description,
+        status=status,
+        due_date=_parse_due_date(row.get('due_date')),
+        user_id=user_id,
+        created_at=None,
+        updated_at=None
+    )
+
+
+class AdaptiveConcurrency:
+    """同時に書き込むチャンク数の上限をスロットリングに応じて調整する
+
+    スロットリングのたびに上限を半分（最小1）にし、`THROTTLE_RECOVERY_SUCCESSES` 回続けて成功すると1つ戻す。
+    """
+
+    def __init__(self, max_limit: int):
+        self._max_limit = max_limit
+        self._limit = max_limit
+        self._active = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self._active >= self._limit:
+                self._condition.wait()
+            self._active += 1
+
+    def release(self) -> None:
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        with self._condition:
+            self._successes += 1
+            if self._successes >= THROTTLE_RECOVERY_SUCCESSES and self._limit < self._max_limit:
+                self._limit += 1
+                self._successes = 0
+                self._condition.notify_all()
+
+    def on_throttle(self) -> None:
+        with self._condition:
+            self._limit = max(1, self._limit // 2)
+            self._successes = 0
+
+
+class TaskImporter:
+    """検証した行をチャンクごとに並行して書き込む
+
+    行はユーザーIDのハッシュで `max_workers` 個のレーンに振り分け、レーンごとにチャンクにまとめて1スレッドで書き込む
+    （1人のユーザーの行は1つのレーンで順に書き込まれる）。
+    boto3のリソースはスレッド間で共有できないため、リポジトリはスレッドごとに1つずつ作成して再利用する。
+    `failures` を指定すると、失敗した行を1行1件のJSONで書き出す。
+    """
+
+    def __init__(
+        self,
+        repository_factory: Callable[[], TaskRepository] = _create_thread_repository,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        default_user_id: Optional[str] = None,
+        failures: Optional[IO[str]] = None,
+    ):
+        self._repository_factory = repository_factory
+        self._max_workers = max_workers
+        self._default_user_id = default_user_id
+        self._failures = failures
+        self._concurrency = AdaptiveConcurrency(max_workers)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._report = ImportReport()
+
+    def _repository(self) -> TaskRepository:
+        repository = getattr(self._local, 'repository', None)
+        if repository is None:
+            repository = self._repository_factory()
+            self._local.repository = repository
+        return repository
+
+    def run(self, rows: Iterable[Row]) -> ImportReport:
+        """すべての行をインポートし、結果を返す"""
+        self._report = report = ImportReport()
+        started_at = last_progress_at = time.monotonic()
+        # 書き込み中・待機中のチャンク数の上限（超えると読み込みを待たせる）
+        in_flight = threading.BoundedSemaphore(self._max_workers * 2)
+
+        # レーンごとの書き込み前のチャンクと、チャンクに含まれるユーザー
+        chunks: List[List[_ChunkRow]] = [[] for _ in range(self._max_workers)]
+        chunk_user_ids: List[Set[str]] = [set() for _ in range(self._max_workers)]
+
+        def submit(lane: int) -> None:
+            in_flight.acquire()
+            future = lanes[lane].submit(self._write_chunk, chunks[lane])
+            future.add_done_callback(lambda _: in_flight.release())
+            chunks[lane], chunk_user_ids[lane] = [], set()
+
+        with contextlib.ExitStack() as stack:
+            lanes = [
+                stack.enter_context(ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'import-{index}'))
+                for index in range(self._max_workers)
+            ]
+            for line_number, row in rows:
+                report.rows += 1
+                try:
+                    task_dto = validate_row(row, self._default_user_id)
+                except ValueError as e:
+                    self._record_failures([(line_number, row)], str(e))
+                    continue
+
+                # タスクとユーザーごとの集計の操作が1つのトランザクションに収まるように分ける
+                lane = self._lane(task_dto.user_id)
+                extra = 0 if task_dto.user_id in chunk_user_ids[lane] else 1
+                if len(chunks[lane]) + len(chunk_user_ids[lane]) + 1 + extra > TRANSACT_MAX_ITEMS:
+                    submit(lane)
+                chunks[lane].append((line_number, row, task_dto))
+                chunk_user_ids[lane].add(task_dto.user_id)
+
+                now = time.monotonic()
+                if now - last_progress_at >= PROGRESS_INTERVAL_SECONDS:
+                    last_progress_at = now
+                    self._log_progress('Import progress', now - started_at)
+            for lane, chunk in enumerate(chunks):
+                if chunk:
+                    submit(lane)
+
+        report.elapsed_seconds = time.monotonic() - started_at
+        self._log_progress('Import finished', report.elapsed_seconds)
+        return report
+
+    def _lane(self, user_id: str) -> int:
+        """ユーザーのチャンクを書き込むレーン（プロセスをまたいでも同じになるように、CRC32で決める）"""
+        return zlib.crc32(user_id.encode('utf-8')) % self._max_workers
+
+    def _write_chunk(self, chunk: List[_ChunkRow]) -> None:
+        """1つのチャンクを書き込む（スロットリングは同時に書き込む数を減らして再試行する）"""
+        tasks = [task_dto.to_entity() for _, _, task_dto in chunk]
+        for attempt in range(THROTTLE_MAX_RETRIES + 1):
+            self._concurrency.acquire()
+            try:
+                self._repository().save_many(tasks)
+            except ClientError as e:
+                throttled = is_throttling_error(e)
+                if not (throttled or is_transaction_conflict(e)) or attempt == THROTTLE_MAX_RETRIES:
+                    self._record_failures([(line_number, row) for line_number, row, _ in chunk], str(e))
+                    return
+                if throttled:
+                    self._concurrency.on_throttle()
+                    with self._lock:
+                        self._report.throttled += 1
+            except Exception as e:
+                self._record_failures([(line_number, row) for line_number, row, _ in chunk], str(e))
+                return
+            else:
+                self._concurrency.on_success()
+                with self._lock:
+                    self._report.imported += len(tasks)
+                return
+            finally:
+                self._concurrency.release()
+            time.sleep(self._backoff(attempt))
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        # 同時にスロットリングされたチャンクの再試行が重ならないように、ジッターを加える
+        delay = min(THROTTLE_MAX_DELAY_SECONDS, THROTTLE_BASE_DELAY_SECONDS * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
+
+    def _record_failures(self, rows: List[Row], error: str) -> None:
+        with self._lock:
+            self._report.failed += len(rows)
+            if self._failures is None:
+                return
+            for line_number, row in rows:
+                self._failures.write(
+                    json.dumps({'line': line_number, 'error': error, 'row': row}, ensure_ascii=False, default=str)
+                )
+                self._failures.write('\n')
+
+    def _log_progress(self, message: str, elapsed_seconds: float) -> None:
+        report = self._report
+        logger.info(message, extra={'fields': {
+            'rows': report.rows,
+            'imported': report.imported,
+            'failed': report.failed,
+            'throttled': report.throttled,
+            'concurrency': self._concurrency.limit,
+            'rows_per_second': round(report.imported / elapsed_seconds, 1) if elapsed_seconds > 0 else 0.0,
+        }})
@@ -0,0 +1,433 @@
+"""キーの構成が異なるタスクテーブルの間で項目をコピーする移行処理
+
+元のテーブルを並列のScan（`TotalSegments`）で読み込み、移行先のテーブルに書き込む。
+task構成とuser構成では項目の属性（task_id・user_id・GSIのキー属性）が共通のため、タスクと墓標はそのまま書き込める
+（GSIのキー属性を持たないタスクは、ステータス・期限から導出して書き込む）。
+集計は別のテーブル（キーの構成によらず共通）に保持するため、コピーの後にコピーしたユーザーの集計を移行先のデータから作り直す
+（集計テーブルの導入前にタスクのテーブルに置いていた集計項目はコピーしない）。
+
+- 各セグメントの進捗（LastEvaluatedKey）はページごとにチェックポイントのファイルに保存し、
+  中断した場合は同じファイルを指定して再実行すると続きから再開する
+  （集計を作り直すユーザーは、ページごとに書き直さないように `{チェックポイント}.users` に追記する）
+- 書き込みは条件付きのPutItemで行い、移行先に同じか新しい `updated_at` の項目がある場合は上書きしない
+  （移行中や、移行先に切り替えた後に再実行しても、新しい書き込みを古い内容で戻さない）
+
+`TaskIndexBackfill` は同じ並列のScanとチェックポイントで、GSI（UserStatusIndex・UserDueDateIndex）の
+キー属性を持たない既存のタスクに `user_status` / `due_sort` を書き込む（GSIの導入前に作成されたタスクの反映）。
+`TaskSummaryRebuild` は同じ並列のScanでタスクを持つユーザーを集め、ユーザーごとの集計を作り直す。
+"""
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from botocore.exceptions import ClientError
+
+from ...shared import structured_logging
+from .dynamodb_task_repository import (
+    DUE_SORT_ATTRIBUTE, USER_STATUS_ATTRIBUTE, due_sort_key, user_status_key
+)
+
+logger = structured_logging.get_logger('migration')
+
+# 集計テーブルの導入前に、タスクのテーブルに置いていた集計項目のキー
+# （task構成: task_id = "summary#{user_id}", user_id = "#summary"、user構成: user_id と task_id が逆）
+LEGACY_SUMMARY_KEY_PREFIX = 'summary#'
+LEGACY_SUMMARY_SORT_KEY = '#summary'
+
+# 既存の項目より新しい場合のみ書き込む条件
+_NEWER_CONDITION = 'attribute_not_exists(task_id) OR #updated_at < :updated_at'
+# GSIのキー属性を持たないタスク（墓標・集計項目はステータスを持たないため含まない）
+_MISSING_INDEX_KEYS_FILTER = (
+    'attribute_exists(#status) AND attribute_not_exists(deleted) '
+    'AND (attribute_not_exists(#user_status) OR attribute_not_exists(#due_sort))'
+)
+# タスクと墓標（集計項目は含まない）
+_TASK_OR_TOMBSTONE_FILTER = 'attribute_exists(#status) OR attribute_exists(deleted)'
+# 書き込みの間にタスクが更新された場合の読み込み直し
+BACKFILL_MAX_ATTEMPTS = 3
+# 集計を作り直すユーザーを追記するファイルの接尾辞（1行に1つのJSON文字列）
+USER_IDS_SUFFIX = '.users'
+
+
+@dataclass
+class SegmentProgress:
+    """Scanの1セグメントの進捗"""
+    last_evaluated_key: Optional[Dict[str, Any]] = None
+    done: bool = False
+    scanned: int = 0
+    # 書き込んだ件数（GSIのキー属性の書き込みでは更新した件数）
+    copied: int = 0
+    # 移行先に同じか新しい項目があったため書き込まなかった件数
+    skipped: int = 0
+
+
+@dataclass
+class MigrationCheckpoint:
+    """移行の進捗（JSONファイルとして保存する）"""
+    source_table: str
+    target_table: str
+    total_segments: int
+    segments: List[SegmentProgress] = field(default_factory=list)
+    # 集計を作り直すユーザー（進捗とは別のファイルに追記し、`save` では保存しない）
+    user_ids: List[str] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['MigrationCheckpoint']:
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        data['segments'] = [SegmentProgress(**segment) for segment in data['segments']]
+        # 以前の形式のチェックポイントは、ユーザーを進捗と同じファイルに保存している
+        user_ids = set(data.pop('user_ids', []))
+        user_ids.update(_read_user_ids(f'{path}{USER_IDS_SUFFIX}'))
+        return cls(**data, user_ids=sorted(user_ids))
+
+    def save(self, path: str) -> None:
+        data = asdict(self)
+        del data['user_ids']
+        # 書き込み中に中断しても壊れたファイルが残らないように、一時ファイルから置き換える
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    @property
+    def done(self) -> bool:
+        return all(segment.done for segment in self.segments)
+
+    def totals(self) -> Dict[str, int]:
+        return {
+            name: sum(getattr(segment, name) for segment in self.segments)
+            for name in ('scanned', 'copied', 'skipped')
+        }
+
+
+def _read_user_ids(path: str) -> List[str]:
+    """追記したユーザーを読み込む（書き込み中に中断した最後の行は除く）"""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    return [json.loads(line) for line in lines[:-1]]
+
+
+def _user_id_lines(user_ids: Iterable[str]) -> str:
+    return ''.join(f'{json.dumps(user_id, ensure_ascii=False)}\n' for user_id in user_ids)
+
+
+def _append_user_ids(path: str, user_ids: Iterable[str]) -> None:
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(_user_id_lines(user_ids))
+
+
+def _write_user_ids(path: str, user_ids: Iterable[str]) -> None:
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(_user_id_lines(user_ids))
+    os.replace(temp_path, path)
+
+
+def is_summary_item(item: Dict[str, Any]) -> bool:
+    """型付きの属性値の項目が、いずれかのキーの構成の以前の集計項目か"""
+    task_id = item.get('task_id', {}).get('S', '')
+    user_id = item.get('user_id', {}).get('S', '')
+    return (
+        (user_id == LEGACY_SUMMARY_SORT_KEY and task_id.startswith(LEGACY_SUMMARY_KEY_PREFIX))
+        or (task_id == LEGACY_SUMMARY_SORT_KEY and user_id.startswith(LEGACY_SUMMARY_KEY_PREFIX))
+    )
+
+
+def index_key_attributes(item: Dict[str, Any]) -> Dict[str, Any]:
+    """型付きの属性値のタスクの項目から、GSIのキー属性（user_status・due_sort）を導出する"""
+    due_date = item.get('due_date', {}).get('S')
+    return {
+        USER_STATUS_ATTRIBUTE: {'S': user_status_key(item['user_id']['S'], item['status']['S'])},
+        DUE_SORT_ATTRIBUTE: {'S': due_sort_key(due_date)},
+    }
+
+
+def needs_index_keys(item: Dict[str, Any]) -> bool:
+    """型付きの属性値の項目が、GSIのキー属性を持たないタスクか"""
+    return (
+        'status' in item and 'deleted' not in item
+        and (USER_STATUS_ATTRIBUTE not in item or DUE_SORT_ATTRIBUTE not in item)
+    )
+
+
+class _SegmentedScan(ABC):
+    """テーブルを並列のScanで読み込み、セグメントごとの進捗をチェックポイントに保存しながら項目を処理する
+
+    低レベルのクライアントを使用し、型付きの属性値のまま変換せずに書き込む。
+    boto3のクライアントはスレッドセーフなため、セグメントごとのスレッドで共有する。
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        source_table: str,
+        target_table: str,
+        checkpoint_path: str,
+        total_segments: int = 8,
+        max_workers: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ):
+        self._client = client
+        self._source_table = source_table
+        self._target_table = target_table
+        self._checkpoint_path = checkpoint_path
+        self._user_ids_path = f'{checkpoint_path}{USER_IDS_SUFFIX}'
+        self._total_segments = total_segments
+        self._max_workers = max_workers or total_segments
+        self._page_size = page_size
+        self._lock = threading.Lock()
+        self._user_ids: Set[str] = set()
+        self._checkpoint = self._load_checkpoint()
+
+    def _load_checkpoint(self) -> MigrationCheckpoint:
+        checkpoint = MigrationCheckpoint.load(self._checkpoint_path)
+        if checkpoint is None:
+            # 進捗を保存する前に中断した回のユーザーは、ページを読み込み直して追記し直す
+            if os.path.exists(self._user_ids_path):
+                os.remove(self._user_ids_path)
+            return MigrationCheckpoint(
+                source_table=self._source_table,
+                target_table=self._target_table,
+                total_segments=self._total_segments,
+                segments=[SegmentProgress() for _ in range(self._total_segments)],
+            )
+        # 異なる条件の移行のチェックポイントでは再開しない（セグメントの分け方が変わると進捗が無効になる）
+        if (checkpoint.source_table, checkpoint.target_table, checkpoint.total_segments) != (
+            self._source_table, self._target_table, self._total_segments
+        ):
+            raise ValueError(f'Checkpoint {self._checkpoint_path} belongs to a different migration')
+        self._user_ids.update(checkpoint.user_ids)
+        # 中断した最後の行や重複を除き、以前の形式のチェックポイントのユーザーも含めて書き直す
+        _write_user_ids(self._user_ids_path, checkpoint.user_ids)
+        return checkpoint
+
+    @property
+    def checkpoint(self) -> MigrationCheckpoint:
+        return self._checkpoint
+
+    def run(self) -> MigrationCheckpoint:
+        """未完了のセグメントを処理する"""
+        pending = [index for index, segment in enumerate(self._checkpoint.segments) if not segment.done]
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            # 例外はresultで呼び出し元に伝える（進捗は保存済みのため、再実行で続きから再開できる）
+            for future in [executor.submit(self._copy_segment, index) for index in pending]:
+                future.result()
+        self._checkpoint.user_ids = sorted(self._user_ids)
+        return self._checkpoint
+
+    def _scan_kwargs(self) -> Dict[str, Any]:
+        """Scanの追加の引数（FilterExpressionなど）"""
+        return {}
+
+    @abstractmethod
+    def _write_item(self, item: Dict[str, Any]) -> Optional[bool]:
+        """1つの項目を書き込み、書き込んだかを返す（対象外の項目はNone）"""
+
+    def _copy_segment(self, index: int) -> None:
+        progress = self._checkpoint.segments[index]
+        while not progress.done:
+            scan_kwargs: Dict[str, Any] = {
+                'TableName': self._source_table,
+                'Segment': index,
+                'TotalSegments': self._total_segments,
+                **self._scan_kwargs(),
+            }
+            if self._page_size:
+                scan_kwargs['Limit'] = self._page_size
+            if progress.last_evaluated_key:
+                scan_kwargs['ExclusiveStartKey'] = progress.last_evaluated_key
+
+            response = self._client.scan(**scan_kwargs)
+            copied = skipped = 0
+            user_ids: Set[str] = set()
+            for item in response.get('Items', []):
+                written = self._write_item(item)
+                if written is None:
+                    continue
+                if written:
+                    copied += 1
+                else:
+                    skipped += 1
+                user_ids.add(item['user_id']['S'])
+
+            # ページの書き込みが終わってから進捗を保存する（途中で中断した場合はページの先頭から書き直す）
+            with self._lock:
+                progress.scanned += len(response.get('Items', []))
+                progress.copied += copied
+                progress.skipped += skipped
+                progress.last_evaluated_key = response.get('LastEvaluatedKey')
+                progress.done = progress.last_evaluated_key is None
+                # 新しいユーザーのみ、進捗より先に追記する（チェックポイントには進捗のみ保存する）
+                new_user_ids = user_ids - self._user_ids
+                if new_user_ids:
+                    _append_user_ids(self._user_ids_path, new_user_ids)
+                    self._user_ids.update(new_user_ids)
+                self._checkpoint.save(self._checkpoint_path)
+
+        logger.info('Segment copied', extra={'fields': {'segment': index, **asdict(progress)}})
+
+
+class TaskTableMigration(_SegmentedScan):
+    """タスクテーブルの項目を、並列のScanで別のテーブルにコピーする"""
+
+    def __init__(
+        self,
+        client: Any,
+        source_table: str,
+        target_table: str,
+        checkpoint_path: str,
+        total_segments: int = 8,
+        max_workers: Optional[int] = None,
+        page_size: Optional[int] = None,
+        summary_rebuilder: Optional[Callable[[str], Any]] = None,
+    ):
+        if source_table == target_table:
+            raise ValueError('source_table and target_table must be different')
+        super().__init__(client, source_table, target_table, checkpoint_path, total_segments, max_workers, page_size)
+        self._summary_rebuilder = summary_rebuilder
+
+    def run(self) -> MigrationCheckpoint:
+        """未完了のセグメントをコピーし、コピーしたユーザーの集計を作り直す"""
+        checkpoint = super().run()
+        if self._summary_rebuilder is not None:
+            for user_id in checkpoint.user_ids:
+                self._summary_rebuilder(user_id)
+        return checkpoint
+
+    def _write_item(self, item: Dict[str, Any]) -> Optional[bool]:
+        if is_summary_item(item):
+            return None
+        if needs_index_keys(item):
+            # GSIの導入前に作成されたタスクは、移行先の絞り込み・並べ替えのGSIに含まれるようにキー属性を導出する
+            item = {**item, **index_key_attributes(item)}
+        return self._put_if_newer(item)
+
+    def _put_if_newer(self, item: Dict[str, Any]) -> bool:
+        """移行先に同じか新しい項目がない場合のみ書き込み、書き込んだかを返す"""
+        put_kwargs: Dict[str, Any] = {'TableName': self._target_table, 'Item': item}
+        if 'updated_at' in item:
+            put_kwargs.update(
+                ConditionExpression=_NEWER_CONDITION,
+                ExpressionAttributeNames={'#updated_at': 'updated_at'},
+                ExpressionAttributeValues={':updated_at': item['updated_at']},
+            )
+        else:
+            put_kwargs['ConditionExpression'] = 'attribute_not_exists(task_id)'
+        try:
+            self._client.put_item(**put_kwargs)
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            return False
+
+
+class TaskIndexBackfill(_SegmentedScan):
+    """GSIのキー属性を持たない既存のタスクに、`user_status` / `due_sort` を書き込む
+
+    GSI（UserStatusIndex・UserDueDateIndex）の導入前に作成され、その後ステータス・期限が変更されていない
+    タスクはキー属性を持たず、絞り込み・並べ替えの結果に含まれない。
+    書き込みは読み込んだ時点から `updated_at` が変わっていないことを条件とし、間に更新されたタスクは
+    読み込み直して、まだキー属性がない場合のみ書き込み直す。
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        table_name: str,
+        checkpoint_path: str,
+        total_segments: int = 8,
+        max_workers: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ):
+        super().__init__(client, table_name, table_name, checkpoint_path, total_segments, max_workers, page_size)
+
+    def _scan_kwargs(self) -> Dict[str, Any]:
+        return {
+            'FilterExpression': _MISSING_INDEX_KEYS_FILTER,
+            'ExpressionAttributeNames': {
+                '#status': 'status', '#user_status': USER_STATUS_ATTRIBUTE, '#due_sort': DUE_SORT_ATTRIBUTE,
+            },
+        }
+
+    def _write_item(self, item: Dict[str, Any]) -> Optional[bool]:
+        key = {'task_id': item['task_id'], 'user_id': item['user_id']}
+        for _ in range(BACKFILL_MAX_ATTEMPTS):
+            if not needs_index_keys(item):
+                return False
+            keys = index_key_attributes(item)
+            try:
+                self._client.update_item(
+                    TableName=self._target_table,
+                    Key=key,
+                    UpdateExpression='SET #user_status = :user_status, #due_sort = :due_sort',
+                    ConditionExpression='#updated_at = :updated_at',
+                    ExpressionAttributeNames={
+                        '#user_status': USER_STATUS_ATTRIBUTE,
+                        '#due_sort': DUE_SORT_ATTRIBUTE,
+                        '#updated_at': 'updated_at',
+                    },
+                    ExpressionAttributeValues={
+                        ':user_status': keys[USER_STATUS_ATTRIBUTE],
+                        ':due_sort': keys[DUE_SORT_ATTRIBUTE],
+                        ':updated_at': item['updated_at'],
+                    },
+                )
+                return True
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+            # 書き込みの間に更新・削除された
+            item = self._client.get_item(TableName=self._target_table, Key=key, ConsistentRead=True).get('Item')
+            if item is None:
+                return False
+        return False
+
+
+class TaskSummaryRebuild(_SegmentedScan):
+    """タスクのテーブルを並列のScanで読み込んでユーザーを集め、ユーザーごとの集計を作り直す
+
+    集計テーブルの導入前に作成されたタスクの反映や、集計の不整合の修正に使用する。
+    Scanではuser_idのみを読み込み、集計の作り直しは全セグメントの完了後に `summary_rebuilder` で行う
+    （墓標のみのユーザーも含め、件数が0の集計に戻す）。
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        table_name: str,
+        checkpoint_path: str,
+        summary_rebuilder: Callable[[str], Any],
+        total_segments: int = 8,
+        max_workers: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ):
+        super().__init__(client, table_name, table_name, checkpoint_path, total_segments, max_workers, page_size)
+        self._summary_rebuilder = summary_rebuilder
+
+    def run(self) -> MigrationCheckpoint:
+        """未完了のセグメントからユーザーを集め、集めたユーザーの集計を作り直す"""
+        checkpoint = super().run()
+        for user_id in checkpoint.user_ids:
+            self._summary_rebuilder(user_id)
+        return checkpoint
+
+    def _scan_kwargs(self) -> Dict[str, Any]:
+        return {
+            'ProjectionExpression': 'user_id',
+            'FilterExpression': _TASK_OR_TOMBSTONE_FILTER,
+            'ExpressionAttributeNames': {'#status': 'status'},
+        }
+
+    def _write_item(self, item: Dict[str, Any]) -> Optional[bool]:
+        # 項目は書き込まず、ユーザーIDのみを集める
+        return False
@@ -0,0 +1,57 @@
+import hashlib
+from typing import Any, Dict, Iterable, Optional
+
+
+def _digest(*parts: str) -> str:
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(part.encode('utf-8'))
+        hasher.update(b'\0')
+    return f'"{hasher.hexdigest()[:32]}"'
+
+
+def task_etag(version: int) -> str:
+    """タスクの強いETag
+
+    書き込みのたびに1ずつ増える版をそのまま使用し、If-Matchの値から条件付き書き込みの版を取り出せるようにする。
+    """
+    return f'"{version}"'
+
+
+def version_from_etag(header_value: str) -> int:
+    """If-Matchヘッダーの値（タスクのETag）から版を取り出す（不正な値はValueError）"""
+    value = header_value.strip()
+    digits = value[1:-1]
+    if len(value) < 3 or value[0] != '"' or value[-1] != '"' or not (digits.isascii() and digits.isdigit()):
+        raise ValueError('If-Match must be a single task ETag')
+    return int(digits)
+
+
+def list_etag(items: Iterable[Dict[str, Any]], next_token: Optional[str]) -> str:
+    """一覧のページの強いETag
+
+    ページに含まれるタスクのIDと `updated_at`、次のページのトークンから生成するため、
+    タスクの追加・更新・削除のいずれでも値が変わる。
+    """
+    parts = ['list', next_token or '']
+    for item in items:
+        parts.append(item.get('task_id') or '')
+        parts.append(item.get('updated_at') or '')
+    return _digest(*parts)
+
+
+def summary_etag(user_id: str, counts: Dict[str, int]) -> str:
+    """ステータスごとのタスク数の強いETag"""
+    parts = ['summary', user_id]
+    for status, count in sorted(counts.items()):
+        parts.append(status)
+        parts.append(str(count))
+    return _digest(*parts)
+
+
+def etag_matches(header_value: Optional[str], etag: str) -> bool:
+    """If-None-Match / If-Match ヘッダーの値がETagに一致するか"""
+    if not header_value:
+        return False
+    candidates = [candidate.strip() for candidate in header_value.split(',')]
+    return '*' in candidates or etag in candidates
@@ -0,0 +1,40 @@
+import dataclasses
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+try:
+    # 利用可能な場合は高速なエンコーダーを使用する
+    import orjson
+except ImportError:  # pragma: no cover - オプションの依存関係
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """標準でエンコードできない値の変換"""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return obj.__dict__
+    if isinstance(obj, Decimal):
+        # DynamoDBの数値型はDecimalで返される
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    return str(obj)
+
+
+def to_json_bytes(obj: Any) -> bytes:
+    """オブジェクトをUTF-8のJSONバイト列にエンコードする
+
+    DTO（dataclass）やエンティティは中間の辞書を作らずにそのまま渡せる。
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def to_json(obj: Any) -> str:
+    """オブジェクトをJSON文字列にエンコードする（API Gatewayのレスポンスボディ用）"""
+    return to_json_bytes(obj).decode('utf-8')
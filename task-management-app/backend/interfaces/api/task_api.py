@@ -1,16 +1,32 @@
 import json
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 
 from ...application.dtos.task_dto import TaskDTO
 from ...application.use_cases.task_use_cases import TaskUseCases
-from ...infrastructure.auth.cognito_auth_service import CognitoAuthService
+from ...domain.exceptions.task_exceptions import TaskBatchError, TaskConflictError, TaskNotFoundError
+from ...domain.value_objects.task_status import TaskStatus
+from ...shared import tracing
+from .etag import etag_matches, list_etag, summary_etag, task_etag, version_from_etag
+from .serialization import to_json
+
+# GETのレスポンスは利用者ごとに異なるため、共有キャッシュには保存させず毎回再検証させる
+CACHE_CONTROL = 'private, no-cache'
+EXPOSED_HEADERS = 'X-Next-Token,ETag'
+# 一覧の絞り込み・並べ替えのクエリパラメータ
+SEARCH_PARAMETERS = ('status', 'due_after', 'due_before', 'sort', 'created_after')
+# PUTで更新できるフィールド（その他の属性は無視する）
+UPDATE_FIELDS = ('title', 'description', 'status', 'due_date')
+
+if TYPE_CHECKING:
+    # jwt/cryptographyのインポートをコールドスタート時に発生させない
+    from ...infrastructure.auth.cognito_auth_service import CognitoAuthService
 
 
 class TaskAPI:
     """タスクAPIのハンドラー"""
 
-    def __init__(self, task_use_cases: TaskUseCases, auth_service: CognitoAuthService):
+    def __init__(self, task_use_cases: TaskUseCases, auth_service: "CognitoAuthService"):
         self._task_use_cases = task_use_cases
         self._auth_service = auth_service
 
@@ -23,28 +39,202 @@ class TaskAPI:
             return None
             
         token = auth_header[7:]  # 'Bearer 'の後の部分を取得
-        return self._auth_service.get_user_id_from_token(token)
+        with tracing.span('api.authenticate'):
+            return self._auth_service.get_user_id_from_token(token)
+
+    @staticmethod
+    def _get_header(event: Dict[str, Any], name: str) -> Optional[str]:
+        """リクエストヘッダーを大文字・小文字を区別せずに取得する"""
+        headers = event.get('headers') or {}
+        value = headers.get(name)
+        if value is not None:
+            return value
+        lower_name = name.lower()
+        for key, value in headers.items():
+            if key.lower() == lower_name:
+                return value
+        return None
 
-    def _create_response(self, status_code: int, body: Any) -> Dict[str, Any]:
+    def _create_conditional_response(
+        self, event: Dict[str, Any], etag: str, body: Any, headers: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """ETag付きのレスポンスを作成する（If-None-Matchに一致する場合は304）"""
+        response_headers = {
+            'ETag': etag,
+            'Cache-Control': CACHE_CONTROL,
+            'Access-Control-Expose-Headers': EXPOSED_HEADERS,
+        }
+        if headers:
+            response_headers.update(headers)
+
+        if etag_matches(self._get_header(event, 'If-None-Match'), etag):
+            # ボディのエンコードを行わない
+            response_headers.update({
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Credentials': True,
+            })
+            return {'statusCode': 304, 'headers': response_headers, 'body': ''}
+        return self._create_response(200, body, response_headers)
+
+    def _create_response(
+        self, status_code: int, body: Any, headers: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """APIレスポンスを作成する"""
+        response_headers = {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Credentials': True,
+        }
+        if headers:
+            response_headers.update(headers)
+        with tracing.span('api.serialize'):
+            response_body = to_json(body)
         return {
             'statusCode': status_code,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Credentials': True,
-            },
-            'body': json.dumps(body, default=str)
+            'headers': response_headers,
+            'body': response_body
         }
 
+    @staticmethod
+    def _task_etag_headers(task: TaskDTO) -> Dict[str, Any]:
+        """更新後のタスクのETag（続けて更新する場合のIf-Matchに使用する）"""
+        return {'ETag': task_etag(task.version), 'Access-Control-Expose-Headers': EXPOSED_HEADERS}
+
+    def _get_expected_version(self, event: Dict[str, Any], body: Dict[str, Any]) -> Tuple[Optional[int], int]:
+        """更新の条件とする版と、版が一致しない場合のステータスコードを返す
+
+        If-Matchヘッダー（タスクのETag）を優先し、一致しない場合は412とする。
+        ヘッダーがなくボディに `version` を指定した場合は、一致しない場合を409とする。
+        どちらもない場合は版を確認せずに更新する。不正な値はValueError。
+        """
+        if_match = self._get_header(event, 'If-Match')
+        if if_match is not None and if_match.strip() != '*':
+            return version_from_etag(if_match), 412
+        version = body.get('version')
+        if version is not None and (not isinstance(version, int) or isinstance(version, bool) or version < 0):
+            raise ValueError('version must be a non-negative integer')
+        return version, 409
+
+    @staticmethod
+    def _parse_batch_request(body: Any, user_id: str) -> Tuple[str, Any]:
+        """一括操作のボディを解析し、操作と対象（DTOまたはタスクIDのリスト）を返す
+
+        不正なボディはValueErrorとする。
+        """
+        operation = body.get('operation') if isinstance(body, dict) else None
+
+        if operation == 'create':
+            items = body.get('tasks')
+            if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+                raise ValueError('tasks must be a list of objects')
+            if not all(item.get('title') for item in items):
+                raise ValueError('Title is required')
+
+            return operation, [
+                TaskDTO(
+                    task_id=None,
+                    title=item.get('title'),
+                    description=item.get('description'),
+                    status=item.get('status', TaskStatus.NOT_STARTED.value),
+                    due_date=item.get('due_date'),
+                    user_id=user_id,
+                    created_at=None,
+                    updated_at=None
+                )
+                for item in items
+            ]
+
+        if operation in ('get', 'delete'):
+            task_ids = TaskAPI._get_task_ids(body)
+            if task_ids is None:
+                raise ValueError('task_ids must be a list of strings')
+            return operation, task_ids
+
+        raise ValueError('operation must be one of create, get, delete')
+
+    @staticmethod
+    def _get_task_ids(body: Dict[str, Any]) -> Optional[List[str]]:
+        """ボディからタスクIDのリストを取得する"""
+        task_ids = body.get('task_ids')
+        if not isinstance(task_ids, list) or not all(isinstance(task_id, str) for task_id in task_ids):
+            return None
+        return task_ids
+
     def handle_get_all_tasks(self, event: Dict[str, Any]) -> Dict[str, Any]:
-        """すべてのタスクを取得するハンドラー"""
+        """タスク一覧をページ単位で取得するハンドラー
+
+        クエリパラメータ `limit` と `next_token` でページを指定する。
+        次のページがある場合は `X-Next-Token` ヘッダーでトークンを返す。
+        `status` / `due_after` / `due_before` / `sort` で絞り込み・並べ替えができる。
+        `sort=-created_at` で新しい順、`created_after` で指定した時刻より後に作成されたタスクを返す。
+        `since` を指定した場合は、その時刻以降の変更のみを返す。
+        """
         user_id = self._get_user_id_from_event(event)
         if not user_id:
             return self._create_response(401, {'message': 'Unauthorized'})
-            
-        tasks = self._task_use_cases.get_all_tasks(user_id)
-        return self._create_response(200, [task.__dict__ for task in tasks])
+
+        query_parameters = event.get('queryStringParameters') or {}
+        limit_param = query_parameters.get('limit')
+        if limit_param and not limit_param.isdigit():
+            return self._create_response(400, {'message': 'limit must be an integer'})
+
+        since = query_parameters.get('since')
+        if since is not None:
+            return self._handle_get_task_changes(event, user_id, since, limit_param, query_parameters)
+
+        try:
+            limit = int(limit_param) if limit_param else None
+            if any(query_parameters.get(name) for name in SEARCH_PARAMETERS):
+                # 絞り込み・並べ替えはGSI・テーブルのキー条件で行う
+                page = self._task_use_cases.search_task_items(
+                    user_id,
+                    **{name: query_parameters.get(name) for name in SEARCH_PARAMETERS},
+                    limit=limit,
+                    next_token=query_parameters.get('next_token')
+                )
+            else:
+                # 一覧はエンティティを構築せずに、取得した属性をそのままエンコードする
+                page = self._task_use_cases.get_all_task_items(
+                    user_id, limit=limit, next_token=query_parameters.get('next_token')
+                )
+        except ValueError as e:
+            return self._create_response(400, {'message': str(e)})
+
+        headers = {}
+        if page.next_token:
+            headers['X-Next-Token'] = page.next_token
+        return self._create_conditional_response(
+            event, list_etag(page.items, page.next_token), page.items, headers
+        )
+
+    def _handle_get_task_changes(
+        self,
+        event: Dict[str, Any],
+        user_id: str,
+        since: str,
+        limit_param: Optional[str],
+        query_parameters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """`since` 以降に変更・削除されたタスクを返す（差分同期）
+
+        次回は `next_since` を `since` に指定する（`X-Next-Token` がある場合は同じ `since` で続きを取得する）。
+        """
+        try:
+            limit = int(limit_param) if limit_param else None
+            page = self._task_use_cases.get_task_changes(
+                user_id, since, limit=limit, next_token=query_parameters.get('next_token')
+            )
+        except ValueError as e:
+            return self._create_response(400, {'message': str(e)})
+
+        headers = {'Access-Control-Expose-Headers': EXPOSED_HEADERS}
+        if page.next_token:
+            headers['X-Next-Token'] = page.next_token
+        return self._create_response(200, {
+            'tasks': page.items,
+            'deleted_task_ids': page.deleted_task_ids,
+            'next_since': page.last_updated_at or since
+        }, headers)
 
     def handle_get_task(self, event: Dict[str, Any]) -> Dict[str, Any]:
         """特定のタスクを取得するハンドラー"""
@@ -63,7 +253,20 @@ class TaskAPI:
         if not task:
             return self._create_response(404, {'message': 'Task not found'})
             
-        return self._create_response(200, task.__dict__)
+        return self._create_conditional_response(event, task_etag(task.version), task)
+
+    def handle_get_task_summary(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """ステータスごとのタスク数を取得するハンドラー"""
+        user_id = self._get_user_id_from_event(event)
+        if not user_id:
+            return self._create_response(401, {'message': 'Unauthorized'})
+
+        try:
+            summary = self._task_use_cases.get_task_summary(user_id)
+        except Exception as e:
+            return self._create_response(500, {'message': str(e)})
+
+        return self._create_conditional_response(event, summary_etag(user_id, summary.by_status), summary)
 
     def handle_create_task(self, event: Dict[str, Any]) -> Dict[str, Any]:
         """タスクを作成するハンドラー"""
@@ -82,7 +285,7 @@ class TaskAPI:
                 task_id=None,
                 title=body.get('title'),
                 description=body.get('description'),
-                status=body.get('status', 'NOT_STARTED'),
+                status=body.get('status'),
                 due_date=body.get('due_date'),
                 user_id=user_id,
                 created_at=None,
@@ -90,16 +293,22 @@ class TaskAPI:
             )
             
             created_task = self._task_use_cases.create_task(task_dto)
-            return self._create_response(201, created_task.__dict__)
+            return self._create_response(201, created_task)
         except Exception as e:
             return self._create_response(500, {'message': str(e)})
 
     def handle_update_task(self, event: Dict[str, Any]) -> Dict[str, Any]:
-        """タスクを更新するハンドラー"""
+        """タスクを更新するハンドラー
+
+        PUTはボディに含まれるフィールドのみを更新し、含まれないフィールドは既存の値を保持する。
+        既存タスクの事前取得は行わず、変更するフィールドだけを1回の条件付き書き込みで更新する
+        （存在しない場合は404）。If-Match（またはボディの `version`）を指定した場合は、版が一致する場合のみ更新する。
+        """
         user_id = self._get_user_id_from_event(event)
         if not user_id:
             return self._create_response(401, {'message': 'Unauthorized'})
             
+        conflict_status = 409
         try:
             path_parameters = event.get('pathParameters', {})
             task_id = path_parameters.get('taskId')
@@ -107,27 +316,59 @@ class TaskAPI:
             if not task_id:
                 return self._create_response(400, {'message': 'Task ID is required'})
                 
-            body = json.loads(event.get('body', '{}'))
+            body = json.loads(event.get('body') or '{}')
+            if not isinstance(body, dict):
+                return self._create_response(400, {'message': 'Request body must be an object'})
             
-            # 既存のタスクを取得
-            existing_task = self._task_use_cases.get_task(task_id, user_id)
-            if not existing_task:
-                return self._create_response(404, {'message': 'Task not found'})
-                
-            # 更新するフィールドを設定
-            task_dto = TaskDTO(
-                task_id=task_id,
-                title=body.get('title', existing_task.title),
-                description=body.get('description', existing_task.description),
-                status=body.get('status', existing_task.status),
-                due_date=body.get('due_date', existing_task.due_date),
-                user_id=user_id,
-                created_at=existing_task.created_at,
-                updated_at=None  # 更新時に自動設定される
-            )
+            # 必須フィールドの検証
+            if 'title' in body and not body['title']:
+                return self._create_response(400, {'message': 'Title is required'})
+            expected_version, conflict_status = self._get_expected_version(event, body)
+            changes = {name: body[name] for name in UPDATE_FIELDS if name in body}
             
-            updated_task = self._task_use_cases.update_task(task_dto)
-            return self._create_response(200, updated_task.__dict__)
+            updated_task = self._task_use_cases.patch_task(task_id, user_id, changes, expected_version)
+            return self._create_response(200, updated_task, self._task_etag_headers(updated_task))
+        except TaskNotFoundError:
+            return self._create_response(404, {'message': 'Task not found'})
+        except TaskConflictError as e:
+            return self._create_response(conflict_status, {'message': str(e)})
+        except ValueError as e:
+            return self._create_response(400, {'message': str(e)})
+        except Exception as e:
+            return self._create_response(500, {'message': str(e)})
+
+    def handle_patch_task(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """タスクの一部のフィールドを更新するハンドラー（版の条件はPUTと同じ）"""
+        user_id = self._get_user_id_from_event(event)
+        if not user_id:
+            return self._create_response(401, {'message': 'Unauthorized'})
+
+        path_parameters = event.get('pathParameters') or {}
+        task_id = path_parameters.get('taskId')
+
+        if not task_id:
+            return self._create_response(400, {'message': 'Task ID is required'})
+
+        conflict_status = 409
+        try:
+            body = json.loads(event.get('body') or '{}')
+            if not isinstance(body, dict):
+                return self._create_response(400, {'message': 'No fields to update'})
+            expected_version, conflict_status = self._get_expected_version(event, body)
+            changes = {name: value for name, value in body.items() if name != 'version'}
+            if not changes:
+                return self._create_response(400, {'message': 'No fields to update'})
+            if 'title' in changes and not changes['title']:
+                return self._create_response(400, {'message': 'Title is required'})
+
+            updated_task = self._task_use_cases.patch_task(task_id, user_id, changes, expected_version)
+            return self._create_response(200, updated_task, self._task_etag_headers(updated_task))
+        except TaskNotFoundError:
+            return self._create_response(404, {'message': 'Task not found'})
+        except TaskConflictError as e:
+            return self._create_response(conflict_status, {'message': str(e)})
+        except ValueError as e:
+            return self._create_response(400, {'message': str(e)})
         except Exception as e:
             return self._create_response(500, {'message': str(e)})
 
@@ -149,5 +390,36 @@ class TaskAPI:
                 return self._create_response(204, {})
             else:
                 return self._create_response(404, {'message': 'Task not found'})
+        except TaskNotFoundError:
+            return self._create_response(404, {'message': 'Task not found'})
+        except Exception as e:
+            return self._create_response(500, {'message': str(e)})
+
+    def handle_batch_tasks(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """タスクを一括で作成・取得・削除するハンドラー
+
+        ボディの `operation` に `create`（`tasks`）、`get` / `delete`（`task_ids`）を指定する。
+        """
+        user_id = self._get_user_id_from_event(event)
+        if not user_id:
+            return self._create_response(401, {'message': 'Unauthorized'})
+
+        try:
+            operation, payload = self._parse_batch_request(json.loads(event.get('body') or '{}'), user_id)
+
+            if operation == 'create':
+                created_tasks = self._task_use_cases.create_tasks(payload)
+                return self._create_response(201, created_tasks)
+
+            if operation == 'get':
+                tasks = self._task_use_cases.get_tasks(payload, user_id)
+                return self._create_response(200, tasks)
+
+            deleted_count = self._task_use_cases.delete_tasks(payload, user_id)
+            return self._create_response(200, {'deleted_count': deleted_count})
+        except TaskBatchError as e:
+            return self._create_response(503, {'message': str(e)})
+        except ValueError as e:
+            return self._create_response(400, {'message': str(e)})
         except Exception as e:
             return self._create_response(500, {'message': str(e)})
@@ -0,0 +1,127 @@
+import os
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Optional, TypeVar
+
+from ...shared import structured_logging
+
+if TYPE_CHECKING:
+    from ...application.use_cases.task_use_cases import TaskUseCases
+    from ...domain.repositories.task_repository import TaskRepository
+    from ...domain.services.task_service import TaskService
+    from ...infrastructure.auth.cognito_auth_service import CognitoAuthService
+    from ...infrastructure.persistence.task_cache_store import TaskCacheStore
+    from ..api.task_api import TaskAPI
+
+
+T = TypeVar('T')
+
+logger = structured_logging.get_logger('container')
+
+
+class Container:
+    """依存関係を遅延初期化するコンテナ
+
+    各コンポーネントは初めて参照されたときに、必要なモジュールの
+    インポートを含めて構築される。構築にかかった時間（依存先を含む）は
+    `init_timings` にミリ秒単位で記録される。
+    """
+
+    def __init__(self):
+        self._task_cache_store: Optional["TaskCacheStore"] = None
+        self._task_cache_store_created = False
+        self._task_repository: Optional["TaskRepository"] = None
+        self._task_service: Optional["TaskService"] = None
+        self._task_use_cases: Optional["TaskUseCases"] = None
+        self._auth_service: Optional["CognitoAuthService"] = None
+        self._task_api: Optional["TaskAPI"] = None
+        self.init_timings: Dict[str, float] = {}
+
+    def _timed(self, name: str, factory: Callable[[], T]) -> T:
+        """コンポーネントを構築し、所要時間を記録する"""
+        start = time.perf_counter()
+        component = factory()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.init_timings[name] = elapsed_ms
+        logger.info('Initialized component', extra={'fields': {'component': name, 'elapsed_ms': round(elapsed_ms, 1)}})
+        return component
+
+    @property
+    def task_cache_store(self) -> Optional["TaskCacheStore"]:
+        """読み込みキャッシュの保存先（無効な場合はNone）"""
+        if not self._task_cache_store_created:
+            self._task_cache_store = self._timed('task_cache_store', self._create_task_cache_store)
+            self._task_cache_store_created = True
+        return self._task_cache_store
+
+    @property
+    def task_repository(self) -> "TaskRepository":
+        if self._task_repository is None:
+            self._task_repository = self._timed('task_repository', self._create_task_repository)
+        return self._task_repository
+
+    @property
+    def task_service(self) -> "TaskService":
+        if self._task_service is None:
+            self._task_service = self._timed('task_service', self._create_task_service)
+        return self._task_service
+
+    @property
+    def task_use_cases(self) -> "TaskUseCases":
+        if self._task_use_cases is None:
+            self._task_use_cases = self._timed('task_use_cases', self._create_task_use_cases)
+        return self._task_use_cases
+
+    @property
+    def auth_service(self) -> "CognitoAuthService":
+        if self._auth_service is None:
+            self._auth_service = self._timed('auth_service', self._create_auth_service)
+        return self._auth_service
+
+    @property
+    def task_api(self) -> "TaskAPI":
+        if self._task_api is None:
+            self._task_api = self._timed('task_api', self._create_task_api)
+        return self._task_api
+
+    def _create_task_cache_store(self) -> Optional["TaskCacheStore"]:
+        # 読み込みキャッシュは環境変数で有効にする
+        if os.environ.get('TASK_CACHE_ENABLED', 'false').lower() != 'true':
+            return None
+
+        from ...infrastructure.persistence.task_cache_store import InMemoryTaskCacheStore, RedisTaskCacheStore
+
+        redis_url = os.environ.get('TASK_CACHE_REDIS_URL')
+        if redis_url:
+            return RedisTaskCacheStore.from_url(redis_url)
+        return InMemoryTaskCacheStore(int(os.environ.get('TASK_CACHE_MAX_SIZE', '1024')))
+
+    @staticmethod
+    def _with_cache(repository: "TaskRepository", store: Optional["TaskCacheStore"]) -> "TaskRepository":
+        """キャッシュが有効な場合は、読み込みのキャッシュと書き込み時の無効化を行うリポジトリで包む"""
+        if store is None:
+            return repository
+
+        from ...infrastructure.persistence.caching_task_repository import CachingTaskRepository
+        return CachingTaskRepository(
+            repository, store, float(os.environ.get('TASK_CACHE_TTL_SECONDS', '30'))
+        )
+
+    def _create_task_repository(self) -> "TaskRepository":
+        from ...infrastructure.persistence.dynamodb_task_repository import DynamoDBTaskRepository
+        return self._with_cache(DynamoDBTaskRepository(), self.task_cache_store)
+
+    def _create_task_service(self) -> "TaskService":
+        from ...domain.services.task_service import TaskService
+        return TaskService(self.task_repository)
+
+    def _create_task_use_cases(self) -> "TaskUseCases":
+        from ...application.use_cases.task_use_cases import TaskUseCases
+        return TaskUseCases(self.task_service)
+
+    def _create_auth_service(self) -> "CognitoAuthService":
+        from ...infrastructure.auth.cognito_auth_service import CognitoAuthService
+        return CognitoAuthService()
+
+    def _create_task_api(self) -> "TaskAPI":
+        from ..api.task_api import TaskAPI
+        return TaskAPI(self.task_use_cases, self.auth_service)
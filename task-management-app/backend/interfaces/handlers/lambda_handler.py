@@ -1,60 +1,58 @@
-import json
 import os
-from typing import Dict, Any
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 
-from ...application.use_cases.task_use_cases import TaskUseCases
-from ...domain.services.task_service import TaskService
-from ...infrastructure.auth.cognito_auth_service import CognitoAuthService
-from ...infrastructure.persistence.dynamodb_task_repository import DynamoDBTaskRepository
-from ..api.task_api import TaskAPI
+from ...shared import structured_logging, tracing
+from .container import Container
+from .router import Router, bearer_auth_middleware, timing_middleware
 
 
-# 依存関係の初期化
-task_repository = DynamoDBTaskRepository()
-task_service = TaskService(task_repository)
-task_use_cases = TaskUseCases(task_service)
-auth_service = CognitoAuthService()
-task_api = TaskAPI(task_use_cases, auth_service)
+# ログレベルとサンプリングの割合はLOG_LEVEL・LOG_SAMPLE_RATEで指定する
+structured_logging.configure()
+logger = structured_logging.get_logger('handler')
+
+# TRACING_ENABLEDが有効な場合、リクエストごとの処理時間の内訳をEMFで出力する
+if os.environ.get('TRACING_ENABLED', '').lower() in ('1', 'true', 'yes'):
+    tracing.configure(tracing.EmfStdoutTraceExporter())
+
+# 依存関係はルートが必要とした時点で初期化する
+container = Container()
+
+# タスク関連のエンドポイント
+_task_middlewares = (timing_middleware, bearer_auth_middleware)
+_task_routes: List[Tuple[str, str, Callable[[Dict[str, Any]], Any]]] = [
+    ('GET', '/tasks', lambda event: container.task_api.handle_get_all_tasks(event)),
+    ('POST', '/tasks', lambda event: container.task_api.handle_create_task(event)),
+    ('POST', '/tasks/batch', lambda event: container.task_api.handle_batch_tasks(event)),
+    ('GET', '/tasks/summary', lambda event: container.task_api.handle_get_task_summary(event)),
+    ('GET', '/tasks/{taskId}', lambda event: container.task_api.handle_get_task(event)),
+    ('PUT', '/tasks/{taskId}', lambda event: container.task_api.handle_update_task(event)),
+    ('PATCH', '/tasks/{taskId}', lambda event: container.task_api.handle_patch_task(event)),
+    ('DELETE', '/tasks/{taskId}', lambda event: container.task_api.handle_delete_task(event)),
+]
+
+router = Router()
+for _method, _resource, _route_handler in _task_routes:
+    router.add_route(_method, _resource, _route_handler, _task_middlewares)
+
+
+@contextmanager
+def _request_scope(event: Dict[str, Any]) -> Iterator[None]:
+    """リクエスト単位のログと計測（ルートのメソッドとリソースをトレース名とする）の範囲"""
+    request_id = (event.get('requestContext') or {}).get('requestId')
+    route = f"{event.get('httpMethod') or ''} {event.get('resource') or ''}"
+    with structured_logging.request_context(request_id), tracing.start_trace(route, request_id=request_id):
+        # イベント全体のシリアライズは、DEBUGまたはサンプリング対象のリクエストで出力する場合のみ行う
+        logger.debug(
+            'Received event',
+            extra={'fields': {'event': structured_logging.Lazy(structured_logging.redact_event, event)}}
+        )
+        yield
 
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Lambda関数のメインハンドラー"""
-    print(f"Received event: {json.dumps(event)}")
-    
     # API Gateway経由のイベントを処理
-    http_method = event.get('httpMethod')
-    resource = event.get('resource')
-    
-    # CORSプリフライトリクエストの処理
-    if http_method == 'OPTIONS':
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
-                'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-                'Access-Control-Allow-Credentials': True,
-            },
-            'body': ''
-        }
-    
-    # タスク関連のエンドポイントをルーティング
-    if resource == '/tasks' and http_method == 'GET':
-        return task_api.handle_get_all_tasks(event)
-    elif resource == '/tasks' and http_method == 'POST':
-        return task_api.handle_create_task(event)
-    elif resource == '/tasks/{taskId}' and http_method == 'GET':
-        return task_api.handle_get_task(event)
-    elif resource == '/tasks/{taskId}' and http_method == 'PUT':
-        return task_api.handle_update_task(event)
-    elif resource == '/tasks/{taskId}' and http_method == 'DELETE':
-        return task_api.handle_delete_task(event)
-    else:
-        return {
-            'statusCode': 404,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'message': 'Not Found'})
-        }
+    with _request_scope(event):
+        return router.dispatch(event)
+
@@ -0,0 +1,151 @@
+import json
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+
+Event = Dict[str, Any]
+Response = Dict[str, Any]
+RouteHandler = Callable[[Event], Response]
+Middleware = Callable[[Event, RouteHandler], Response]
+
+CORS_ALLOW_HEADERS = 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,If-None-Match,If-Match'
+
+ERROR_RESPONSE_HEADERS: Dict[str, Any] = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+}
+UNAUTHORIZED_RESPONSE_HEADERS: Dict[str, Any] = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Credentials': True,
+}
+
+
+def _json_response(status_code: int, body: Any, headers: Dict[str, Any]) -> Response:
+    return {
+        'statusCode': status_code,
+        'headers': dict(headers),
+        'body': json.dumps(body)
+    }
+
+
+def _wrap(middleware: Middleware, handler: RouteHandler) -> RouteHandler:
+    def wrapped(event: Event) -> Response:
+        return middleware(event, handler)
+    return wrapped
+
+
+class Router:
+    """(HTTPメソッド, リソーステンプレート) をキーとするテーブル駆動のルーター
+
+    API Gatewayのイベントはマッチしたリソーステンプレートを `resource` に持つため、
+    ルーティングは辞書の1回の参照で済む。ミドルウェアは登録時に合成しておく。
+    """
+
+    def __init__(self):
+        self._routes: Dict[Tuple[str, str], RouteHandler] = {}
+        self._allowed_methods: Dict[str, List[str]] = {}
+        self._preflight_headers: Dict[str, Dict[str, Any]] = {}
+        self._default_preflight_headers = self._build_preflight_headers([])
+
+    def add_route(
+        self,
+        method: str,
+        resource: str,
+        handler: RouteHandler,
+        middlewares: Sequence[Middleware] = (),
+    ) -> None:
+        """ルートを登録する（ミドルウェアは先頭のものが最も外側になる）"""
+        method = method.upper()
+        self._routes[(method, resource)] = self._compose(handler, middlewares)
+
+        methods = self._allowed_methods.setdefault(resource, [])
+        if method not in methods:
+            methods.append(method)
+        if method == 'GET' and 'HEAD' not in methods:
+            methods.append('HEAD')
+
+        # レスポンスヘッダーは登録時に構築しておく
+        self._preflight_headers[resource] = self._build_preflight_headers(methods)
+        self._default_preflight_headers = self._build_preflight_headers(
+            sorted({m for ms in self._allowed_methods.values() for m in ms})
+        )
+
+    @staticmethod
+    def _build_preflight_headers(methods: List[str]) -> Dict[str, Any]:
+        return {
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Headers': CORS_ALLOW_HEADERS,
+            'Access-Control-Allow-Methods': ','.join([*methods, 'OPTIONS']),
+            'Access-Control-Allow-Credentials': True,
+        }
+
+    def route(
+        self, method: str, resource: str, middlewares: Sequence[Middleware] = ()
+    ) -> Callable[[RouteHandler], RouteHandler]:
+        """ルートを登録するデコレーター"""
+        def decorator(handler: RouteHandler) -> RouteHandler:
+            self.add_route(method, resource, handler, middlewares)
+            return handler
+        return decorator
+
+    @staticmethod
+    def _compose(handler: RouteHandler, middlewares: Sequence[Middleware]) -> RouteHandler:
+        composed = handler
+        for middleware in reversed(middlewares):
+            composed = _wrap(middleware, composed)
+        return composed
+
+    def dispatch(self, event: Event) -> Response:
+        """イベントを対応するハンドラーに振り分ける"""
+        http_method = (event.get('httpMethod') or '').upper()
+        resource = event.get('resource') or ''
+
+        handler = self._routes.get((http_method, resource))
+        if handler is not None:
+            return handler(event)
+
+        # CORSプリフライトリクエストの処理
+        if http_method == 'OPTIONS':
+            return {
+                'statusCode': 200,
+                'headers': dict(self._preflight_headers.get(resource, self._default_preflight_headers)),
+                'body': ''
+            }
+
+        # HEADはGETのハンドラーで処理し、ボディを除く
+        if http_method == 'HEAD':
+            get_handler = self._routes.get(('GET', resource))
+            if get_handler is not None:
+                response = get_handler(event)
+                response['body'] = ''
+                return response
+
+        allowed_methods = self._allowed_methods.get(resource)
+        if allowed_methods:
+            headers = dict(ERROR_RESPONSE_HEADERS)
+            headers['Allow'] = ','.join([*allowed_methods, 'OPTIONS'])
+            return _json_response(405, {'message': 'Method Not Allowed'}, headers)
+
+        return _json_response(404, {'message': 'Not Found'}, ERROR_RESPONSE_HEADERS)
+
+
+def bearer_auth_middleware(event: Event, handler: RouteHandler) -> Response:
+    """Bearerトークンのないリクエストを依存関係の構築前に拒否する
+
+    トークンの検証自体は `TaskAPI` が行う。
+    """
+    headers = event.get('headers') or {}
+    auth_header = headers.get('Authorization') or headers.get('authorization')
+    if not auth_header or not auth_header.startswith('Bearer '):
+        return _json_response(401, {'message': 'Unauthorized'}, UNAUTHORIZED_RESPONSE_HEADERS)
+    return handler(event)
+
+
+def timing_middleware(event: Event, handler: RouteHandler) -> Response:
+    """ハンドラーの処理時間を `Server-Timing` ヘッダーに付与する"""
+    start = time.perf_counter()
+    response = handler(event)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    response.setdefault('headers', {})['Server-Timing'] = f'app;dur={elapsed_ms:.1f}'
+    return response
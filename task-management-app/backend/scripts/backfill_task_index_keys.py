@@ -0,0 +1,64 @@
+"""既存のタスクに、絞り込み・並べ替え用のGSIのキー属性（user_status・due_sort）を書き込む
+
+UserStatusIndex・UserDueDateIndexの導入前に作成されたタスクは、ステータス・期限を変更するまでキー属性を持たず、
+`GET /tasks?status=` などの結果に含まれない。並列のScanでキー属性のないタスクだけを読み込み、
+`status` / `due_date` から導出した値を書き込む。進捗は `--checkpoint` のファイルに保存する
+（中断した場合は同じ引数で再実行すると続きから再開する）。
+
+手順（既存のスタックにGSIを追加する場合。CloudFormationは1回の更新で1つのGSIしか追加できない）:
+    1. `TaskSearchIndexes=none` でデプロイし、UserIdUpdatedAtIndexのみ追加する（キー属性を書き込むコードも反映される）
+    2. このスクリプトでキー属性を書き込む
+    3. `TaskSearchIndexes=status` でデプロイし、UserStatusIndexを追加する
+    4. `TaskSearchIndexes=all` でデプロイし、UserDueDateIndexを追加する
+    各デプロイは前のGSIの作成が完了してから行う。
+
+使い方（task-management-app ディレクトリで実行）:
+    python backend/scripts/backfill_task_index_keys.py --table Tasks-dev --segments 8 \\
+        --checkpoint backfill-dev.json
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(APP_DIR))
+
+from backend.infrastructure.persistence.dynamodb_config import build_client_config, get_endpoint_url  # noqa: E402
+from backend.infrastructure.persistence.task_table_migration import TaskIndexBackfill  # noqa: E402
+from backend.shared import structured_logging  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='既存のタスクにGSIのキー属性を書き込む')
+    parser.add_argument('--table', required=True, help='タスクテーブル名')
+    parser.add_argument('--segments', type=int, default=8, help='並列のScanのセグメント数')
+    parser.add_argument('--workers', type=int, help='同時に処理するセグメント数（既定はセグメント数）')
+    parser.add_argument('--page-size', type=int, help='Scanの1ページあたりの項目数')
+    parser.add_argument('--checkpoint', required=True, help='進捗を保存するJSONファイル')
+    parser.add_argument('--endpoint-url', help='DynamoDB Localなどのエンドポイント')
+    args = parser.parse_args()
+
+    if args.endpoint_url:
+        os.environ['DYNAMODB_ENDPOINT_URL'] = args.endpoint_url
+    structured_logging.configure(level='INFO', sample_rate=0, stream=sys.stderr, buffer_capacity=1)
+
+    import boto3
+
+    client = boto3.client('dynamodb', endpoint_url=get_endpoint_url(), config=build_client_config())
+    backfill = TaskIndexBackfill(
+        client,
+        table_name=args.table,
+        checkpoint_path=args.checkpoint,
+        total_segments=args.segments,
+        max_workers=args.workers,
+        page_size=args.page_size,
+    )
+    checkpoint = backfill.run()
+
+    totals = checkpoint.totals()
+    print(f"scanned: {totals['scanned']}, updated: {totals['copied']}, skipped: {totals['skipped']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""コールドスタートのベンチマークスクリプト
+
+ルートごとに新しいPythonプロセスを起動し、`lambda_handler` モジュールの
+インポート時間と最初のリクエストの処理時間を計測する。
+`--ref` を指定すると、そのgitリビジョンのバックエンドでも同じ計測を行い比較する。
+
+使い方（task-management-app ディレクトリで実行）:
+    python backend/scripts/benchmark_cold_start.py --repeat 5 --ref HEAD~1
+"""
+import argparse
+import json
+import statistics
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+from benchmark_utils import APP_DIR, extract_revision, run_snippet
+
+# 計測対象のルート（認証ヘッダーなしのため、ネットワークアクセスは発生しない）
+ROUTES = {
+    'OPTIONS /tasks': {'httpMethod': 'OPTIONS', 'resource': '/tasks', 'headers': {}},
+    'GET /unknown (404)': {'httpMethod': 'GET', 'resource': '/unknown', 'headers': {}},
+    'GET /tasks (401)': {'httpMethod': 'GET', 'resource': '/tasks', 'headers': {}},
+}
+
+MEASURE_SNIPPET = """
+import io, json, sys, time
+from contextlib import redirect_stdout
+event = json.loads(sys.argv[1])
+start = time.perf_counter()
+with redirect_stdout(io.StringIO()):
+    from backend.interfaces.handlers import lambda_handler
+    imported = time.perf_counter()
+    response = lambda_handler.handler(event, None)
+    handled = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'first_request_ms': (handled - imported) * 1000,
+    'status_code': response['statusCode'],
+}))
+"""
+
+
+def measure(app_dir: Path, event: Dict, repeat: int) -> Dict[str, float]:
+    """新しいプロセスでインポートと最初のリクエストを計測する"""
+    samples: List[Dict] = [
+        run_snippet(app_dir, MEASURE_SNIPPET, [json.dumps(event)]) for _ in range(repeat)
+    ]
+
+    return {
+        'import_ms': statistics.median(s['import_ms'] for s in samples),
+        'first_request_ms': statistics.median(s['first_request_ms'] for s in samples),
+        'status_code': samples[0]['status_code'],
+    }
+
+
+def run(label: str, app_dir: Path, repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    print(f"\n[{label}]")
+    print(f"{'route':<22}{'status':>8}{'import (ms)':>14}{'first req (ms)':>17}")
+    for name, event in ROUTES.items():
+        result = measure(app_dir, event, repeat)
+        results[name] = result
+        print(
+            f"{name:<22}{result['status_code']:>8}"
+            f"{result['import_ms']:>14.1f}{result['first_request_ms']:>17.1f}"
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='lambda_handlerのコールドスタート計測')
+    parser.add_argument('--repeat', type=int, default=5, help='ルートごとの計測回数（中央値を表示）')
+    parser.add_argument('--ref', help='比較対象のgitリビジョン（例: HEAD~1）')
+    args = parser.parse_args()
+
+    current = run('working tree', APP_DIR, args.repeat)
+
+    if args.ref:
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = run(args.ref, extract_revision(args.ref, Path(tmp)), args.repeat)
+
+        print('\n[diff: working tree - ref]')
+        for name in ROUTES:
+            total_now = current[name]['import_ms'] + current[name]['first_request_ms']
+            total_ref = baseline[name]['import_ms'] + baseline[name]['first_request_ms']
+            print(f"{name:<22}{total_now - total_ref:>+14.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
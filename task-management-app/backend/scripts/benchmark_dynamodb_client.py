@@ -0,0 +1,141 @@
+"""DynamoDBのアクセス方法ごとの1回の呼び出しあたりのレイテンシーのベンチマーク
+
+`DYNAMODB_CLIENT_MODE` の `resource`（boto3のリソースAPI）と `client`（低レベルのクライアントと
+型ごとの変換）で `DynamoDBTaskRepository` の主要な操作を計測する。
+
+既定では通信の直前で固定のレスポンスを返し、リクエストの構築・署名・レスポンスの解析・
+型変換を含むクライアント側の処理時間だけを計測する。`--endpoint-url` を指定すると、
+DynamoDB Localなどに対して通信を含めて計測する（テーブルがなければ作成する）。
+
+使い方（task-management-app ディレクトリで実行）:
+    python backend/scripts/benchmark_dynamodb_client.py --calls 2000 --rows 100
+    python backend/scripts/benchmark_dynamodb_client.py --endpoint-url http://localhost:8000
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from benchmark_utils import APP_DIR, create_task_summary_table, create_task_table
+
+sys.path.insert(0, str(APP_DIR))
+
+from backend.domain.entities.task import Task  # noqa: E402
+from backend.infrastructure.persistence.dynamodb_task_repository import DynamoDBTaskRepository  # noqa: E402
+
+USER_ID = 'benchmark-user'
+MODES = ('resource', 'client')
+
+
+def _task_item(index: int) -> Dict[str, Any]:
+    return {
+        'task_id': {'S': f'task-{index:08d}'},
+        'title': {'S': f'タスク{index}'},
+        'description': {'S': 'ベンチマーク用のタスク'},
+        'status': {'S': '未着手'},
+        'due_date': {'S': '2024-12-31T00:00:00'},
+        'user_id': {'S': USER_ID},
+        'created_at': {'S': '2024-01-01T09:00:00.123456'},
+        'updated_at': {'S': '2024-01-02T10:30:00.654321'},
+    }
+
+
+class _RawResponse(io.BytesIO):
+    def stream(self, **kwargs: Any) -> Iterator[bytes]:
+        contents = self.read()
+        while contents:
+            yield contents
+            contents = self.read()
+
+
+def install_canned_responses(client: Any, rows: int) -> None:
+    """通信の直前で操作ごとの固定のレスポンスを返すようにする"""
+    from botocore.awsrequest import AWSResponse
+
+    bodies = {
+        'GetItem': json.dumps({'Item': _task_item(0)}).encode('utf-8'),
+        'Query': json.dumps({'Items': [_task_item(i) for i in range(rows)], 'Count': rows}).encode('utf-8'),
+        'PutItem': b'{}',
+    }
+
+    def respond(request: Any, **kwargs: Any) -> AWSResponse:
+        operation = request.headers['X-Amz-Target'].decode('ascii').split('.')[-1]
+        return AWSResponse(
+            request.url, 200, {'Content-Type': 'application/x-amz-json-1.0'},
+            _RawResponse(bodies[operation])
+        )
+
+    client.meta.events.register('before-send.dynamodb', respond)
+
+
+def prepare_table(repository: DynamoDBTaskRepository, rows: int) -> None:
+    """DynamoDB Local用にテーブルと計測用の項目を用意する"""
+    create_task_table(repository._dynamodb.meta.client, repository._table_name, repository._key_layout)
+    create_task_summary_table(repository._dynamodb.meta.client, repository._summary_table_name)
+    repository.save_many([
+        Task(task_id=f'task-{i:08d}', title=f'タスク{i}', user_id=USER_ID) for i in range(rows)
+    ])
+
+
+def per_call_us(func: Callable[[], Any], calls: int) -> Dict[str, float]:
+    """1回の呼び出しごとの所要時間（マイクロ秒）の中央値とp99"""
+    func()  # 初回の接続やモデルの読み込みを除く
+    samples: List[float] = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return {'p50': statistics.median(samples), 'p99': samples[int(len(samples) * 0.99) - 1]}
+
+
+def measure(mode: str, calls: int, rows: int, endpoint_url: Optional[str]) -> Dict[str, Dict[str, float]]:
+    os.environ['DYNAMODB_CLIENT_MODE'] = mode
+    repository = DynamoDBTaskRepository()
+    if endpoint_url:
+        prepare_table(repository, rows)
+    else:
+        install_canned_responses(repository._dynamodb.meta.client, rows)
+
+    task = Task(task_id='task-00000000', title='タスク0', user_id=USER_ID)
+    return {
+        'get_item': per_call_us(lambda: repository.find_by_id('task-00000000', USER_ID), calls),
+        f'query ({rows} rows)': per_call_us(
+            lambda: repository.find_item_page_by_user_id(USER_ID, rows), max(1, calls // 10)
+        ),
+        'put_item': per_call_us(lambda: repository.save(task), calls),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='DynamoDBのアクセス方法ごとのレイテンシーのベンチマーク')
+    parser.add_argument('--calls', type=int, default=2000, help='操作ごとの呼び出し回数')
+    parser.add_argument('--rows', type=int, default=100, help='クエリで返す項目数')
+    parser.add_argument('--endpoint-url', help='DynamoDB Localなどのエンドポイント（省略時は通信なし）')
+    args = parser.parse_args()
+
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'benchmark')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'benchmark')
+    if args.endpoint_url:
+        os.environ['DYNAMODB_ENDPOINT_URL'] = args.endpoint_url
+        os.environ.setdefault('TASK_TABLE_NAME', 'TasksBenchmark')
+
+    results = {mode: measure(mode, args.calls, args.rows, args.endpoint_url) for mode in MODES}
+
+    print(f"{'operation':<20}" + ''.join(f'{mode + " p50/p99 (us)":>28}' for mode in MODES) + f"{'speedup':>10}")
+    for operation in results['resource']:
+        cells = ''.join(
+            f"{results[mode][operation]['p50']:>18.1f}/{results[mode][operation]['p99']:<9.1f}"
+            for mode in MODES
+        )
+        speedup = results['resource'][operation]['p50'] / results['client'][operation]['p50']
+        print(f'{operation:<20}{cells}{speedup:>9.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,386 @@
+"""`lambda_handler.handler` をプロセス内で呼び出す負荷試験・ベンチマーク
+
+API Gatewayのイベントを生成してルートごとにハンドラーを繰り返し呼び出し、
+レイテンシー（p50/p95/p99）・スループット・1リクエストあたりのメモリ割り当て・
+コールドスタート（モジュールのインポートと依存関係の構築を含む最初のリクエスト）を計測する。
+
+DynamoDBは既定でmoto（開発用の依存関係）を使用し、`--endpoint-url` を指定するとDynamoDB Localに接続する。
+認証はローカルで生成したRSA鍵でトークンを署名し、JWKSをローカルのHTTPサーバーから配信する。
+
+`--save-baseline` で結果をJSONに保存し、`--baseline` で保存した結果と比較する
+（`--max-regression` を超えてp95が悪化したルートがあれば終了コード1で終了する）。
+
+使い方（task-management-app ディレクトリで実行）:
+    python backend/scripts/benchmark_handler.py --requests 500 --save-baseline baseline.json
+    python backend/scripts/benchmark_handler.py --requests 500 --baseline baseline.json --max-regression 20
+    python backend/scripts/benchmark_handler.py --endpoint-url http://localhost:8000
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from benchmark_utils import APP_DIR, create_task_summary_table, create_task_table
+
+sys.path.insert(0, str(APP_DIR))
+
+CLIENT_ID = 'benchmark-client'
+USER_ID = 'benchmark-user'
+TABLE_NAME = 'TasksBenchmark'
+SUMMARY_TABLE_NAME = 'TaskSummariesBenchmark'
+KEY_ID = 'benchmark-key'
+
+Event = Dict[str, Any]
+
+
+class LocalJwksSigner:
+    """ローカルのRSA鍵でCognito互換のIDトークンを発行し、JWKSをHTTPで配信する"""
+
+    def __init__(self, client_id: str):
+        self._client_id = client_id
+        self._private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = RSAAlgorithm.to_jwk(self._private_key.public_key(), as_dict=True)
+        jwk['kid'] = KEY_ID
+        body = json.dumps({'keys': [jwk]}).encode('utf-8')
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @property
+    def jwks_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/.well-known/jwks.json'
+
+    def token(self, sub: str) -> str:
+        payload = {'sub': sub, 'aud': self._client_id, 'token_use': 'id', 'exp': int(time.time()) + 3600}
+        return jwt.encode(payload, self._private_key, algorithm='RS256', headers={'kid': KEY_ID})
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def api_event(
+    method: str,
+    resource: str,
+    token: str,
+    path_parameters: Optional[Dict[str, str]] = None,
+    query: Optional[Dict[str, str]] = None,
+    body: Optional[Any] = None,
+) -> Event:
+    """API Gateway（RESTのプロキシ統合）のイベントを作成する"""
+    path = resource
+    for name, value in (path_parameters or {}).items():
+        path = path.replace('{' + name + '}', value)
+    return {
+        'resource': resource,
+        'path': path,
+        'httpMethod': method,
+        'headers': {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'},
+        'queryStringParameters': query,
+        'pathParameters': path_parameters,
+        'requestContext': {'requestId': str(uuid.uuid4()), 'stage': 'benchmark'},
+        'body': json.dumps(body, ensure_ascii=False) if body is not None else None,
+    }
+
+
+@dataclass
+class Scenario:
+    """1つのルートの計測内容"""
+    name: str
+    expected_status: int
+    # 呼び出しの番号からイベントを作成する
+    build_event: Callable[[int], Event]
+    # 呼び出しごとに使い捨てのタスクが必要か（削除など）
+    consumes_tasks: bool = False
+
+
+class Fixture:
+    """計測用のタスクを用意し、ルートごとのシナリオを作成する"""
+
+    def __init__(self, token: str, rows: int):
+        from backend.domain.entities.task import Task
+        from backend.infrastructure.persistence.dynamodb_task_repository import DynamoDBTaskRepository
+
+        self._task_class = Task
+        self._repository = DynamoDBTaskRepository()
+        self._token = token
+        self.task_ids = [task.task_id for task in self.create_tasks(rows)]
+        self._disposable_ids: List[str] = []
+
+    def create_tasks(self, count: int) -> List[Any]:
+        tasks = [
+            self._task_class(title=f'ベンチマーク{i}', description='計測用のタスク', user_id=USER_ID)
+            for i in range(count)
+        ]
+        return self._repository.save_many(tasks)
+
+    def prepare_disposable(self, count: int) -> None:
+        self._disposable_ids = [task.task_id for task in self.create_tasks(count)]
+
+    def _task_id(self, index: int) -> str:
+        return self.task_ids[index % len(self.task_ids)]
+
+    def scenarios(self) -> List[Scenario]:
+        token = self._token
+        return [
+            Scenario('GET /tasks', 200, lambda i: api_event('GET', '/tasks', token, query={'limit': '50'})),
+            Scenario(
+                'GET /tasks?status', 200,
+                lambda i: api_event('GET', '/tasks', token, query={'status': '未着手', 'limit': '50'})
+            ),
+            Scenario(
+                'GET /tasks/{taskId}', 200,
+                lambda i: api_event('GET', '/tasks/{taskId}', token, {'taskId': self._task_id(i)})
+            ),
+            Scenario(
+                'POST /tasks', 201,
+                lambda i: api_event('POST', '/tasks', token, body={'title': f'新しいタスク{i}'})
+            ),
+            Scenario(
+                'PATCH /tasks/{taskId}', 200,
+                lambda i: api_event(
+                    'PATCH', '/tasks/{taskId}', token, {'taskId': self._task_id(i)},
+                    body={'description': f'更新{i}'}
+                )
+            ),
+            Scenario(
+                'POST /tasks/batch (get 25)', 200,
+                lambda i: api_event(
+                    'POST', '/tasks/batch', token,
+                    body={'operation': 'get', 'task_ids': [self._task_id(i + n) for n in range(25)]}
+                )
+            ),
+            Scenario(
+                'DELETE /tasks/{taskId}', 204,
+                lambda i: api_event('DELETE', '/tasks/{taskId}', token, {'taskId': self._disposable_ids[i]}),
+                consumes_tasks=True
+            ),
+        ]
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    index = min(len(samples) - 1, max(0, int(round(len(samples) * percent / 100)) - 1))
+    return samples[index]
+
+
+def measure_route(
+    handler: Callable[[Event, Any], Dict[str, Any]],
+    reset_container: Callable[[], None],
+    scenario: Scenario,
+    fixture: Fixture,
+    requests: int,
+    warmup: int,
+    alloc_samples: int,
+) -> Dict[str, float]:
+    """1つのルートのコールドスタート・レイテンシー・スループット・メモリ割り当てを計測する"""
+    total_calls = 1 + warmup + requests + alloc_samples
+    if scenario.consumes_tasks:
+        fixture.prepare_disposable(total_calls)
+    call_index = iter(range(total_calls))
+    errors = 0
+
+    def invoke() -> None:
+        nonlocal errors
+        event = scenario.build_event(next(call_index))
+        response = handler(event, None)
+        if response['statusCode'] != scenario.expected_status:
+            errors += 1
+
+    # コールドスタート（依存関係の構築とJWKSの取得を含む）
+    reset_container()
+    start = time.perf_counter()
+    invoke()
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    for _ in range(warmup):
+        invoke()
+
+    latencies: List[float] = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter()
+        invoke()
+        latencies.append((time.perf_counter() - start) * 1000)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    # メモリ割り当ては計測のオーバーヘッドが大きいため、レイテンシーとは別に計測する
+    tracemalloc.start()
+    allocated: List[int] = []
+    for _ in range(alloc_samples):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        invoke()
+        allocated.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    return {
+        'cold_ms': cold_ms,
+        'p50_ms': statistics.median(latencies),
+        'p95_ms': _percentile(latencies, 95),
+        'p99_ms': _percentile(latencies, 99),
+        'throughput_rps': requests / elapsed,
+        'alloc_peak_kib': statistics.mean(allocated) / 1024 if allocated else 0.0,
+        'errors': errors,
+    }
+
+
+@contextlib.contextmanager
+def dynamodb_backend(endpoint_url: Optional[str]) -> Iterator[None]:
+    """計測に使用するDynamoDB（DynamoDB Localまたはmoto）を用意する"""
+    import boto3
+
+    from backend.infrastructure.persistence.dynamodb_config import get_key_layout
+
+    if endpoint_url:
+        os.environ['DYNAMODB_ENDPOINT_URL'] = endpoint_url
+        client = boto3.client('dynamodb', endpoint_url=endpoint_url)
+        create_task_table(client, TABLE_NAME, get_key_layout())
+        create_task_summary_table(client, SUMMARY_TABLE_NAME)
+        yield
+        return
+
+    try:
+        from moto import mock_aws
+    except ImportError:
+        sys.exit('motoがインストールされていません（pip install -e ".[dev]"）。--endpoint-url でDynamoDB Localも使用できます')
+    with mock_aws():
+        client = boto3.client('dynamodb')
+        create_task_table(client, TABLE_NAME, get_key_layout())
+        create_task_summary_table(client, SUMMARY_TABLE_NAME)
+        yield
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    signer = LocalJwksSigner(CLIENT_ID)
+    os.environ.update({
+        'AWS_DEFAULT_REGION': os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'),
+        'AWS_ACCESS_KEY_ID': os.environ.get('AWS_ACCESS_KEY_ID', 'benchmark'),
+        'AWS_SECRET_ACCESS_KEY': os.environ.get('AWS_SECRET_ACCESS_KEY', 'benchmark'),
+        'TASK_TABLE_NAME': TABLE_NAME,
+        'TASK_SUMMARY_TABLE_NAME': SUMMARY_TABLE_NAME,
+        'COGNITO_CLIENT_ID': CLIENT_ID,
+        'COGNITO_JWKS_URL': signer.jwks_url,
+        'LOG_LEVEL': os.environ.get('LOG_LEVEL', 'WARNING'),
+    })
+    try:
+        with dynamodb_backend(args.endpoint_url):
+            start = time.perf_counter()
+            from backend.interfaces.handlers import lambda_handler
+            from backend.interfaces.handlers.container import Container
+            import_ms = (time.perf_counter() - start) * 1000
+
+            def reset_container() -> None:
+                lambda_handler.container = Container()
+
+            fixture = Fixture(signer.token(USER_ID), args.rows)
+            routes = {}
+            for scenario in fixture.scenarios():
+                routes[scenario.name] = measure_route(
+                    lambda_handler.handler, reset_container, scenario, fixture,
+                    args.requests, args.warmup, args.alloc_samples
+                )
+                print_route(scenario.name, routes[scenario.name])
+    finally:
+        signer.close()
+
+    return {
+        'import_ms': import_ms,
+        'backend': 'dynamodb-local' if args.endpoint_url else 'moto',
+        'requests': args.requests,
+        'rows': args.rows,
+        'routes': routes,
+    }
+
+
+def print_header() -> None:
+    print(
+        f"{'route':<28}{'cold ms':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'req/s':>9}{'alloc KiB':>11}{'errors':>8}"
+    )
+
+
+def print_route(name: str, result: Dict[str, float]) -> None:
+    print(
+        f"{name:<28}{result['cold_ms']:>9.1f}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+        f"{result['p99_ms']:>9.2f}{result['throughput_rps']:>9.0f}{result['alloc_peak_kib']:>11.1f}"
+        f"{result['errors']:>8}"
+    )
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], max_regression: Optional[float]) -> bool:
+    """保存した結果と比較し、p95の悪化が許容範囲内かを返す"""
+    print("\n[baseline比較（+は悪化、req/sは-が悪化）]")
+    print(f"{'route':<28}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>9}{'alloc':>9}")
+    within_limit = True
+    for name, result in current['routes'].items():
+        base = baseline['routes'].get(name)
+        if base is None:
+            print(f'{name:<28}{"(new)":>9}')
+            continue
+        changes = {
+            key: (result[key] - base[key]) / base[key] * 100 if base[key] else 0.0
+            for key in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps', 'alloc_peak_kib')
+        }
+        print(
+            f"{name:<28}{changes['p50_ms']:>+8.1f}%{changes['p95_ms']:>+8.1f}%{changes['p99_ms']:>+8.1f}%"
+            f"{changes['throughput_rps']:>+8.1f}%{changes['alloc_peak_kib']:>+8.1f}%"
+        )
+        if max_regression is not None and changes['p95_ms'] > max_regression:
+            within_limit = False
+    return within_limit
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='lambda_handler.handlerのルートごとの負荷試験')
+    parser.add_argument('--requests', type=int, default=300, help='ルートごとの計測回数')
+    parser.add_argument('--warmup', type=int, default=20, help='計測前のウォームアップ回数')
+    parser.add_argument('--alloc-samples', type=int, default=20, help='メモリ割り当ての計測回数')
+    parser.add_argument('--rows', type=int, default=100, help='事前に作成するタスク数')
+    parser.add_argument('--endpoint-url', help='DynamoDB Localのエンドポイント（省略時はmoto）')
+    parser.add_argument('--save-baseline', help='結果を保存するJSONファイル')
+    parser.add_argument('--baseline', help='比較するJSONファイル')
+    parser.add_argument('--max-regression', type=float, help='許容するp95の悪化率（%%）')
+    args = parser.parse_args()
+
+    print_header()
+    result = run(args)
+    print(f"\nmodule import: {result['import_ms']:.1f} ms (backend: {result['backend']})")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if not compare(result, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
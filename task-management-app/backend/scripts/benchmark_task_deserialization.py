@@ -0,0 +1,94 @@
+"""Taskエンティティの変換処理のマイクロベンチマーク
+
+DynamoDBの項目を模した辞書から `Task.from_dict` で復元する処理と `to_dict` を
+指定した行数で計測し、1行あたりのコストとインスタンスのメモリ使用量を表示する。
+`--ref` を指定すると、そのgitリビジョンの `Task` と比較する。
+
+使い方（task-management-app ディレクトリで実行）:
+    python backend/scripts/benchmark_task_deserialization.py --rows 10000 --ref HEAD~1
+"""
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict
+
+from benchmark_utils import APP_DIR, extract_revision, run_snippet
+
+
+MEASURE_SNIPPET = """
+import json, sys, time, tracemalloc
+from backend.domain.entities.task import Task
+
+rows, repeat = int(sys.argv[1]), int(sys.argv[2])
+statuses = ['未着手', '進行中', '完了']
+items = [
+    {
+        'task_id': f'task-{i:08d}',
+        'title': f'タスク{i}',
+        'description': 'ベンチマーク用のタスク' if i % 2 else None,
+        'status': statuses[i % 3],
+        'due_date': '2024-12-31T00:00:00' if i % 3 else None,
+        'user_id': 'benchmark-user',
+        'created_at': '2024-01-01T09:00:00.123456',
+        'updated_at': '2024-01-02T10:30:00.654321',
+    }
+    for i in range(rows)
+]
+
+def best_of(func):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+from_dict_s = best_of(lambda: [Task.from_dict(item) for item in items])
+tasks = [Task.from_dict(item) for item in items]
+to_dict_s = best_of(lambda: [task.to_dict() for task in tasks])
+
+tracemalloc.start()
+snapshot_tasks = [Task.from_dict(item) for item in items]
+current, _ = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+
+print(json.dumps({
+    'from_dict_us': from_dict_s / rows * 1e6,
+    'to_dict_us': to_dict_s / rows * 1e6,
+    'bytes_per_task': current / rows,
+}))
+"""
+
+
+def measure(app_dir: Path, rows: int, repeat: int) -> Dict[str, float]:
+    return run_snippet(app_dir, MEASURE_SNIPPET, [str(rows), str(repeat)])
+
+
+def print_result(label: str, result: Dict[str, float]) -> None:
+    print(
+        f"{label:<16}{result['from_dict_us']:>16.2f}{result['to_dict_us']:>14.2f}"
+        f"{result['bytes_per_task']:>16.0f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Taskの変換処理のマイクロベンチマーク')
+    parser.add_argument('--rows', type=int, default=10000, help='計測する行数')
+    parser.add_argument('--repeat', type=int, default=5, help='計測回数（最良値を表示）')
+    parser.add_argument('--ref', help='比較対象のgitリビジョン（例: HEAD~1）')
+    args = parser.parse_args()
+
+    print(f"rows={args.rows}")
+    print(f"{'tree':<16}{'from_dict (us)':>16}{'to_dict (us)':>14}{'bytes/task':>16}")
+    current = measure(APP_DIR, args.rows, args.repeat)
+    print_result('working tree', current)
+
+    if args.ref:
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = measure(extract_revision(args.ref, Path(tmp)), args.rows, args.repeat)
+        print_result(args.ref, baseline)
+        print(f"from_dict speedup: {baseline['from_dict_us'] / current['from_dict_us']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""ベンチマークスクリプトの共通処理"""
+import json
+import os
+import subprocess
+import sys
+import tarfile
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+APP_DIR = BACKEND_DIR.parent
+
+
+def extract_revision(ref: str, dest: Path) -> Path:
+    """指定したgitリビジョンのバックエンドを展開し、`backend` の親ディレクトリを返す"""
+    archive = subprocess.run(
+        ['git', 'archive', '--format=tar', ref, '.'],
+        cwd=BACKEND_DIR, capture_output=True, check=True
+    ).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(dest / 'backend', filter='data')
+    return dest
+
+
+def run_snippet(app_dir: Path, snippet: str, args: List[str]) -> Dict[str, Any]:
+    """新しいプロセスで計測コードを実行し、最後の行のJSONを返す"""
+    env = dict(os.environ)
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    env['PYTHONPATH'] = str(app_dir)
+    result = subprocess.run(
+        [sys.executable, '-c', snippet, *args],
+        cwd=app_dir, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _include_projection(*attributes: str) -> Dict[str, Any]:
+    return {'ProjectionType': 'INCLUDE', 'NonKeyAttributes': list(attributes)}
+
+
+def create_task_table(client: Any, table_name: str, key_layout: str = 'task') -> None:
+    """テンプレート（infrastructure/template.yaml）と同じキーとGSIのタスクテーブルを作成する
+
+    `key_layout` が `user` の場合はUserTaskTable（user_id + task_id、UserIdIndexなし）と同じ構成にする。
+    """
+    if table_name in client.list_tables()['TableNames']:
+        return
+    indexes: List[Dict[str, Any]] = []
+    if key_layout == 'user':
+        key_schema = [
+            {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+            {'AttributeName': 'task_id', 'KeyType': 'RANGE'},
+        ]
+    else:
+        key_schema = [
+            {'AttributeName': 'task_id', 'KeyType': 'HASH'},
+            {'AttributeName': 'user_id', 'KeyType': 'RANGE'},
+        ]
+        indexes.append({
+            'IndexName': 'UserIdIndex',
+            'KeySchema': [{'AttributeName': 'user_id', 'KeyType': 'HASH'}],
+            'Projection': {'ProjectionType': 'ALL'},
+        })
+    client.create_table(
+        TableName=table_name,
+        AttributeDefinitions=[
+            {'AttributeName': name, 'AttributeType': 'S'}
+            for name in ('task_id', 'user_id', 'updated_at', 'user_status', 'due_sort')
+        ],
+        KeySchema=key_schema,
+        GlobalSecondaryIndexes=[
+            *indexes,
+            {
+                'IndexName': 'UserIdUpdatedAtIndex',
+                'KeySchema': [
+                    {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+                    {'AttributeName': 'updated_at', 'KeyType': 'RANGE'},
+                ],
+                'Projection': _include_projection(
+                    'title', 'description', 'status', 'due_date', 'created_at', 'deleted', 'version'
+                ),
+            },
+            {
+                'IndexName': 'UserStatusIndex',
+                'KeySchema': [
+                    {'AttributeName': 'user_status', 'KeyType': 'HASH'},
+                    {'AttributeName': 'due_sort', 'KeyType': 'RANGE'},
+                ],
+                'Projection': _include_projection(
+                    'title', 'description', 'status', 'due_date', 'created_at', 'updated_at', 'version'
+                ),
+            },
+            {
+                'IndexName': 'UserDueDateIndex',
+                'KeySchema': [
+                    {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+                    {'AttributeName': 'due_sort', 'KeyType': 'RANGE'},
+                ],
+                'Projection': _include_projection(
+                    'title', 'description', 'status', 'due_date', 'created_at', 'updated_at', 'version'
+                ),
+            },
+        ],
+        BillingMode='PAY_PER_REQUEST',
+    )
+    client.get_waiter('table_exists').wait(TableName=table_name)
+
+
+def create_task_summary_table(client: Any, table_name: str) -> None:
+    """テンプレートのTaskSummaryTableと同じ構成の集計テーブル（user_id）を作成する"""
+    if table_name in client.list_tables()['TableNames']:
+        return
+    client.create_table(
+        TableName=table_name,
+        AttributeDefinitions=[{'AttributeName': 'user_id', 'AttributeType': 'S'}],
+        KeySchema=[{'AttributeName': 'user_id', 'KeyType': 'HASH'}],
+        BillingMode='PAY_PER_REQUEST',
+    )
+    client.get_waiter('table_exists').wait(TableName=table_name)
@@ -0,0 +1,65 @@
+"""全ユーザーのタスクをファイルにエクスポートする
+
+並列のScanでタスクテーブルを読み込み、`--output` のディレクトリにセグメントごとに分割したファイル
+（NDJSON、または `--format parquet` の場合はParquet）を書き出す。Parquetの場合はpyarrowが必要
+（`pip install .[parquet]`）。
+進捗は出力先の `_checkpoints` に保存する（中断した場合は同じ引数に `--resume` を加えて再実行すると続きから再開する）。
+チェックポイントのある出力先には `--resume` を指定しない限り書き出さず、完了した（`_manifest.json` のある）出力先には書き出さない。
+完了すると、出力先の `_manifest.json` にファイルの一覧と件数を書き出す。
+
+使い方（task-management-app ディレクトリで実行）:
+    python backend/scripts/export_tasks.py --table Tasks-dev --output export-dev \\
+        --format parquet --segments 8 --executor process
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(APP_DIR))
+
+from backend.infrastructure.persistence.task_export import (  # noqa: E402
+    DEFAULT_ROWS_PER_FILE, EXECUTOR_PROCESS, EXECUTOR_THREAD, FORMAT_NDJSON, FORMAT_PARQUET,
+    ExportOptions, TaskExport
+)
+from backend.shared import structured_logging  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='全ユーザーのタスクをファイルにエクスポートする')
+    parser.add_argument('--output', required=True, help='出力先のディレクトリ')
+    parser.add_argument('--format', choices=(FORMAT_NDJSON, FORMAT_PARQUET), default=FORMAT_NDJSON)
+    parser.add_argument('--table', help='タスクテーブル名（既定は環境変数 TASK_TABLE_NAME）')
+    parser.add_argument('--segments', type=int, default=8, help='並列のScanのセグメント数')
+    parser.add_argument('--workers', type=int, help='同時に処理するセグメント数（既定はセグメント数）')
+    parser.add_argument(
+        '--executor', choices=(EXECUTOR_THREAD, EXECUTOR_PROCESS), default=EXECUTOR_THREAD,
+        help='セグメントを処理するプールの種類'
+    )
+    parser.add_argument('--rows-per-file', type=int, default=DEFAULT_ROWS_PER_FILE, help='1ファイルあたりの行数の目安')
+    parser.add_argument('--page-size', type=int, help='Scanの1ページあたりの項目数')
+    parser.add_argument('--resume', action='store_true', help='出力先のチェックポイントから中断したエクスポートを再開する')
+    parser.add_argument('--endpoint-url', help='DynamoDB Localなどのエンドポイント')
+    args = parser.parse_args()
+
+    # プロセスプールのワーカーにも引き継がれるように、環境変数で指定する
+    if args.endpoint_url:
+        os.environ['DYNAMODB_ENDPOINT_URL'] = args.endpoint_url
+    if args.table:
+        os.environ['TASK_TABLE_NAME'] = args.table
+    structured_logging.configure(level='INFO', sample_rate=0, stream=sys.stderr, buffer_capacity=1)
+
+    options = ExportOptions(
+        output_dir=args.output,
+        output_format=args.format,
+        total_segments=args.segments,
+        rows_per_file=args.rows_per_file,
+        page_size=args.page_size,
+    )
+    manifest = TaskExport(options, executor=args.executor, max_workers=args.workers, resume=args.resume).run()
+    print(f"rows: {manifest['rows']}, files: {len(manifest['files'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""CSV・NDJSONのファイルからタスクを一括でインポートする
+
+1行1タスク（CSVは1行目を列名とする）で、列は title（必須）・description・status・due_date・user_id。
+user_id の列がない行は `--user-id` のユーザーのタスクとして作成する。
+検証に失敗した行と書き込めなかった行は、`--failures` のファイルに行番号と理由を書き出す（NDJSON）。
+
+使い方（task-management-app ディレクトリで実行）:
+    python backend/scripts/import_tasks.py tasks.csv --table Tasks-dev --user-id <ユーザーID> \\
+        --workers 4 --failures failures.ndjson
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(APP_DIR))
+
+from backend.infrastructure.persistence.task_import import (  # noqa: E402
+    DEFAULT_MAX_WORKERS, FORMAT_CSV, FORMAT_NDJSON, TaskImporter, read_rows
+)
+from backend.shared import structured_logging  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='CSV・NDJSONのファイルからタスクを一括でインポートする')
+    parser.add_argument('input', help='インポートするファイル')
+    parser.add_argument(
+        '--format', choices=(FORMAT_CSV, FORMAT_NDJSON),
+        help='ファイルの形式（既定は拡張子から判定し、.csv以外はNDJSON）'
+    )
+    parser.add_argument('--table', help='タスクテーブル名（既定は環境変数 TASK_TABLE_NAME）')
+    parser.add_argument('--summary-table', help='集計テーブル名（既定は環境変数 TASK_SUMMARY_TABLE_NAME）')
+    parser.add_argument('--user-id', help='user_id の列がない行のユーザーID')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS, help='同時に書き込むチャンク数の上限')
+    parser.add_argument('--failures', help='失敗した行を書き出すファイル（NDJSON）')
+    parser.add_argument('--endpoint-url', help='DynamoDB Localなどのエンドポイント')
+    args = parser.parse_args()
+
+    if args.endpoint_url:
+        os.environ['DYNAMODB_ENDPOINT_URL'] = args.endpoint_url
+    if args.table:
+        os.environ['TASK_TABLE_NAME'] = args.table
+    if args.summary_table:
+        os.environ['TASK_SUMMARY_TABLE_NAME'] = args.summary_table
+    structured_logging.configure(level='INFO', sample_rate=0, stream=sys.stderr, buffer_capacity=1)
+    input_format = args.format or (FORMAT_CSV if args.input.lower().endswith('.csv') else FORMAT_NDJSON)
+
+    failures = open(args.failures, 'w', encoding='utf-8') if args.failures else None
+    try:
+        with open(args.input, encoding='utf-8', newline='') as stream:
+            importer = TaskImporter(max_workers=args.workers, default_user_id=args.user_id, failures=failures)
+            report = importer.run(read_rows(stream, input_format))
+    finally:
+        if failures is not None:
+            failures.close()
+
+    print(
+        f'rows: {report.rows}, imported: {report.imported}, failed: {report.failed}, '
+        f'throttled: {report.throttled}, rows/sec: {report.rows_per_second:.1f}'
+    )
+    if report.failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
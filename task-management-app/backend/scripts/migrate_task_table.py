@@ -0,0 +1,84 @@
+"""タスクテーブルの項目を、キーの構成が異なるテーブルにコピーする
+
+task構成（task_id + user_id）のテーブルからuser構成（user_id + task_id）のテーブルへの移行（またはその逆）に使用する。
+並列のScanでコピーし、進捗を `--checkpoint` のファイルに保存する（中断した場合は同じ引数で再実行すると続きから再開する）。
+コピーの後、移行先のデータからユーザーごとの集計（集計テーブル）を作り直す。
+
+手順:
+    1. 移行先のテーブルを作成する（infrastructure/template.yaml の UserTaskTable）
+    2. このスクリプトでコピーする
+    3. `TaskTableKeyLayout=user` でデプロイし、アプリケーションの読み書きを移行先に切り替える
+    4. 切り替えまでの書き込みを反映するため、新しいチェックポイントのファイルで再実行する
+       （移行先に同じか新しい項目がある場合は上書きしない）
+
+使い方（task-management-app ディレクトリで実行）:
+    python backend/scripts/migrate_task_table.py --source Tasks-dev --target UserTasks-dev \\
+        --target-layout user --summary-table TaskSummaries-dev --segments 8 --checkpoint migration-dev.json
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(APP_DIR))
+
+from backend.infrastructure.persistence.dynamodb_config import (  # noqa: E402
+    KEY_LAYOUT_TASK, KEY_LAYOUT_USER, build_client_config, get_endpoint_url
+)
+from backend.infrastructure.persistence.task_table_migration import TaskTableMigration  # noqa: E402
+from backend.shared import structured_logging  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='タスクテーブルの項目を別のテーブルにコピーする')
+    parser.add_argument('--source', required=True, help='移行元のテーブル名')
+    parser.add_argument('--target', required=True, help='移行先のテーブル名')
+    parser.add_argument(
+        '--target-layout', choices=(KEY_LAYOUT_TASK, KEY_LAYOUT_USER), default=KEY_LAYOUT_USER,
+        help='移行先のテーブルのキーの構成（集計の作り直しに使用する）'
+    )
+    parser.add_argument('--segments', type=int, default=8, help='並列のScanのセグメント数')
+    parser.add_argument('--workers', type=int, help='同時に処理するセグメント数（既定はセグメント数）')
+    parser.add_argument('--page-size', type=int, help='Scanの1ページあたりの項目数')
+    parser.add_argument('--checkpoint', required=True, help='進捗を保存するJSONファイル')
+    parser.add_argument('--skip-summaries', action='store_true', help='集計を作り直さない')
+    parser.add_argument('--summary-table', help='集計テーブル名（既定は環境変数 TASK_SUMMARY_TABLE_NAME）')
+    parser.add_argument('--endpoint-url', help='DynamoDB Localなどのエンドポイント')
+    args = parser.parse_args()
+
+    if args.endpoint_url:
+        os.environ['DYNAMODB_ENDPOINT_URL'] = args.endpoint_url
+    # 集計の作り直しでは、移行先のテーブルとキーの構成のリポジトリを使用する
+    os.environ['TASK_TABLE_NAME'] = args.target
+    os.environ['TASK_TABLE_KEY_LAYOUT'] = args.target_layout
+    if args.summary_table:
+        os.environ['TASK_SUMMARY_TABLE_NAME'] = args.summary_table
+    structured_logging.configure(level='INFO', sample_rate=0, stream=sys.stderr, buffer_capacity=1)
+
+    import boto3
+
+    from backend.infrastructure.persistence.dynamodb_task_repository import DynamoDBTaskRepository
+
+    client = boto3.client('dynamodb', endpoint_url=get_endpoint_url(), config=build_client_config())
+    migration = TaskTableMigration(
+        client,
+        source_table=args.source,
+        target_table=args.target,
+        checkpoint_path=args.checkpoint,
+        total_segments=args.segments,
+        max_workers=args.workers,
+        page_size=args.page_size,
+        summary_rebuilder=None if args.skip_summaries else DynamoDBTaskRepository().rebuild_summary,
+    )
+    checkpoint = migration.run()
+
+    totals = checkpoint.totals()
+    print(
+        f"scanned: {totals['scanned']}, copied: {totals['copied']}, skipped: {totals['skipped']}, "
+        f"users: {len(checkpoint.user_ids)}"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""ユーザーごとのステータス別のタスク数（集計テーブル）を、タスクのテーブルから作り直す
+
+集計テーブルの導入前に作成されたタスクは集計に含まれず、削除・ステータス変更で件数が負になる場合がある。
+`--user-id` を指定した場合はそのユーザーのみ、省略した場合は並列のScanでタスクを持つすべてのユーザーを集めて作り直す
+（進捗は `--checkpoint` のファイルに保存し、中断した場合は同じ引数で再実行すると続きから再開する）。
+件数はユーザーの一覧と同じクエリで数えるため、GSIのキー属性を持たないタスクも含む。
+並行するタスクの書き込みの加減算は上書きしない（集計の改訂番号が変わった場合は数え直す）。
+
+使い方（task-management-app ディレクトリで実行）:
+    python backend/scripts/rebuild_task_summaries.py --table Tasks-dev --summary-table TaskSummaries-dev \\
+        --segments 8 --checkpoint summaries-dev.json
+    python backend/scripts/rebuild_task_summaries.py --table Tasks-dev --summary-table TaskSummaries-dev \\
+        --user-id USER_ID
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(APP_DIR))
+
+from backend.infrastructure.persistence.dynamodb_config import build_client_config, get_endpoint_url  # noqa: E402
+from backend.infrastructure.persistence.task_table_migration import TaskSummaryRebuild  # noqa: E402
+from backend.shared import structured_logging  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='ユーザーごとのタスク数の集計を作り直す')
+    parser.add_argument('--table', required=True, help='タスクテーブル名')
+    parser.add_argument('--summary-table', help='集計テーブル名（既定は環境変数 TASK_SUMMARY_TABLE_NAME）')
+    parser.add_argument('--user-id', action='append', help='作り直すユーザー（複数指定可。省略時はすべてのユーザー）')
+    parser.add_argument('--segments', type=int, default=8, help='並列のScanのセグメント数')
+    parser.add_argument('--workers', type=int, help='同時に処理するセグメント数（既定はセグメント数）')
+    parser.add_argument('--page-size', type=int, help='Scanの1ページあたりの項目数')
+    parser.add_argument('--checkpoint', help='進捗を保存するJSONファイル（--user-id を省略する場合は必須）')
+    parser.add_argument('--endpoint-url', help='DynamoDB Localなどのエンドポイント')
+    args = parser.parse_args()
+    if not args.user_id and not args.checkpoint:
+        parser.error('--checkpoint is required unless --user-id is given')
+
+    if args.endpoint_url:
+        os.environ['DYNAMODB_ENDPOINT_URL'] = args.endpoint_url
+    os.environ['TASK_TABLE_NAME'] = args.table
+    if args.summary_table:
+        os.environ['TASK_SUMMARY_TABLE_NAME'] = args.summary_table
+    structured_logging.configure(level='INFO', sample_rate=0, stream=sys.stderr, buffer_capacity=1)
+
+    import boto3
+
+    from backend.infrastructure.persistence.dynamodb_task_repository import DynamoDBTaskRepository
+
+    repository = DynamoDBTaskRepository()
+    if args.user_id:
+        for user_id in args.user_id:
+            summary = repository.rebuild_summary(user_id)
+            print(f'{user_id}: {summary.total}')
+        return
+
+    client = boto3.client('dynamodb', endpoint_url=get_endpoint_url(), config=build_client_config())
+    rebuild = TaskSummaryRebuild(
+        client,
+        table_name=args.table,
+        checkpoint_path=args.checkpoint,
+        summary_rebuilder=repository.rebuild_summary,
+        total_segments=args.segments,
+        max_workers=args.workers,
+        page_size=args.page_size,
+    )
+    checkpoint = rebuild.run()
+    print(f"scanned: {checkpoint.totals()['scanned']}, users: {len(checkpoint.user_ids)}")
+
+
+if __name__ == '__main__':
+    main()
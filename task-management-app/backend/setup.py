@@ -12,6 +12,15 @@ setup(
         "cryptography>=42.0.0",
     ],
     extras_require={
+        "fast": [
+            "orjson>=3.9.0",
+        ],
+        "redis": [
+            "redis>=5.0.0",
+        ],
+        "parquet": [
+            "pyarrow>=14.0.0",
+        ],
         "dev": [
             "pytest>=7.4.0",
             "pytest-cov>=4.1.0",
@@ -0,0 +1,165 @@
+"""構造化ログ（1行1レコードのJSON）
+
+- ログレベルは `LOG_LEVEL`（既定はINFO）で指定する
+- `LOG_SAMPLE_RATE`（0〜1、既定は0）の割合のリクエストでは、DEBUGのログも出力する
+- レコードの値に `Lazy` を渡すと、レコードが出力される場合にのみ値を計算する
+- レコードはバッファーに溜め、リクエストの終了時（またはERROR以上のログ）にまとめて書き出す
+
+標準ライブラリの `logging` の上に構築し、各層から `get_logger` で取得したロガーを使用する。
+"""
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import random
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, Optional, TextIO
+
+LOGGER_NAME = 'task_management'
+DEFAULT_LOG_LEVEL = 'INFO'
+DEFAULT_SAMPLE_RATE = 0.0
+# バッファーに溜めるレコード数の上限（超えた時点で書き出す）
+DEFAULT_BUFFER_CAPACITY = 100
+
+# 値を出力しないリクエストヘッダー（小文字）
+REDACTED_HEADERS = frozenset({'authorization', 'cookie', 'x-api-key', 'x-amz-security-token'})
+REDACTED_VALUE = '[REDACTED]'
+
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('log_request_id', default=None)
+_sampled: contextvars.ContextVar[bool] = contextvars.ContextVar('log_sampled', default=False)
+_sample_rate = DEFAULT_SAMPLE_RATE
+
+
+class Lazy:
+    """出力時にのみ計算される値"""
+
+    __slots__ = ('_func', '_args')
+
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self._func = func
+        self._args = args
+
+    def resolve(self) -> Any:
+        return self._func(*self._args)
+
+
+def redact_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """API Gatewayのイベントから認証情報のヘッダーの値を除いたコピーを作成する"""
+    redacted = dict(event)
+    for key in ('headers', 'multiValueHeaders'):
+        headers = event.get(key)
+        if headers:
+            redacted[key] = {
+                name: REDACTED_VALUE if name.lower() in REDACTED_HEADERS else value
+                for name, value in headers.items()
+            }
+    return redacted
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Lazy):
+        return value.resolve()
+    return str(value)
+
+
+class JsonFormatter(logging.Formatter):
+    """レコードを1行のJSONに変換する
+
+    `extra={'fields': {...}}` で渡した値はトップレベルの項目として出力する。
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        document: Dict[str, Any] = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        request_id = getattr(record, 'request_id', None)
+        if request_id:
+            document['request_id'] = request_id
+        document.update(getattr(record, 'fields', None) or {})
+        if record.exc_info:
+            document['exception'] = self.formatException(record.exc_info)
+        return json.dumps(document, ensure_ascii=False, default=_json_default)
+
+
+class _RequestFilter(logging.Filter):
+    """ログレベル未満のレコードを、サンプリング対象のリクエストでのみ通す"""
+
+    def __init__(self, level: int):
+        super().__init__()
+        self.level = level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.level and not _sampled.get():
+            return False
+        # バックグラウンドスレッドでは出力時にリクエストIDを参照できないため、記録時に付与する
+        record.request_id = _request_id.get()
+        return True
+
+
+def configure(
+    level: Optional[str] = None,
+    sample_rate: Optional[float] = None,
+    stream: Optional[TextIO] = None,
+    buffer_capacity: int = DEFAULT_BUFFER_CAPACITY,
+) -> logging.Logger:
+    """アプリケーションのロガーを設定する（省略した値は環境変数から取得する）"""
+    global _sample_rate
+    log_level = logging.getLevelName((level or os.environ.get('LOG_LEVEL') or DEFAULT_LOG_LEVEL).upper())
+    if not isinstance(log_level, int):
+        raise ValueError(f'Unsupported LOG_LEVEL: {level}')
+    _sample_rate = float(
+        sample_rate if sample_rate is not None else os.environ.get('LOG_SAMPLE_RATE', DEFAULT_SAMPLE_RATE)
+    )
+
+    target = logging.StreamHandler(stream or sys.stdout)
+    target.setFormatter(JsonFormatter())
+    handler = logging.handlers.MemoryHandler(
+        buffer_capacity, flushLevel=logging.ERROR, target=target, flushOnClose=True
+    )
+    handler.addFilter(_RequestFilter(log_level))
+
+    logger = logging.getLogger(LOGGER_NAME)
+    for existing in list(logger.handlers):
+        logger.removeHandler(existing)
+        existing.close()
+    logger.addHandler(handler)
+    logger.propagate = False
+    # サンプリングしない場合はロガーの段階で除外し、レコードを作成しない
+    logger.setLevel(logging.DEBUG if _sample_rate > 0 else log_level)
+    return logger
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(f'{LOGGER_NAME}.{name}')
+
+
+def flush() -> None:
+    """バッファーのレコードを書き出す"""
+    for handler in logging.getLogger(LOGGER_NAME).handlers:
+        handler.flush()
+
+
+def is_sampled() -> bool:
+    return _sampled.get()
+
+
+@contextmanager
+def request_context(request_id: Optional[str]) -> Iterator[None]:
+    """リクエストの間、ログにリクエストIDを付与し、サンプリングの対象かを決める
+
+    終了時にバッファーのレコードを書き出す。
+    """
+    id_token = _request_id.set(request_id)
+    sampled_token = _sampled.set(_sample_rate > 0 and random.random() < _sample_rate)
+    try:
+        yield
+    finally:
+        _sampled.reset(sampled_token)
+        _request_id.reset(id_token)
+        flush()
@@ -0,0 +1,252 @@
+"""リクエスト単位の処理時間の計測（トレース）
+
+`start_trace` で開始したリクエストの中で、`span` / `traced` で囲んだ処理の所要時間を
+単調増加タイマーで記録し、リクエストの終了時にエクスポーターへ1件のレコードとして渡す。
+トレースが開始されていない場合、`span` は何もしないため計測のコストはほぼかからない。
+
+各層から利用するため、特定の層に依存しない共有モジュールとして置く。
+"""
+import contextvars
+import functools
+import inspect
+import json
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, TypeVar
+
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+@dataclass
+class SpanRecord:
+    """1つの処理の所要時間"""
+    name: str
+    # トレースの開始からの経過時間
+    start_ms: float
+    duration_ms: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class TraceRecord:
+    """1リクエスト分の計測結果"""
+    name: str
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    spans: List[SpanRecord] = field(default_factory=list)
+    duration_ms: float = 0.0
+    # DynamoDBの消費キャパシティユニット（ReturnConsumedCapacityの合計）
+    consumed_capacity: float = 0.0
+    _started_at: float = field(default=0.0, repr=False)
+    # 加算は読み込みと書き込みに分かれるため、スレッドプールからの記録が重なっても失われないようにする
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add_span(self, name: str, start: float, end: float, attributes: Dict[str, Any]) -> None:
+        # list.appendはスレッドセーフなため、スレッドプールからの記録もそのまま追加できる
+        self.spans.append(SpanRecord(
+            name=name,
+            start_ms=(start - self._started_at) * 1000,
+            duration_ms=(end - start) * 1000,
+            attributes=attributes
+        ))
+
+    def add_consumed_capacity(self, units: float) -> None:
+        with self._lock:
+            self.consumed_capacity += units
+
+    def durations_by_name(self) -> Dict[str, float]:
+        """同じ名前の処理の所要時間の合計"""
+        durations: Dict[str, float] = {}
+        for span_record in self.spans:
+            durations[span_record.name] = durations.get(span_record.name, 0.0) + span_record.duration_ms
+        return durations
+
+
+class TraceExporter(ABC):
+    """計測結果の出力先"""
+
+    @abstractmethod
+    def export(self, record: TraceRecord) -> None:
+        pass
+
+
+class InMemoryTraceExporter(TraceExporter):
+    """計測結果をメモリに保持する（テスト用）"""
+
+    def __init__(self):
+        self.records: List[TraceRecord] = []
+
+    def export(self, record: TraceRecord) -> None:
+        self.records.append(record)
+
+    def clear(self) -> None:
+        self.records.clear()
+
+
+class EmfStdoutTraceExporter(TraceExporter):
+    """CloudWatch Embedded Metric Format（EMF）のJSONを標準出力に1行で書き出す
+
+    Lambdaの標準出力はCloudWatch Logsに送られ、EMFの項目はメトリクスとして抽出される。
+    """
+
+    def __init__(self, namespace: str = 'TaskManagementApp', stream: Optional[TextIO] = None):
+        self._namespace = namespace
+        self._stream = stream
+
+    def to_emf(self, record: TraceRecord) -> Dict[str, Any]:
+        durations = {name: round(value, 3) for name, value in record.durations_by_name().items()}
+        metrics = [{'Name': 'duration', 'Unit': 'Milliseconds'}]
+        metrics.extend({'Name': name, 'Unit': 'Milliseconds'} for name in durations)
+        metrics.append({'Name': 'consumed_capacity', 'Unit': 'Count'})
+        return {
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': self._namespace,
+                    'Dimensions': [['route']],
+                    'Metrics': metrics,
+                }],
+            },
+            'route': record.name,
+            **record.attributes,
+            'duration': round(record.duration_ms, 3),
+            **durations,
+            'consumed_capacity': record.consumed_capacity,
+            'spans': [
+                {
+                    'name': span_record.name,
+                    'start_ms': round(span_record.start_ms, 3),
+                    'duration_ms': round(span_record.duration_ms, 3),
+                    **span_record.attributes,
+                }
+                for span_record in record.spans
+            ],
+        }
+
+    def export(self, record: TraceRecord) -> None:
+        stream = self._stream or sys.stdout
+        stream.write(json.dumps(self.to_emf(record), ensure_ascii=False, default=str) + '\n')
+
+
+class _NoopSpan:
+    """トレースが開始されていない場合のspan"""
+
+    def __enter__(self) -> Dict[str, Any]:
+        return {}
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_trace: contextvars.ContextVar[Optional[TraceRecord]] = contextvars.ContextVar(
+    'current_trace', default=None
+)
+_exporter: Optional[TraceExporter] = None
+
+
+def configure(exporter: Optional[TraceExporter]) -> None:
+    """エクスポーターを設定する（Noneの場合は計測を無効にする）"""
+    global _exporter
+    _exporter = exporter
+
+
+def is_enabled() -> bool:
+    return _exporter is not None
+
+
+def current_trace() -> Optional[TraceRecord]:
+    return _current_trace.get()
+
+
+@contextmanager
+def start_trace(name: str, **attributes: Any) -> Iterator[Optional[TraceRecord]]:
+    """リクエストの計測を開始し、終了時にエクスポートする"""
+    exporter = _exporter
+    if exporter is None:
+        yield None
+        return
+
+    started_at = time.perf_counter()
+    record = TraceRecord(name=name, attributes=attributes, _started_at=started_at)
+    token = _current_trace.set(record)
+    try:
+        yield record
+    finally:
+        _current_trace.reset(token)
+        record.duration_ms = (time.perf_counter() - started_at) * 1000
+        exporter.export(record)
+
+
+class _Span:
+    __slots__ = ('_record', '_name', '_attributes', '_start')
+
+    def __init__(self, record: TraceRecord, name: str, attributes: Dict[str, Any]):
+        self._record = record
+        self._name = name
+        self._attributes = attributes
+        self._start = 0.0
+
+    def __enter__(self) -> Dict[str, Any]:
+        self._start = time.perf_counter()
+        return self._attributes
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        if exc_type is not None:
+            self._attributes['error'] = exc_type.__name__
+        self._record.add_span(self._name, self._start, time.perf_counter(), self._attributes)
+
+
+def span(name: str, **attributes: Any) -> Any:
+    """処理の所要時間を記録するコンテキストマネージャー
+
+    `with span('name') as attributes:` で返される辞書に値を追加すると、spanの属性として記録される。
+    """
+    record = _current_trace.get()
+    if record is None:
+        return _NOOP_SPAN
+    return _Span(record, name, attributes)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """関数全体を1つのspanとして記録するデコレーター（コルーチン関数にも使用できる）"""
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                record = _current_trace.get()
+                if record is None:
+                    return await func(*args, **kwargs)
+                with _Span(record, name, {}):
+                    return await func(*args, **kwargs)
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            record = _current_trace.get()
+            if record is None:
+                return func(*args, **kwargs)
+            with _Span(record, name, {}):
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def consumed_capacity_units(response: Dict[str, Any]) -> float:
+    """DynamoDBのレスポンスの消費キャパシティユニットの合計"""
+    consumed = response.get('ConsumedCapacity')
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return sum(float(capacity.get('CapacityUnits', 0)) for capacity in consumed or [])
+
+
+def record_consumed_capacity(response: Dict[str, Any]) -> None:
+    """DynamoDBのレスポンスの消費キャパシティを現在のトレースに加算する"""
+    record = _current_trace.get()
+    if record is None:
+        return
+    record.add_consumed_capacity(consumed_capacity_units(response))
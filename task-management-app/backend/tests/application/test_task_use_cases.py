@@ -3,9 +3,11 @@ from unittest.mock import Mock, MagicMock
 from datetime import datetime
 
 from backend.domain.entities.task import Task
+from backend.domain.exceptions.task_exceptions import TaskNotFoundError
+from backend.domain.repositories.task_repository import TaskChangePage, TaskItemPage, TaskPage, TaskSummary
 from backend.domain.services.task_service import TaskService
 from backend.domain.value_objects.task_status import TaskStatus
-from backend.application.use_cases.task_use_cases import TaskUseCases
+from backend.application.use_cases.task_use_cases import DEFAULT_PAGE_LIMIT, TaskUseCases
 from backend.application.dtos.task_dto import TaskDTO
 
 
@@ -56,6 +58,24 @@ class TestTaskUseCases(unittest.TestCase):
         self.assertEqual(result.due_date, self.test_task_dto.due_date)
         self.assertEqual(result.user_id, self.test_task_dto.user_id)
     
+    def test_create_tasks(self):
+        # save_manyのモック設定
+        self.mock_task_repository.save_many.side_effect = lambda tasks: tasks
+        
+        # テスト実行
+        result = self.task_use_cases.create_tasks([self.test_task_dto, self.test_task_dto])
+        
+        # 検証
+        self.mock_task_repository.save_many.assert_called_once()
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[0].title, self.test_task_dto.title)
+    
+    def test_batch_size_is_limited(self):
+        # 上限を超える一括操作はエラー
+        with self.assertRaises(ValueError):
+            self.task_use_cases.delete_tasks([f"task-{i}" for i in range(101)], "test-user-id")
+        self.mock_task_repository.delete_many.assert_not_called()
+    
     def test_get_task(self):
         # find_by_idのモック設定
         self.mock_task_repository.find_by_id.return_value = self.test_task
@@ -68,59 +88,200 @@ class TestTaskUseCases(unittest.TestCase):
         self.assertEqual(result.task_id, self.test_task_dto.task_id)
         self.assertEqual(result.title, self.test_task_dto.title)
     
+    def test_get_task_summary(self):
+        # get_summaryのモック設定
+        self.mock_task_repository.get_summary.return_value = TaskSummary(
+            counts={TaskStatus.NOT_STARTED: 2, TaskStatus.COMPLETED: 1}
+        )
+        
+        # テスト実行
+        result = self.task_use_cases.get_task_summary("test-user-id")
+        
+        # 検証（件数のないステータスは0として返す）
+        self.mock_task_repository.get_summary.assert_called_once_with("test-user-id")
+        self.assertEqual(result.total, 3)
+        self.assertEqual(
+            result.by_status,
+            {TaskStatus.NOT_STARTED.value: 2, TaskStatus.IN_PROGRESS.value: 0, TaskStatus.COMPLETED.value: 1}
+        )
+    
     def test_get_all_tasks(self):
-        # find_all_by_user_idのモック設定
-        self.mock_task_repository.find_all_by_user_id.return_value = [self.test_task]
+        # find_page_by_user_idのモック設定
+        self.mock_task_repository.find_page_by_user_id.return_value = TaskPage(
+            tasks=[self.test_task], next_token="next-token"
+        )
         
         # テスト実行
         result = self.task_use_cases.get_all_tasks("test-user-id")
         
         # 検証
-        self.mock_task_repository.find_all_by_user_id.assert_called_once_with("test-user-id")
-        self.assertEqual(len(result), 1)
-        self.assertEqual(result[0].task_id, self.test_task_dto.task_id)
-        self.assertEqual(result[0].title, self.test_task_dto.title)
+        self.mock_task_repository.find_page_by_user_id.assert_called_once_with("test-user-id", 100, None)
+        self.assertEqual(len(result.tasks), 1)
+        self.assertEqual(result.tasks[0].task_id, self.test_task_dto.task_id)
+        self.assertEqual(result.tasks[0].title, self.test_task_dto.title)
+        self.assertEqual(result.next_token, "next-token")
     
-    def test_update_task(self):
-        # find_by_idとsaveのモック設定
-        self.mock_task_repository.find_by_id.return_value = self.test_task
-        self.mock_task_repository.save.return_value = self.test_task
+    def test_get_all_task_items(self):
+        # 射影された属性をそのまま返す
+        page = TaskItemPage(items=[{"task_id": "test-task-id"}], next_token=None)
+        self.mock_task_repository.find_item_page_by_user_id.return_value = page
         
         # テスト実行
-        result = self.task_use_cases.update_task(self.test_task_dto)
+        result = self.task_use_cases.get_all_task_items("test-user-id", limit=10)
         
         # 検証
-        self.mock_task_repository.save.assert_called_once()
-        self.assertEqual(result.task_id, self.test_task_dto.task_id)
-        self.assertEqual(result.title, self.test_task_dto.title)
+        self.mock_task_repository.find_item_page_by_user_id.assert_called_once_with("test-user-id", 10, None)
+        self.assertIs(result, page)
+    
+    def test_get_task_changes(self):
+        # タイムゾーン付きの時刻はタイムゾーンなしのUTCに変換される
+        page = TaskChangePage(items=[], deleted_task_ids=["deleted-task-id"])
+        self.mock_task_repository.find_changes_since.return_value = page
+        
+        # テスト実行
+        result = self.task_use_cases.get_task_changes("test-user-id", "2023-01-01T09:00:00+09:00")
+        
+        # 検証
+        self.mock_task_repository.find_changes_since.assert_called_once_with(
+            "test-user-id", datetime(2023, 1, 1, 0, 0), DEFAULT_PAGE_LIMIT, None
+        )
+        self.assertIs(result, page)
+    
+    def test_get_task_changes_invalid_since(self):
+        # ISO 8601ではない時刻はエラー
+        with self.assertRaises(ValueError):
+            self.task_use_cases.get_task_changes("test-user-id", "yesterday")
+        self.mock_task_repository.find_changes_since.assert_not_called()
+    
+    def test_search_task_items_by_status(self):
+        # ステータスを指定した場合はステータスのGSIを使用する
+        page = TaskItemPage(items=[{"task_id": "test-task-id"}])
+        self.mock_task_repository.find_by_user_and_status.return_value = page
+        
+        # テスト実行
+        result = self.task_use_cases.search_task_items(
+            "test-user-id", status="進行中", due_before="2023-12-31T00:00:00", sort="-due_date"
+        )
+        
+        # 検証
+        self.mock_task_repository.find_by_user_and_status.assert_called_once_with(
+            "test-user-id", TaskStatus.IN_PROGRESS, DEFAULT_PAGE_LIMIT, None,
+            None, datetime(2023, 12, 31), True
+        )
+        self.mock_task_repository.find_due_between.assert_not_called()
+        self.assertIs(result, page)
+    
+    def test_search_task_items_by_due_date(self):
+        # ステータスを指定しない場合は期限のGSIを使用する
+        self.task_use_cases.search_task_items("test-user-id", due_after="2023-12-01", limit=10)
+        
+        # 検証
+        self.mock_task_repository.find_due_between.assert_called_once_with(
+            "test-user-id", datetime(2023, 12, 1), None, 10, None, False
+        )
+    
+    def test_search_task_items_newest_first(self):
+        # 作成順の並べ替え・作成時刻の絞り込みはタスクIDの順に取得する
+        self.task_use_cases.search_task_items(
+            "test-user-id", sort="-created_at", created_after="2024-01-01T09:00:00+09:00"
+        )
+        
+        # 検証（タイムゾーン付きの時刻はUTCに変換する）
+        self.mock_task_repository.find_created_after.assert_called_once_with(
+            "test-user-id", datetime(2024, 1, 1), DEFAULT_PAGE_LIMIT, None, True
+        )
+        self.mock_task_repository.find_due_between.assert_not_called()
+    
+    def test_search_task_items_created_after_with_due_filter(self):
+        # 作成順の取得はステータス・期限の絞り込みと併用できない
+        with self.assertRaises(ValueError):
+            self.task_use_cases.search_task_items(
+                "test-user-id", created_after="2024-01-01", due_after="2024-01-01"
+            )
+        self.mock_task_repository.find_created_after.assert_not_called()
+    
+    def test_search_task_items_invalid_parameters(self):
+        # 不正なステータス・並べ替え・期限の範囲はエラー
+        with self.assertRaises(ValueError):
+            self.task_use_cases.search_task_items("test-user-id", status="unknown")
+        with self.assertRaises(ValueError):
+            self.task_use_cases.search_task_items("test-user-id", sort="title")
+        with self.assertRaises(ValueError):
+            self.task_use_cases.search_task_items(
+                "test-user-id", due_after="2024-01-01", due_before="2023-01-01"
+            )
+        self.mock_task_repository.find_by_user_and_status.assert_not_called()
+        self.mock_task_repository.find_due_between.assert_not_called()
+    
+    def test_get_all_tasks_invalid_limit(self):
+        # 範囲外のlimitはエラー
+        with self.assertRaises(ValueError):
+            self.task_use_cases.get_all_tasks("test-user-id", limit=0)
+        self.mock_task_repository.find_page_by_user_id.assert_not_called()
     
     def test_delete_task(self):
-        # find_by_idとdeleteのモック設定
-        self.mock_task_repository.find_by_id.return_value = self.test_task
+        # deleteのモック設定
         self.mock_task_repository.delete.return_value = True
         
         # テスト実行
         result = self.task_use_cases.delete_task("test-task-id", "test-user-id")
         
-        # 検証
-        self.mock_task_repository.find_by_id.assert_called_once_with("test-task-id", "test-user-id")
+        # 検証（事前の読み込みは行わない）
+        self.mock_task_repository.find_by_id.assert_not_called()
         self.mock_task_repository.delete.assert_called_once_with("test-task-id", "test-user-id")
         self.assertTrue(result)
     
+    def test_delete_task_not_found(self):
+        # 削除対象が存在しない場合
+        self.mock_task_repository.delete.return_value = False
+        
+        # テスト実行・検証
+        with self.assertRaises(TaskNotFoundError):
+            self.task_use_cases.delete_task("test-task-id", "test-user-id")
+    
     def test_update_task_status(self):
-        # find_by_idとsaveのモック設定
-        self.mock_task_repository.find_by_id.return_value = self.test_task
-        self.mock_task_repository.save.return_value = self.test_task
+        # update_fieldsのモック設定
+        updated_task = Task(
+            task_id="test-task-id",
+            title="テストタスク",
+            status=TaskStatus.IN_PROGRESS,
+            user_id="test-user-id"
+        )
+        self.mock_task_repository.update_fields.return_value = updated_task
         
         # テスト実行
         new_status = TaskStatus.IN_PROGRESS.value
         result = self.task_use_cases.update_task_status("test-task-id", "test-user-id", new_status)
         
-        # 検証
-        self.mock_task_repository.find_by_id.assert_called_once_with("test-task-id", "test-user-id")
-        self.mock_task_repository.save.assert_called_once()
+        # 検証（読み込みと全項目の書き込みは行わない）
+        self.mock_task_repository.update_fields.assert_called_once_with(
+            "test-task-id", "test-user-id", {"status": TaskStatus.IN_PROGRESS}, None
+        )
+        self.mock_task_repository.find_by_id.assert_not_called()
+        self.mock_task_repository.save.assert_not_called()
         self.assertEqual(result.status, new_status)
-
+    
+    def test_patch_task_converts_values(self):
+        # 文字列の値はドメインの型に変換される
+        self.mock_task_repository.update_fields.return_value = self.test_task
+        
+        # テスト実行
+        self.task_use_cases.patch_task(
+            "test-task-id", "test-user-id", {"title": "新しいタイトル", "due_date": "2024-01-31"}
+        )
+        
+        # 検証
+        self.mock_task_repository.update_fields.assert_called_once_with(
+            "test-task-id", "test-user-id", {"title": "新しいタイトル", "due_date": datetime(2024, 1, 31)}, None
+        )
+    
+    def test_patch_task_not_found(self):
+        # 対象が存在しない場合
+        self.mock_task_repository.update_fields.return_value = None
+        
+        # テスト実行・検証
+        with self.assertRaises(TaskNotFoundError):
+            self.task_use_cases.patch_task("test-task-id", "test-user-id", {"title": "新しいタイトル"})
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,10 @@
 import unittest
-from datetime import datetime
+from datetime import datetime, timezone
+from decimal import Decimal
 from uuid import uuid4
 
 from backend.domain.entities.task import Task
+from backend.domain.value_objects.task_id import created_at_from_task_id
 from backend.domain.value_objects.task_status import TaskStatus
 
 
@@ -100,6 +102,7 @@ class TestTask(unittest.TestCase):
         self.assertEqual(task_dict["user_id"], user_id)
         self.assertEqual(task_dict["created_at"], created_at.isoformat())
         self.assertEqual(task_dict["updated_at"], updated_at.isoformat())
+        self.assertEqual(task_dict["version"], 1)
     
     def test_from_dict(self):
         # from_dictメソッドのテスト
@@ -134,6 +137,68 @@ class TestTask(unittest.TestCase):
         self.assertEqual(task.created_at.isoformat(), created_at)
         self.assertEqual(task.updated_at.isoformat(), updated_at)
 
+    def test_task_uses_slots(self):
+        # インスタンスは__dict__を持たない
+        task = Task(title="テストタスク", user_id="test-user-id")
+        
+        self.assertFalse(hasattr(task, "__dict__"))
+        with self.assertRaises(AttributeError):
+            task.unknown_attribute = "value"
+    
+    def test_from_dict_with_defaults(self):
+        # 省略されたIDと日時は生成される
+        task = Task.from_dict({
+            "title": "テストタスク",
+            "status": TaskStatus.IN_PROGRESS.value,
+            "user_id": "test-user-id"
+        })
+        
+        self.assertTrue(task.task_id)
+        self.assertEqual(task.status, TaskStatus.IN_PROGRESS)
+        self.assertIsNone(task.due_date)
+        self.assertIsNotNone(task.created_at)
+        self.assertIsNotNone(task.updated_at)
+        # 版の導入前の項目は版0
+        self.assertEqual(task.version, 0)
+    
+    def test_from_dict_version(self):
+        # DynamoDBの数値（Decimal）も整数にする
+        task = Task.from_dict({
+            "title": "テストタスク",
+            "status": TaskStatus.NOT_STARTED.value,
+            "user_id": "test-user-id",
+            "version": Decimal("5")
+        })
+        
+        self.assertEqual(task.version, 5)
+    
+    def test_from_dict_invalid_status(self):
+        # 不正なステータスはValueError
+        with self.assertRaises(ValueError):
+            Task.from_dict({"title": "テストタスク", "status": "unknown", "user_id": "test-user-id"})
+
+    
+    def test_generated_task_ids_are_time_ordered(self):
+        # 既定のIDはUUIDv7で、生成順に並び、作成時刻を取り出せる
+        tasks = [Task(title=f"タスク{i}", user_id="test-user-id") for i in range(100)]
+        task_ids = [task.task_id for task in tasks]
+        
+        # 検証
+        self.assertEqual(task_ids, sorted(task_ids))
+        self.assertEqual(len(set(task_ids)), 100)
+        created_at = created_at_from_task_id(task_ids[0])
+        self.assertLess(abs((created_at - datetime.now(timezone.utc).replace(tzinfo=None)).total_seconds()), 60)
+    
+    def test_id_generator_is_pluggable(self):
+        # クラス属性を置き換えるとIDの生成方法を変更できる
+        original = Task.id_generator
+        Task.id_generator = lambda: "custom-id"
+        self.addCleanup(setattr, Task, "id_generator", original)
+        
+        # テスト実行・検証
+        self.assertEqual(Task(title="タスク", user_id="test-user-id").task_id, "custom-id")
+        self.assertEqual(Task.from_dict({"title": "タスク", "status": "未着手"}).task_id, "custom-id")
+
 
 if __name__ == "__main__":
     unittest.main()
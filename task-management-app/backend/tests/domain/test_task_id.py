@@ -0,0 +1,82 @@
+import threading
+import unittest
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from backend.domain.value_objects.task_id import (
+    UUIDv7Generator, created_at_from_task_id, min_task_id_at, random_task_id
+)
+
+
+class TestTaskId(unittest.TestCase):
+    def test_uuid7_format(self):
+        # RFC 9562のバージョン7・バリアントの形式
+        task_id = UUIDv7Generator()()
+        
+        # 検証
+        parsed = uuid.UUID(task_id)
+        self.assertEqual(parsed.version, 7)
+        self.assertEqual(parsed.variant, uuid.RFC_4122)
+        self.assertEqual(str(parsed), task_id)
+    
+    def test_monotonic_within_same_millisecond(self):
+        # 時計が進まない・戻る場合も直前のIDより大きくなる
+        clock_values = iter([5_000_000, 5_000_000, 4_000_000, 5_000_001])
+        generator = UUIDv7Generator(clock=lambda: next(clock_values))
+        
+        # テスト実行
+        task_ids = [generator() for _ in range(4)]
+        
+        # 検証
+        self.assertEqual(task_ids, sorted(task_ids))
+        self.assertEqual(len(set(task_ids)), 4)
+        self.assertEqual(
+            {created_at_from_task_id(task_id) for task_id in task_ids}, {datetime(1970, 1, 1, 0, 0, 0, 5000)}
+        )
+    
+    def test_unique_across_threads(self):
+        # 複数のスレッドから生成しても重複しない
+        generator = UUIDv7Generator()
+        task_ids = []
+        lock = threading.Lock()
+        
+        def generate():
+            generated = [generator() for _ in range(1000)]
+            with lock:
+                task_ids.extend(generated)
+        
+        threads = [threading.Thread(target=generate) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # 検証
+        self.assertEqual(len(set(task_ids)), 4000)
+    
+    def test_created_at_from_task_id(self):
+        # 作成時刻はミリ秒単位のタイムゾーンなしのUTC
+        moment = datetime(2024, 5, 1, 12, 30, 15, 123000)
+        moment_ms = round(moment.replace(tzinfo=timezone.utc).timestamp() * 1000)
+        generator = UUIDv7Generator(clock=lambda: moment_ms * 1_000_000)
+        
+        # テスト実行・検証
+        self.assertEqual(created_at_from_task_id(generator()), moment)
+        self.assertIsNone(created_at_from_task_id(random_task_id()))
+        self.assertIsNone(created_at_from_task_id("not-a-task-id"))
+    
+    def test_min_task_id_at(self):
+        # 指定した時刻以降に生成されたIDは下限以上、それより前のIDは下限未満
+        moment = datetime(2024, 5, 1, 12, 0, 0)
+        moment_ns = int(moment.replace(tzinfo=timezone.utc).timestamp()) * 1_000_000_000
+        lower = min_task_id_at(moment)
+        
+        # 検証
+        self.assertLessEqual(lower, UUIDv7Generator(clock=lambda: moment_ns)())
+        self.assertGreater(lower, UUIDv7Generator(clock=lambda: moment_ns - 1_000_000)())
+        # タイムゾーン付きの時刻はUTCに変換する
+        self.assertEqual(lower, min_task_id_at(datetime(2024, 5, 1, 21, 0, 0, tzinfo=timezone(timedelta(hours=9)))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import io
+import json
+import time
+import unittest
+from unittest.mock import patch
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from backend.infrastructure.auth.cognito_auth_service import CognitoAuthService
+
+
+def _generate_jwk(kid):
+    """テスト用のRSA鍵とJWKを生成する"""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk["kid"] = kid
+    return private_key, jwk
+
+
+class TestCognitoAuthService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.private_key, cls.jwk = _generate_jwk("test-kid")
+        cls.rotated_private_key, cls.rotated_jwk = _generate_jwk("rotated-kid")
+
+    @patch("boto3.client")
+    @patch.dict("os.environ", {"COGNITO_CLIENT_ID": "test-client-id"})
+    def setUp(self, mock_boto3_client):
+        self.auth_service = CognitoAuthService(jwks_ttl=3600, jwks_min_refresh_interval=60)
+        self.fetch_patcher = patch.object(self.auth_service, "_fetch_jwks", return_value=[self.jwk])
+        self.mock_fetch_jwks = self.fetch_patcher.start()
+        self.addCleanup(self.fetch_patcher.stop)
+
+    def _create_token(self, private_key, kid, sub="test-user-id"):
+        payload = {"sub": sub, "aud": "test-client-id", "exp": int(time.time()) + 3600}
+        return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+    def test_verify_token_caches_public_keys(self):
+        # 2回検証してもJWKSの取得は1回だけ
+        token = self._create_token(self.private_key, "test-kid")
+
+        self.assertEqual(self.auth_service.get_user_id_from_token(token), "test-user-id")
+        self.assertEqual(self.auth_service.get_user_id_from_token(token), "test-user-id")
+
+        self.mock_fetch_jwks.assert_called_once()
+
+    def test_unknown_kid_forces_refetch(self):
+        # 鍵のローテーション後、未知のkidで再取得される
+        self.auth_service.verify_token(self._create_token(self.private_key, "test-kid"))
+        self.mock_fetch_jwks.return_value = [self.jwk, self.rotated_jwk]
+        self.auth_service._jwks_fetched_at -= 60
+
+        token = self._create_token(self.rotated_private_key, "rotated-kid")
+
+        self.assertEqual(self.auth_service.get_user_id_from_token(token), "test-user-id")
+        self.assertEqual(self.mock_fetch_jwks.call_count, 2)
+
+    def test_unknown_kid_refetch_is_rate_limited(self):
+        # 最小間隔内の未知のkidでは再取得しない
+        self.auth_service.verify_token(self._create_token(self.private_key, "test-kid"))
+
+        token = self._create_token(self.rotated_private_key, "unknown-kid")
+
+        self.assertIsNone(self.auth_service.verify_token(token))
+        self.assertIsNone(self.auth_service.verify_token(token))
+        self.mock_fetch_jwks.assert_called_once()
+
+    def test_expired_jwks_is_refreshed_in_background(self):
+        # TTL切れの場合は既存の鍵で検証しつつ再取得する
+        token = self._create_token(self.private_key, "test-kid")
+        self.auth_service.verify_token(token)
+        self.auth_service._jwks_fetched_at -= 3600
+        self.auth_service._token_cache.clear()
+
+        with patch("threading.Thread") as mock_thread:
+            self.assertEqual(self.auth_service.get_user_id_from_token(token), "test-user-id")
+
+        mock_thread.assert_called_once()
+        mock_thread.return_value.start.assert_called_once()
+
+    def test_verified_token_is_cached(self):
+        # 2回目以降は署名検証を行わない
+        token = self._create_token(self.private_key, "test-kid")
+        self.auth_service.verify_token(token)
+
+        with patch("jwt.decode") as mock_decode:
+            self.assertEqual(self.auth_service.get_user_id_from_token(token), "test-user-id")
+
+        mock_decode.assert_not_called()
+
+    def test_expired_cache_entry_is_not_used(self):
+        # exp を過ぎたエントリは使用されない
+        token = self._create_token(self.private_key, "test-kid")
+        self.auth_service.verify_token(token)
+
+        with patch("time.time", return_value=time.time() + 7200):
+            self.assertIsNone(self.auth_service._token_cache.get(token))
+        self.assertEqual(len(self.auth_service._token_cache), 0)
+
+    @patch("boto3.client")
+    def test_token_cache_is_bounded(self, mock_boto3_client):
+        # 最大サイズを超えると古いエントリから削除される
+        auth_service = CognitoAuthService(token_cache_size=2)
+        tokens = [self._create_token(self.private_key, "test-kid", sub=f"user-{i}") for i in range(3)]
+        for token in tokens:
+            auth_service._token_cache.put(token, jwt.decode(token, options={"verify_signature": False}))
+
+        self.assertEqual(len(auth_service._token_cache), 2)
+        self.assertIsNone(auth_service._token_cache.get(tokens[0]))
+        self.assertIsNotNone(auth_service._token_cache.get(tokens[2]))
+
+    def test_invalid_signature(self):
+        # 別の鍵で署名されたトークンは検証に失敗する
+        token = self._create_token(self.rotated_private_key, "test-kid")
+
+        self.assertIsNone(self.auth_service.verify_token(token))
+
+    @patch.dict("os.environ", {"COGNITO_JWKS_URL": "http://127.0.0.1:9000/jwks.json"})
+    def test_fetch_jwks_uses_configured_url(self):
+        # JWKSのURLを指定した場合はそのURLから取得する
+        auth_service = CognitoAuthService()
+        response = io.BytesIO(json.dumps({"keys": [self.jwk]}).encode("utf-8"))
+
+        with patch("urllib.request.urlopen", return_value=response) as mock_urlopen:
+            keys = auth_service._fetch_jwks()
+
+        mock_urlopen.assert_called_once_with("http://127.0.0.1:9000/jwks.json")
+        self.assertEqual(keys, [self.jwk])
+
+
+if __name__ == "__main__":
+    unittest.main()
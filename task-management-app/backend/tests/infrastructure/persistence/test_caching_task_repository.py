@@ -0,0 +1,117 @@
+import json
+import unittest
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from backend.domain.entities.task import Task
+from backend.domain.repositories.task_repository import TaskItemPage
+from backend.domain.value_objects.task_status import TaskStatus
+from backend.infrastructure.persistence.caching_task_repository import CachingTaskRepository
+from backend.infrastructure.persistence.task_cache_store import (
+    InMemoryTaskCacheStore,
+    RedisTaskCacheStore,
+)
+
+
+class TestCachingTaskRepository(unittest.TestCase):
+    def setUp(self):
+        # モックの設定
+        self.mock_repository = Mock()
+        self.store = InMemoryTaskCacheStore(max_size=100)
+        self.repository = CachingTaskRepository(self.mock_repository, self.store, ttl_seconds=30)
+        
+        # テスト用のタスク
+        self.test_task = Task(
+            task_id="test-task-id",
+            title="テストタスク",
+            status=TaskStatus.NOT_STARTED,
+            user_id="test-user-id",
+            created_at=datetime(2023, 1, 1),
+            updated_at=datetime(2023, 1, 1)
+        )
+    
+    def test_find_by_id_is_cached(self):
+        # 2回目はリポジトリを呼ばない
+        self.mock_repository.find_by_id.return_value = self.test_task
+        
+        first = self.repository.find_by_id("test-task-id", "test-user-id")
+        second = self.repository.find_by_id("test-task-id", "test-user-id")
+        
+        self.mock_repository.find_by_id.assert_called_once()
+        self.assertEqual(second.to_dict(), first.to_dict())
+        self.assertIsNot(second, first)
+        self.assertEqual((self.repository.stats.hits, self.repository.stats.misses), (1, 1))
+    
+    def test_find_by_id_expires(self):
+        # 有効期間を過ぎると再取得する
+        self.mock_repository.find_by_id.return_value = self.test_task
+        self.repository.find_by_id("test-task-id", "test-user-id")
+        
+        with patch("time.monotonic", return_value=10 ** 9):
+            self.repository.find_by_id("test-task-id", "test-user-id")
+        
+        self.assertEqual(self.mock_repository.find_by_id.call_count, 2)
+    
+    def test_delete_invalidates(self):
+        # 削除後はキャッシュを使用しない
+        self.mock_repository.find_by_id.return_value = self.test_task
+        self.mock_repository.find_all_by_user_id.return_value = [self.test_task]
+        self.repository.find_by_id("test-task-id", "test-user-id")
+        self.repository.find_all_by_user_id("test-user-id")
+        
+        self.repository.delete("test-task-id", "test-user-id")
+        self.mock_repository.find_by_id.return_value = None
+        self.mock_repository.find_all_by_user_id.return_value = []
+        
+        self.assertIsNone(self.repository.find_by_id("test-task-id", "test-user-id"))
+        self.assertEqual(self.repository.find_all_by_user_id("test-user-id"), [])
+    
+    def test_write_invalidates_list_pages(self):
+        # 書き込みでそのユーザーの一覧のページがすべて無効になる
+        self.mock_repository.find_item_page_by_user_id.return_value = TaskItemPage(items=[{"task_id": "a"}])
+        self.repository.find_item_page_by_user_id("test-user-id", 10)
+        self.repository.find_item_page_by_user_id("test-user-id", 10)
+        self.assertEqual(self.mock_repository.find_item_page_by_user_id.call_count, 1)
+        
+        self.mock_repository.update_fields.return_value = self.test_task
+        self.repository.update_fields("test-task-id", "test-user-id", {"title": "新しいタイトル"})
+        self.repository.find_item_page_by_user_id("test-user-id", 10)
+        
+        self.assertEqual(self.mock_repository.find_item_page_by_user_id.call_count, 2)
+    
+    def test_save_writes_through(self):
+        # 保存したタスクはキャッシュから取得できる
+        self.mock_repository.save.return_value = self.test_task
+        self.repository.save(self.test_task)
+        
+        result = self.repository.find_by_id("test-task-id", "test-user-id")
+        
+        self.mock_repository.find_by_id.assert_not_called()
+        self.assertEqual(result.title, self.test_task.title)
+    
+    def test_in_memory_store_is_bounded(self):
+        # 上限を超えると古いエントリから削除される
+        store = InMemoryTaskCacheStore(max_size=2)
+        for i in range(3):
+            store.set(f"key-{i}", i, 30)
+        
+        self.assertEqual(len(store), 2)
+        self.assertIsNone(store.get("key-0"))
+        self.assertEqual(store.get("key-2"), 2)
+    
+    def test_redis_store(self):
+        # Redis互換のクライアントにJSONで保存する
+        client = Mock()
+        client.get.return_value = json.dumps({"task_id": "test-task-id"}).encode()
+        store = RedisTaskCacheStore(client)
+        
+        store.set("task:test-user-id:test-task-id", {"task_id": "test-task-id"}, 1.5)
+        
+        client.set.assert_called_once_with(
+            "task-cache:task:test-user-id:test-task-id", '{"task_id":"test-task-id"}', px=1500
+        )
+        self.assertEqual(store.get("task:test-user-id:test-task-id"), {"task_id": "test-task-id"})
+
+
+if __name__ == "__main__":
+    unittest.main()
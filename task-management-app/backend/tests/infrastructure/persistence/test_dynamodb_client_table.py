@@ -0,0 +1,99 @@
+import unittest
+from decimal import Decimal
+
+import boto3
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.stub import Stubber
+
+from backend.infrastructure.persistence.dynamodb_client_table import (
+    DynamoDBClientResource,
+    deserialize_item,
+    serialize_item,
+)
+
+
+class TestDynamoDBClientTable(unittest.TestCase):
+    def setUp(self):
+        # 実際のクライアントをStubberで置き換え、送信されるパラメータを検証する
+        self.client = boto3.client(
+            "dynamodb", region_name="us-east-1",
+            aws_access_key_id="test", aws_secret_access_key="test"
+        )
+        self.stubber = Stubber(self.client)
+        self.stubber.activate()
+        self.addCleanup(self.stubber.deactivate)
+        self.resource = DynamoDBClientResource(self.client)
+        self.table = self.resource.Table("Tasks")
+
+    def test_serialize_round_trip(self):
+        # 項目で使う型は変換前後で一致する
+        item = {
+            "task_id": "test-task-id",
+            "description": None,
+            "deleted": True,
+            "expires_at": 1700000000,
+            "tags": ["a", "b"],
+            "meta": {"count": Decimal("1.5")},
+        }
+
+        serialized = serialize_item(item)
+
+        self.assertEqual(serialized["task_id"], {"S": "test-task-id"})
+        self.assertEqual(serialized["description"], {"NULL": True})
+        self.assertEqual(serialized["expires_at"], {"N": "1700000000"})
+        self.assertEqual(deserialize_item(serialized), item)
+
+    def test_put_item_with_condition(self):
+        # 条件オブジェクトは式とプレースホルダーに変換される
+        self.stubber.add_response(
+            "put_item", {},
+            {
+                "TableName": "Tasks",
+                "Item": {"task_id": {"S": "test-task-id"}, "user_id": {"S": "test-user-id"}},
+                "ConditionExpression": "attribute_exists(#n0)",
+                "ExpressionAttributeNames": {"#n0": "task_id"},
+            }
+        )
+
+        self.table.put_item(
+            Item={"task_id": "test-task-id", "user_id": "test-user-id"},
+            ConditionExpression=Attr("task_id").exists()
+        )
+
+        self.stubber.assert_no_pending_responses()
+
+    def test_query_deserializes_items(self):
+        # キー条件・既存の属性名・ExclusiveStartKeyを変換し、結果を復元する
+        self.stubber.add_response(
+            "query",
+            {
+                "Items": [{"task_id": {"S": "test-task-id"}, "title": {"S": "テストタスク"}}],
+                "LastEvaluatedKey": {"task_id": {"S": "test-task-id"}, "user_id": {"S": "test-user-id"}},
+            },
+            {
+                "TableName": "Tasks",
+                "IndexName": "UserIdIndex",
+                "KeyConditionExpression": "#n0 = :v0",
+                "ProjectionExpression": "#title",
+                "ExpressionAttributeNames": {"#title": "title", "#n0": "user_id"},
+                "ExpressionAttributeValues": {":v0": {"S": "test-user-id"}},
+                "ExclusiveStartKey": {"task_id": {"S": "prev-id"}, "user_id": {"S": "test-user-id"}},
+                "Limit": 1,
+            }
+        )
+
+        response = self.table.query(
+            IndexName="UserIdIndex",
+            KeyConditionExpression=Key("user_id").eq("test-user-id"),
+            ProjectionExpression="#title",
+            ExpressionAttributeNames={"#title": "title"},
+            ExclusiveStartKey={"task_id": "prev-id", "user_id": "test-user-id"},
+            Limit=1
+        )
+
+        self.assertEqual(response["Items"], [{"task_id": "test-task-id", "title": "テストタスク"}])
+        self.assertEqual(response["LastEvaluatedKey"], {"task_id": "test-task-id", "user_id": "test-user-id"})
+
+
+if __name__ == "__main__":
+    unittest.main()
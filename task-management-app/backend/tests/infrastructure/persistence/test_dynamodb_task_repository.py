@@ -1,10 +1,19 @@
+import os
 import unittest
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
 from backend.domain.entities.task import Task
+from backend.domain.exceptions.task_exceptions import TaskBatchError, TaskConflictError
 from backend.domain.value_objects.task_status import TaskStatus
+from backend.domain.value_objects.task_id import min_task_id_at
+from backend.infrastructure.persistence.dynamodb_client_table import DynamoDBClientResource
+from backend.infrastructure.persistence.dynamodb_config import build_client_config
 from backend.infrastructure.persistence.dynamodb_task_repository import DynamoDBTaskRepository
+from backend.shared import tracing
 
 
 class TestDynamoDBTaskRepository(unittest.TestCase):
@@ -12,12 +21,13 @@ class TestDynamoDBTaskRepository(unittest.TestCase):
     def setUp(self, mock_boto3_resource):
         # DynamoDBのモック設定
         self.mock_table = MagicMock()
-        mock_dynamodb = MagicMock()
-        mock_dynamodb.Table.return_value = self.mock_table
-        mock_boto3_resource.return_value = mock_dynamodb
+        self.mock_dynamodb = MagicMock()
+        self.mock_dynamodb.Table.return_value = self.mock_table
+        mock_boto3_resource.return_value = self.mock_dynamodb
         
         # リポジトリのインスタンス化
         self.repository = DynamoDBTaskRepository()
+        self.mock_transact_write_items = self.mock_dynamodb.meta.client.transact_write_items
         
         # テスト用のタスク
         self.test_task = Task(
@@ -43,18 +53,203 @@ class TestDynamoDBTaskRepository(unittest.TestCase):
             "updated_at": datetime(2023, 1, 1).isoformat()
         }
     
+    def _transact_items(self, call_index=-1):
+        calls = self.mock_transact_write_items.call_args_list
+        return calls[call_index].kwargs["TransactItems"]
+
     def test_save(self):
-        # put_itemのモック設定
-        self.mock_table.put_item.return_value = {}
-        
         # テスト実行
         result = self.repository.save(self.test_task)
         
-        # 検証
-        self.mock_table.put_item.assert_called_once()
+        # 検証（タスクの書き込みと集計の加算を1つのトランザクションで行う）
+        put, summary = self._transact_items()
+        item = put["Put"]["Item"]
+        self.assertEqual(item["user_status"], f"test-user-id#{TaskStatus.NOT_STARTED.value}")
+        self.assertEqual(item["due_sort"], datetime(2023, 12, 31).isoformat())
+        self.assertEqual(put["Put"]["ConditionExpression"], "attribute_not_exists(task_id)")
+        self.assertEqual(summary["Update"]["TableName"], "TaskSummaries")
+        self.assertEqual(summary["Update"]["Key"], {"user_id": "test-user-id"})
+        self.assertEqual(summary["Update"]["UpdateExpression"], "ADD #c0 :c0, #revision :revision_increment")
+        self.assertEqual(summary["Update"]["ExpressionAttributeNames"], {"#c0": "not_started", "#revision": "revision"})
+        self.assertEqual(summary["Update"]["ExpressionAttributeValues"], {":c0": 1, ":revision_increment": 1})
+        self.mock_table.put_item.assert_not_called()
         self.assertEqual(result.task_id, self.test_task.task_id)
         self.assertEqual(result.title, self.test_task.title)
     
+    def test_update_not_found(self):
+        # 条件付き書き込みが失敗し、現在の項目もない場合はNone
+        self.mock_table.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}}, "UpdateItem"
+        )
+        self.mock_table.get_item.return_value = {}
+        
+        # テスト実行・検証
+        self.assertIsNone(
+            self.repository.update_fields("test-task-id", "test-user-id", {"title": "新しいタイトル"})
+        )
+        self.mock_transact_write_items.assert_not_called()
+    
+    def test_update_fields(self):
+        # update_itemのモック設定
+        self.mock_table.update_item.return_value = {"Attributes": self.test_task_dict}
+        
+        # テスト実行
+        result = self.repository.update_fields(
+            "test-task-id", "test-user-id", {"status": TaskStatus.IN_PROGRESS}
+        )
+        
+        # 検証（変更された属性とupdated_at、ステータスのGSIのキーのみを条件付きの1回の書き込みで更新する）
+        self.mock_table.update_item.assert_called_once()
+        kwargs = self.mock_table.update_item.call_args.kwargs
+        self.assertEqual(kwargs["Key"], {"task_id": "test-task-id", "user_id": "test-user-id"})
+        self.assertEqual(kwargs["ReturnValues"], "ALL_NEW")
+        self.assertEqual(
+            kwargs["UpdateExpression"], "SET #f0 = :v0, #f1 = :v1, #f2 = :v2 ADD #version :version_increment"
+        )
+        self.assertEqual(
+            kwargs["ExpressionAttributeNames"],
+            {
+                "#f0": "status", "#f1": "updated_at", "#f2": "user_status",
+                "#expected_status": "status", "#version": "version"
+            }
+        )
+        self.assertEqual(kwargs["ExpressionAttributeValues"][":v0"], TaskStatus.IN_PROGRESS.value)
+        self.assertEqual(
+            kwargs["ExpressionAttributeValues"][":v2"], f"test-user-id#{TaskStatus.IN_PROGRESS.value}"
+        )
+        self.assertIn("ConditionExpression", kwargs)
+        self.mock_table.put_item.assert_not_called()
+        self.mock_table.get_item.assert_not_called()
+        self.mock_transact_write_items.assert_not_called()
+        self.assertEqual(result.task_id, self.test_task.task_id)
+        self.assertEqual(result.created_at, self.test_task.created_at)
+    
+    def test_update_fields_status_change_moves_summary_count(self):
+        # 変更前のステータスが異なるため条件付き書き込みが失敗し、エラーに変更前の項目が含まれる
+        self.mock_table.update_item.side_effect = ClientError(
+            {
+                "Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"},
+                "Item": {
+                    "task_id": {"S": "test-task-id"},
+                    "user_id": {"S": "test-user-id"},
+                    "title": {"S": "テストタスク"},
+                    "status": {"S": TaskStatus.NOT_STARTED.value},
+                    "created_at": {"S": datetime(2023, 1, 1).isoformat()},
+                },
+            },
+            "UpdateItem"
+        )
+        
+        # テスト実行
+        result = self.repository.update_fields(
+            "test-task-id", "test-user-id", {"status": TaskStatus.COMPLETED}
+        )
+        
+        # 検証（タスクの更新と集計の移動を1つのトランザクションで行う）
+        self.mock_table.get_item.assert_not_called()
+        update, summary = self._transact_items()
+        self.assertEqual(
+            update["Update"]["ExpressionAttributeValues"][":expected_status"], TaskStatus.NOT_STARTED.value
+        )
+        self.assertEqual(
+            summary["Update"]["UpdateExpression"], "ADD #c0 :c0, #c1 :c1, #revision :revision_increment"
+        )
+        self.assertEqual(
+            summary["Update"]["ExpressionAttributeNames"],
+            {"#c0": "not_started", "#c1": "completed", "#revision": "revision"}
+        )
+        self.assertEqual(summary["Update"]["ExpressionAttributeValues"], {":c0": -1, ":c1": 1, ":revision_increment": 1})
+        self.assertEqual(result.status, TaskStatus.COMPLETED)
+        self.assertEqual(result.title, "テストタスク")
+        # 版のない項目は0として1つ進める
+        self.assertEqual(update["Update"]["UpdateExpression"].split(" ADD ")[1], "#version :version_increment")
+        self.assertEqual(result.version, 1)
+    
+    def test_update_with_expected_version(self):
+        # update_itemのモック設定
+        self.mock_table.update_item.return_value = {"Attributes": {**self.test_task_dict, "version": 3}}
+        
+        # テスト実行
+        result = self.repository.update_fields("test-task-id", "test-user-id", {"title": "新しいタイトル"}, 2)
+        
+        # 検証（版の一致を条件とし、読み込みは行わない）
+        kwargs = self.mock_table.update_item.call_args.kwargs
+        self.assertTrue(kwargs["ConditionExpression"].endswith(" AND #version = :expected_version"))
+        self.assertEqual(kwargs["ExpressionAttributeValues"][":expected_version"], 2)
+        self.mock_table.get_item.assert_not_called()
+        self.assertEqual(result.version, 3)
+    
+    def test_update_with_expected_version_of_unversioned_item(self):
+        # 版の導入前の項目（版0）は属性がないことを条件とする
+        self.mock_table.update_item.return_value = {"Attributes": {**self.test_task_dict, "version": 1}}
+        
+        # テスト実行
+        self.repository.update_fields("test-task-id", "test-user-id", {"title": "新しいタイトル"}, 0)
+        
+        # 検証
+        kwargs = self.mock_table.update_item.call_args.kwargs
+        self.assertTrue(kwargs["ConditionExpression"].endswith(" AND attribute_not_exists(#version)"))
+        self.assertNotIn(":expected_version", kwargs["ExpressionAttributeValues"])
+    
+    def test_update_version_conflict(self):
+        # 条件を満たさなかった項目の版が異なる場合は競合とする
+        self.mock_table.update_item.side_effect = ClientError(
+            {
+                "Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"},
+                "Item": {
+                    "task_id": {"S": "test-task-id"},
+                    "user_id": {"S": "test-user-id"},
+                    "status": {"S": TaskStatus.NOT_STARTED.value},
+                    "version": {"N": "3"},
+                },
+            },
+            "UpdateItem"
+        )
+        
+        # テスト実行・検証
+        with self.assertRaises(TaskConflictError):
+            self.repository.update_fields("test-task-id", "test-user-id", {"title": "新しいタイトル"}, 2)
+        self.mock_table.get_item.assert_not_called()
+        self.mock_transact_write_items.assert_not_called()
+    
+    @patch("time.sleep")
+    def test_update_fields_retries_when_status_changed_concurrently(self, mock_sleep):
+        # トランザクションの条件が満たされなかった場合は読み込み直して再試行する
+        self.mock_table.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}}, "UpdateItem"
+        )
+        self.mock_table.get_item.side_effect = [
+            {"Item": dict(self.test_task_dict, status=TaskStatus.NOT_STARTED.value)},
+            {"Item": dict(self.test_task_dict, status=TaskStatus.IN_PROGRESS.value)},
+        ]
+        self.mock_transact_write_items.side_effect = [
+            ClientError(
+                {
+                    "Error": {"Code": "TransactionCanceledException", "Message": "cancelled"},
+                    "CancellationReasons": [{"Code": "ConditionalCheckFailed"}, {"Code": "None"}],
+                },
+                "TransactWriteItems"
+            ),
+            {},
+        ]
+        
+        # テスト実行
+        self.repository.update_fields("test-task-id", "test-user-id", {"status": TaskStatus.COMPLETED})
+        
+        # 検証
+        self.assertEqual(self.mock_transact_write_items.call_count, 2)
+        summary = self._transact_items()[1]
+        self.assertEqual(
+            summary["Update"]["ExpressionAttributeNames"],
+            {"#c0": "in_progress", "#c1": "completed", "#revision": "revision"}
+        )
+    
+    def test_update_fields_rejects_unknown_fields(self):
+        # 更新できない属性はエラー
+        with self.assertRaises(ValueError):
+            self.repository.update_fields("test-task-id", "test-user-id", {"user_id": "other-user-id"})
+        self.mock_table.update_item.assert_not_called()
+    
     def test_find_by_id(self):
         # get_itemのモック設定
         self.mock_table.get_item.return_value = {"Item": self.test_task_dict}
@@ -72,6 +267,52 @@ class TestDynamoDBTaskRepository(unittest.TestCase):
         self.assertEqual(result.task_id, self.test_task.task_id)
         self.assertEqual(result.title, self.test_task.title)
     
+    def test_find_by_id_records_consumed_capacity_while_tracing(self):
+        # get_itemのモック設定（消費キャパシティ付き）
+        self.mock_table.get_item.return_value = {
+            "Item": self.test_task_dict,
+            "ConsumedCapacity": {"TableName": "Tasks", "CapacityUnits": 0.5}
+        }
+        exporter = tracing.InMemoryTraceExporter()
+        tracing.configure(exporter)
+        self.addCleanup(tracing.configure, None)
+
+        # テスト実行
+        with tracing.start_trace("GET /tasks/{taskId}"):
+            self.repository.find_by_id("test-task-id", "test-user-id")
+
+        # 検証
+        self.mock_table.get_item.assert_called_once_with(
+            ReturnConsumedCapacity='TOTAL',
+            Key={
+                'task_id': "test-task-id",
+                'user_id': "test-user-id"
+            }
+        )
+        record = exporter.records[0]
+        self.assertEqual(record.consumed_capacity, 0.5)
+        self.assertEqual(record.spans[0].name, "dynamodb.get_item")
+        self.assertEqual(record.spans[0].attributes, {"consumed_capacity": 0.5})
+
+    def test_transaction_records_consumed_capacity_while_tracing(self):
+        # transact_write_itemsのモック設定（テーブルごとの消費キャパシティのリスト）
+        self.mock_transact_write_items.return_value = {
+            "ConsumedCapacity": [{"TableName": "Tasks", "CapacityUnits": 2.0}]
+        }
+        exporter = tracing.InMemoryTraceExporter()
+        tracing.configure(exporter)
+        self.addCleanup(tracing.configure, None)
+
+        # テスト実行
+        with tracing.start_trace("POST /tasks/batch"):
+            self.repository.save_many([Task(title=f"タスク{i}", user_id="test-user-id") for i in range(150)])
+
+        # 検証
+        self.assertEqual(exporter.records[0].consumed_capacity, 4.0)
+        self.assertEqual(
+            [s.name for s in exporter.records[0].spans], ["dynamodb.transact_write_items"] * 2
+        )
+
     def test_find_by_id_not_found(self):
         # get_itemのモック設定（アイテムなし）
         self.mock_table.get_item.return_value = {}
@@ -96,33 +337,536 @@ class TestDynamoDBTaskRepository(unittest.TestCase):
         self.assertEqual(result[0].task_id, self.test_task.task_id)
         self.assertEqual(result[0].title, self.test_task.title)
     
-    def test_delete(self):
-        # delete_itemのモック設定
-        self.mock_table.delete_item.return_value = {"Attributes": self.test_task_dict}
+    def test_find_all_by_user_id_follows_last_evaluated_key(self):
+        # queryのモック設定（2ページ）
+        self.mock_table.query.side_effect = [
+            {"Items": [self.test_task_dict], "LastEvaluatedKey": {"task_id": "test-task-id", "user_id": "test-user-id"}},
+            {"Items": [self.test_task_dict]},
+        ]
         
         # テスト実行
-        result = self.repository.delete("test-task-id", "test-user-id")
+        result = self.repository.find_all_by_user_id("test-user-id")
         
         # 検証
-        self.mock_table.delete_item.assert_called_once_with(
-            Key={
-                'task_id': "test-task-id",
-                'user_id': "test-user-id"
+        self.assertEqual(self.mock_table.query.call_count, 2)
+        self.assertEqual(
+            self.mock_table.query.call_args.kwargs["ExclusiveStartKey"],
+            {"task_id": "test-task-id", "user_id": "test-user-id"}
+        )
+        self.assertEqual(len(result), 2)
+    
+    def test_iter_by_user_id_is_lazy(self):
+        # queryのモック設定
+        self.mock_table.query.return_value = {"Items": [self.test_task_dict]}
+        
+        # テスト実行（イテレーションまでqueryは呼ばれない）
+        tasks = self.repository.iter_by_user_id("test-user-id", page_size=10)
+        self.mock_table.query.assert_not_called()
+        
+        # 検証
+        self.assertEqual(next(tasks).task_id, self.test_task.task_id)
+        self.assertEqual(self.mock_table.query.call_args.kwargs["Limit"], 10)
+    
+    def test_find_page_by_user_id(self):
+        # 1ページ目の取得
+        last_key = {"task_id": "test-task-id", "user_id": "test-user-id"}
+        self.mock_table.query.return_value = {"Items": [self.test_task_dict], "LastEvaluatedKey": last_key}
+        
+        page = self.repository.find_page_by_user_id("test-user-id", 1)
+        
+        self.assertEqual(len(page.tasks), 1)
+        self.assertIsNotNone(page.next_token)
+        
+        # 2ページ目の取得（トークンがExclusiveStartKeyに復元される）
+        self.mock_table.query.return_value = {"Items": []}
+        
+        page = self.repository.find_page_by_user_id("test-user-id", 1, page.next_token)
+        
+        self.assertEqual(self.mock_table.query.call_args.kwargs["ExclusiveStartKey"], last_key)
+        self.assertIsNone(page.next_token)
+    
+    def test_find_page_by_user_id_skips_tombstones(self):
+        # 墓標がLimitの件数を消費した場合は、残りの件数で続きを読み込む
+        first_key = {"task_id": "deleted-task-id", "user_id": "test-user-id"}
+        last_key = {"task_id": "test-task-id", "user_id": "test-user-id"}
+        self.mock_table.query.side_effect = [
+            {"Items": [], "LastEvaluatedKey": first_key},
+            {"Items": [self.test_task_dict, self.test_task_dict], "LastEvaluatedKey": last_key},
+        ]
+        
+        # テスト実行
+        page = self.repository.find_page_by_user_id("test-user-id", 2)
+        
+        # 検証（1回目は墓標のみで0件、2回目で残りの件数を読み込み、最後に読み込んだキーを次のページに使う）
+        self.assertEqual(len(page.tasks), 2)
+        self.assertEqual([call.kwargs["Limit"] for call in self.mock_table.query.call_args_list], [2, 2])
+        self.assertEqual(self.mock_table.query.call_args_list[1].kwargs["ExclusiveStartKey"], first_key)
+        self.assertEqual(self.repository._decode_next_token(page.next_token, "test-user-id"), last_key)
+    
+    def test_find_page_by_user_id_fills_limit(self):
+        # フィルターで除外された分だけ、残りの件数をLimitにして読み込む
+        other_task_dict = dict(self.test_task_dict, task_id="other-task-id")
+        self.mock_table.query.side_effect = [
+            {"Items": [self.test_task_dict], "LastEvaluatedKey": {"task_id": "a", "user_id": "test-user-id"}},
+            {"Items": [other_task_dict]},
+        ]
+        
+        # テスト実行
+        page = self.repository.find_page_by_user_id("test-user-id", 3)
+        
+        # 検証（最後の項目に達した場合は次のページなし）
+        self.assertEqual([task.task_id for task in page.tasks], ["test-task-id", "other-task-id"])
+        self.assertEqual([call.kwargs["Limit"] for call in self.mock_table.query.call_args_list], [3, 2])
+        self.assertIsNone(page.next_token)
+    
+    def test_find_item_page_by_user_id(self):
+        # エンティティを構築せず、公開する属性だけを射影して返す
+        self.mock_table.query.return_value = {"Items": [self.test_task_dict]}
+        
+        page = self.repository.find_item_page_by_user_id("test-user-id", 10)
+        
+        kwargs = self.mock_table.query.call_args.kwargs
+        self.assertEqual(kwargs["IndexName"], "UserIdIndex")
+        self.assertIn("#status", kwargs["ProjectionExpression"])
+        self.assertEqual(kwargs["ExpressionAttributeNames"]["#status"], "status")
+        self.assertEqual(page.items, [self.test_task_dict])
+        self.assertIsNone(page.next_token)
+    
+    def test_find_page_by_user_id_rejects_foreign_token(self):
+        # 他のユーザーのトークンはエラー
+        self.mock_table.query.return_value = {
+            "Items": [dict(self.test_task_dict, user_id="other-user-id")],
+            "LastEvaluatedKey": {"task_id": "test-task-id", "user_id": "other-user-id"}
+        }
+        page = self.repository.find_page_by_user_id("other-user-id", 1)
+        
+        with self.assertRaises(ValueError):
+            self.repository.find_page_by_user_id("test-user-id", 1, page.next_token)
+        with self.assertRaises(ValueError):
+            self.repository.find_page_by_user_id("test-user-id", 1, "not-a-token")
+    
+    def test_find_by_user_and_status(self):
+        # queryのモック設定
+        self.mock_table.query.return_value = {"Items": [self.test_task_dict]}
+        
+        # テスト実行
+        page = self.repository.find_by_user_and_status(
+            "test-user-id", TaskStatus.NOT_STARTED, 10,
+            due_after=datetime(2023, 12, 1), descending=True
+        )
+        
+        # 検証（キー条件でステータスと期限の範囲を絞り込む）
+        kwargs = self.mock_table.query.call_args.kwargs
+        self.assertEqual(kwargs["IndexName"], "UserStatusIndex")
+        self.assertFalse(kwargs["ScanIndexForward"])
+        self.assertNotIn("FilterExpression", kwargs)
+        key_values = kwargs["KeyConditionExpression"].get_expression()["values"]
+        self.assertEqual(key_values[0].get_expression()["values"][1], f"test-user-id#{TaskStatus.NOT_STARTED.value}")
+        self.assertEqual(
+            key_values[1].get_expression()["values"][1:],
+            (datetime(2023, 12, 1).isoformat(), datetime.max.isoformat())
+        )
+        self.assertEqual(page.items, [self.test_task_dict])
+        self.assertIsNone(page.next_token)
+    
+    def test_find_due_between(self):
+        # queryのモック設定（次のページあり）
+        last_key = {"task_id": "test-task-id", "user_id": "test-user-id", "due_sort": "2023-12-31T00:00:00"}
+        self.mock_table.query.return_value = {"Items": [self.test_task_dict], "LastEvaluatedKey": last_key}
+        
+        # テスト実行
+        page = self.repository.find_due_between(
+            "test-user-id", datetime(2023, 12, 1), datetime(2024, 1, 1), 1
+        )
+        
+        # 検証
+        kwargs = self.mock_table.query.call_args.kwargs
+        self.assertEqual(kwargs["IndexName"], "UserDueDateIndex")
+        self.assertTrue(kwargs["ScanIndexForward"])
+        self.assertEqual(kwargs["Limit"], 1)
+        self.assertIsNotNone(page.next_token)
+        
+        # 次のページ
+        self.mock_table.query.return_value = {"Items": []}
+        self.repository.find_due_between("test-user-id", None, None, 1, page.next_token)
+        kwargs = self.mock_table.query.call_args.kwargs
+        self.assertEqual(kwargs["ExclusiveStartKey"], last_key)
+        self.assertEqual(kwargs["KeyConditionExpression"].get_expression()["operator"], "=")
+    
+    def test_save_many_splits_into_transactions(self):
+        # タスクと集計の操作が100件以内になるように分割する
+        tasks = [Task(title=f"タスク{i}", user_id="test-user-id") for i in range(150)]
+        
+        # テスト実行
+        result = self.repository.save_many(tasks)
+        
+        # 検証
+        self.assertEqual(self.mock_transact_write_items.call_count, 2)
+        first, second = self._transact_items(0), self._transact_items(1)
+        self.assertEqual(len(first), 100)
+        self.assertEqual(first[-1]["Update"]["ExpressionAttributeValues"][":c0"], 99)
+        self.assertEqual(second[-1]["Update"]["ExpressionAttributeValues"][":c0"], 51)
+        self.assertEqual(len(result), 150)
+    
+    def test_save_many_adds_summary_per_user(self):
+        # ユーザーごとに集計の操作を1つずつ含める
+        tasks = [
+            Task(title="タスク1", user_id="user-a"),
+            Task(title="タスク2", user_id="user-b", status=TaskStatus.COMPLETED),
+            Task(title="タスク3", user_id="user-a"),
+        ]
+        
+        # テスト実行
+        self.repository.save_many(tasks)
+        
+        # 検証
+        summaries = [item["Update"] for item in self._transact_items() if "Update" in item]
+        self.assertEqual(
+            [(u["Key"]["user_id"], u["ExpressionAttributeValues"][":c0"]) for u in summaries],
+            [("user-a", 2), ("user-b", 1)]
+        )
+    
+    @patch("time.sleep")
+    def test_transaction_conflict_is_retried(self, mock_sleep):
+        # 他のトランザクションとの競合は指数バックオフで再試行される
+        conflict = ClientError(
+            {
+                "Error": {"Code": "TransactionCanceledException", "Message": "cancelled"},
+                "CancellationReasons": [{"Code": "None"}, {"Code": "TransactionConflict"}],
             },
-            ReturnValues='ALL_OLD'
+            "TransactWriteItems"
         )
+        self.mock_transact_write_items.side_effect = [conflict, conflict, {}]
+        
+        # テスト実行
+        self.repository.save(self.test_task)
+        
+        # 検証
+        self.assertEqual(self.mock_transact_write_items.call_count, 3)
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [0.05, 0.1])
+    
+    @patch("time.sleep")
+    def test_find_many(self, mock_sleep):
+        # 未処理のキーを再試行し、要求された順序で返す
+        other_task_dict = dict(self.test_task_dict, task_id="other-task-id")
+        self.mock_dynamodb.batch_get_item.side_effect = [
+            {
+                "Responses": {"Tasks": [other_task_dict]},
+                "UnprocessedKeys": {"Tasks": {"Keys": [{"task_id": "test-task-id", "user_id": "test-user-id"}]}},
+            },
+            {"Responses": {"Tasks": [self.test_task_dict]}, "UnprocessedKeys": {}},
+        ]
+        
+        # テスト実行
+        result = self.repository.find_many(["test-task-id", "other-task-id", "missing-id"], "test-user-id")
+        
+        # 検証
+        self.assertEqual(self.mock_dynamodb.batch_get_item.call_count, 2)
+        self.assertEqual([task.task_id for task in result], ["test-task-id", "other-task-id"])
+    
+    def test_delete_many(self):
+        # 存在するタスクのみ墓標で置き換え、ステータスごとの件数を減算する
+        completed_task_dict = dict(self.test_task_dict, task_id="completed-task-id", status=TaskStatus.COMPLETED.value)
+        self.mock_dynamodb.batch_get_item.return_value = {
+            "Responses": {"Tasks": [self.test_task_dict, completed_task_dict]}, "UnprocessedKeys": {}
+        }
+        
+        # テスト実行
+        result = self.repository.delete_many(
+            ["test-task-id", "test-task-id", "completed-task-id", "missing-id"], "test-user-id"
+        )
+        
+        # 検証（重複したIDは1回だけ、存在しないIDは数えない）
+        *tombstones, summary = self._transact_items()
+        self.assertEqual([t["Put"]["Item"]["task_id"] for t in tombstones], ["test-task-id", "completed-task-id"])
+        self.assertTrue(all(t["Put"]["Item"]["deleted"] for t in tombstones))
+        self.assertEqual(
+            summary["Update"]["ExpressionAttributeNames"],
+            {"#c0": "not_started", "#c1": "completed", "#revision": "revision"}
+        )
+        self.assertEqual(summary["Update"]["ExpressionAttributeValues"], {":c0": -1, ":c1": -1, ":revision_increment": 1})
+        self.assertEqual(result, 2)
+    
+    def test_delete(self):
+        # get_itemのモック設定（現在のステータスを取得する）
+        self.mock_table.get_item.return_value = {"Item": self.test_task_dict}
+        
+        # テスト実行
+        result = self.repository.delete("test-task-id", "test-user-id")
+        
+        # 検証（項目は墓標で置き換えられ、TTLで削除される。集計は同じトランザクションで減算する）
+        self.assertTrue(self.mock_table.get_item.call_args.kwargs["ConsistentRead"])
+        put, summary = self._transact_items()
+        item = put["Put"]["Item"]
+        self.assertEqual(item["task_id"], "test-task-id")
+        self.assertEqual(item["user_id"], "test-user-id")
+        self.assertTrue(item["deleted"])
+        self.assertIn("updated_at", item)
+        self.assertGreater(item["expires_at"], 0)
+        self.assertNotIn("title", item)
+        self.assertEqual(put["Put"]["ExpressionAttributeValues"], {":status": TaskStatus.NOT_STARTED.value})
+        self.assertEqual(summary["Update"]["ExpressionAttributeValues"], {":c0": -1, ":revision_increment": 1})
         self.assertTrue(result)
     
     def test_delete_not_found(self):
-        # delete_itemのモック設定（アイテムなし）
-        self.mock_table.delete_item.return_value = {}
+        # 存在しない・削除済みのタスクは書き込まない
+        self.mock_table.get_item.return_value = {
+            "Item": {"task_id": "test-task-id", "user_id": "test-user-id", "deleted": True}
+        }
         
         # テスト実行
         result = self.repository.delete("test-task-id", "test-user-id")
         
         # 検証
-        self.mock_table.delete_item.assert_called_once()
+        self.mock_transact_write_items.assert_not_called()
         self.assertFalse(result)
+    
+    def test_get_summary(self):
+        # get_itemのモック設定（集計項目）
+        self.mock_table.get_item.return_value = {
+            "Item": {"user_id": "test-user-id", "not_started": 3, "completed": 2}
+        }
+        
+        # テスト実行
+        summary = self.repository.get_summary("test-user-id")
+        
+        # 検証
+        self.mock_dynamodb.Table.assert_any_call("TaskSummaries")
+        self.mock_table.get_item.assert_called_once_with(Key={"user_id": "test-user-id"})
+        self.assertEqual(summary.counts[TaskStatus.NOT_STARTED], 3)
+        self.assertEqual(summary.counts[TaskStatus.IN_PROGRESS], 0)
+        self.assertEqual(summary.total, 5)
+    
+    def test_get_summary_clamps_negative_counts(self):
+        # 集計の導入前のタスクの削除で負になった件数は0として返す
+        self.mock_table.get_item.return_value = {
+            "Item": {"user_id": "test-user-id", "not_started": -2, "completed": 1}
+        }
+        
+        # テスト実行
+        summary = self.repository.get_summary("test-user-id")
+        
+        # 検証
+        self.assertEqual(summary.counts[TaskStatus.NOT_STARTED], 0)
+        self.assertEqual(summary.total, 1)
+    
+    def test_rebuild_summary(self):
+        # ユーザーのタスクをステータスごとに数え直し、読み込んだ改訂番号を条件に書き込む
+        self.mock_table.get_item.return_value = {"Item": {"user_id": "test-user-id", "not_started": 9, "revision": 4}}
+        self.mock_table.query.side_effect = [
+            {"Items": [{"status": "未着手"}, {"status": "完了"}], "LastEvaluatedKey": {"task_id": "x"}},
+            {"Items": [{"status": "未着手"}, {"status": "進行中"}]},
+        ]
+        
+        # テスト実行
+        summary = self.repository.rebuild_summary("test-user-id")
+        
+        # 検証
+        self.assertTrue(self.mock_table.get_item.call_args.kwargs["ConsistentRead"])
+        query_kwargs = self.mock_table.query.call_args_list[0].kwargs
+        self.assertEqual(query_kwargs["IndexName"], "UserIdIndex")
+        self.assertEqual(query_kwargs["ProjectionExpression"], "#status")
+        put_kwargs = self.mock_table.put_item.call_args.kwargs
+        self.assertEqual(
+            put_kwargs["Item"],
+            {"user_id": "test-user-id", "not_started": 2, "in_progress": 1, "completed": 1, "revision": 5}
+        )
+        self.assertEqual(put_kwargs["ConditionExpression"], Attr("revision").eq(4))
+        self.assertEqual(summary.total, 4)
+    
+    @patch("time.sleep")
+    def test_rebuild_summary_recounts_after_concurrent_change(self, mock_sleep):
+        # 数える間に加減算があった場合は、上書きせずに数え直す
+        self.mock_table.get_item.side_effect = [
+            {},
+            {"Item": {"user_id": "test-user-id", "not_started": 1, "revision": 1}},
+        ]
+        self.mock_table.query.side_effect = [
+            {"Items": []},
+            {"Items": [{"status": "未着手"}]},
+        ]
+        self.mock_table.put_item.side_effect = [
+            ClientError({"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}}, "PutItem"),
+            {},
+        ]
+        
+        # テスト実行
+        summary = self.repository.rebuild_summary("test-user-id")
+        
+        # 検証
+        first, second = [call.kwargs for call in self.mock_table.put_item.call_args_list]
+        self.assertEqual(first["ConditionExpression"], Attr("revision").not_exists())
+        self.assertEqual(second["ConditionExpression"], Attr("revision").eq(1))
+        self.assertEqual(second["Item"]["revision"], 2)
+        self.assertEqual(summary.total, 1)
+    
+    def test_find_by_id_ignores_tombstone(self):
+        # get_itemのモック設定（削除済み）
+        self.mock_table.get_item.return_value = {
+            "Item": {"task_id": "test-task-id", "user_id": "test-user-id", "deleted": True}
+        }
+        
+        # テスト実行・検証
+        self.assertIsNone(self.repository.find_by_id("test-task-id", "test-user-id"))
+    
+    def test_find_changes_since(self):
+        # 変更と削除が混在するページ
+        tombstone = {
+            "task_id": "deleted-task-id",
+            "user_id": "test-user-id",
+            "deleted": True,
+            "updated_at": "2023-01-03T00:00:00"
+        }
+        last_key = {"task_id": "deleted-task-id", "user_id": "test-user-id", "updated_at": "2023-01-03T00:00:00"}
+        self.mock_table.query.return_value = {
+            "Items": [self.test_task_dict, tombstone], "LastEvaluatedKey": last_key
+        }
+        
+        # テスト実行
+        page = self.repository.find_changes_since("test-user-id", datetime(2022, 12, 31), 10)
+        
+        # 検証
+        query_kwargs = self.mock_table.query.call_args.kwargs
+        self.assertEqual(query_kwargs["IndexName"], "UserIdUpdatedAtIndex")
+        self.assertEqual(query_kwargs["Limit"], 10)
+        # sinceと同じ時刻の変更も含める
+        updated_at_condition = query_kwargs["KeyConditionExpression"].get_expression()["values"][1]
+        self.assertEqual(updated_at_condition.get_expression()["operator"], ">=")
+        self.assertEqual(page.items, [self.test_task_dict])
+        self.assertEqual(page.deleted_task_ids, ["deleted-task-id"])
+        self.assertEqual(page.last_updated_at, "2023-01-03T00:00:00")
+        self.assertIsNotNone(page.next_token)
+        
+        # 次のページ
+        self.mock_table.query.return_value = {"Items": []}
+        page = self.repository.find_changes_since(
+            "test-user-id", datetime(2022, 12, 31), 10, page.next_token
+        )
+        self.assertEqual(self.mock_table.query.call_args.kwargs["ExclusiveStartKey"], last_key)
+        self.assertIsNone(page.last_updated_at)
+
+    def test_scan_items(self):
+        # scanのモック設定
+        last_key = {"task_id": "test-task-id", "user_id": "test-user-id"}
+        self.mock_table.scan.return_value = {"Items": [self.test_task_dict], "LastEvaluatedKey": last_key}
+        
+        # テスト実行
+        items, next_key = self.repository.scan_items(1, 4, 100, {"task_id": "a", "user_id": "b"})
+        
+        # 検証
+        scan_kwargs = self.mock_table.scan.call_args.kwargs
+        self.assertEqual(scan_kwargs["Segment"], 1)
+        self.assertEqual(scan_kwargs["TotalSegments"], 4)
+        self.assertEqual(scan_kwargs["Limit"], 100)
+        self.assertEqual(scan_kwargs["ExclusiveStartKey"], {"task_id": "a", "user_id": "b"})
+        self.assertIn("FilterExpression", scan_kwargs)
+        self.assertEqual(items, [self.test_task_dict])
+        self.assertEqual(next_key, last_key)
+
+
+    @patch('boto3.client')
+    def test_client_mode_uses_low_level_client(self, mock_boto3_client):
+        # DYNAMODB_CLIENT_MODE=client では低レベルのクライアントを使用する
+        with patch.dict(os.environ, {"DYNAMODB_CLIENT_MODE": "client"}):
+            repository = DynamoDBTaskRepository()
+        
+        # 検証
+        self.assertIsInstance(repository._dynamodb, DynamoDBClientResource)
+        self.assertEqual(mock_boto3_client.call_args.args, ("dynamodb",))
+        self.assertIn("config", mock_boto3_client.call_args.kwargs)
+    
+    def test_build_client_config_from_environment(self):
+        # 環境変数からプール・再試行・タイムアウトを設定する
+        with patch.dict(os.environ, {
+            "DYNAMODB_MAX_POOL_CONNECTIONS": "32",
+            "DYNAMODB_TCP_KEEPALIVE": "false",
+            "DYNAMODB_RETRY_MODE": "standard",
+            "DYNAMODB_MAX_ATTEMPTS": "5",
+            "DYNAMODB_CONNECT_TIMEOUT": "0.5",
+            "DYNAMODB_READ_TIMEOUT": "2",
+        }):
+            config = build_client_config()
+        
+        # 検証
+        self.assertEqual(config.max_pool_connections, 32)
+        self.assertFalse(config.tcp_keepalive)
+        self.assertEqual(config.retries, {"mode": "standard", "max_attempts": 5})
+        self.assertEqual(config.connect_timeout, 0.5)
+        self.assertEqual(config.read_timeout, 2.0)
+        
+        # 既定値はadaptiveモード・キープアライブ有効
+        with patch.dict(os.environ, {}, clear=True):
+            config = build_client_config()
+        self.assertEqual(config.retries["mode"], "adaptive")
+        self.assertTrue(config.tcp_keepalive)
+
+    @patch('boto3.resource')
+    def test_user_key_layout_lists_from_base_table(self, mock_boto3_resource):
+        # TASK_TABLE_KEY_LAYOUT=user ではGSIを使わず、テーブルを強い整合性でクエリする
+        mock_boto3_resource.return_value = self.mock_dynamodb
+        with patch.dict(os.environ, {"TASK_TABLE_KEY_LAYOUT": "user"}):
+            repository = DynamoDBTaskRepository()
+        self.mock_table.query.return_value = {"Items": [self.test_task_dict]}
+        
+        # テスト実行
+        page = repository.find_item_page_by_user_id("test-user-id", 10)
+        list(repository.iter_by_user_id("test-user-id"))
+        
+        # 検証
+        for call in self.mock_table.query.call_args_list:
+            self.assertNotIn("IndexName", call.kwargs)
+            self.assertTrue(call.kwargs["ConsistentRead"])
+        self.assertEqual(len(page.items), 1)
+    
+    @patch('boto3.resource')
+    def test_user_key_layout_shares_summary_table(self, mock_boto3_resource):
+        # 集計テーブルのキーはキーの構成によらずuser_idのみ
+        mock_boto3_resource.return_value = self.mock_dynamodb
+        with patch.dict(os.environ, {"TASK_TABLE_KEY_LAYOUT": "user", "TASK_SUMMARY_TABLE_NAME": "TaskSummaries-dev"}):
+            repository = DynamoDBTaskRepository()
+        
+        # テスト実行
+        repository.save(self.test_task)
+        
+        # 検証
+        summary = self._transact_items()[1]
+        self.assertEqual(summary["Update"]["TableName"], "TaskSummaries-dev")
+        self.assertEqual(summary["Update"]["Key"], {"user_id": "test-user-id"})
+    
+    @patch('boto3.resource')
+    def test_find_created_after_uses_task_id_range(self, mock_boto3_resource):
+        # user構成ではUUIDv7のタスクIDの下限をキー条件にして新しい順に取得する
+        mock_boto3_resource.return_value = self.mock_dynamodb
+        with patch.dict(os.environ, {"TASK_TABLE_KEY_LAYOUT": "user"}):
+            repository = DynamoDBTaskRepository()
+        self.mock_table.query.return_value = {"Items": [self.test_task_dict]}
+        
+        # テスト実行
+        page = repository.find_created_after("test-user-id", datetime(2024, 5, 1), 10, descending=True)
+        
+        # 検証
+        kwargs = self.mock_table.query.call_args.kwargs
+        self.assertNotIn("IndexName", kwargs)
+        self.assertTrue(kwargs["ConsistentRead"])
+        self.assertFalse(kwargs["ScanIndexForward"])
+        task_id_condition = kwargs["KeyConditionExpression"].get_expression()["values"][1]
+        self.assertEqual(task_id_condition.get_expression()["operator"], ">=")
+        self.assertEqual(task_id_condition.get_expression()["values"][1], min_task_id_at(datetime(2024, 5, 1)))
+        self.assertIn("FilterExpression", kwargs)
+        self.assertEqual(len(page.items), 1)
+    
+    def test_find_created_after_requires_user_key_layout(self):
+        # task構成ではタスクIDの順に取得できない
+        with self.assertRaises(ValueError):
+            self.repository.find_created_after("test-user-id", None, 10)
+        self.mock_table.query.assert_not_called()
+    
+    @patch('boto3.resource')
+    def test_unsupported_key_layout(self, mock_boto3_resource):
+        # 未対応のキーの構成はエラー
+        with patch.dict(os.environ, {"TASK_TABLE_KEY_LAYOUT": "other"}):
+            with self.assertRaises(ValueError):
+                DynamoDBTaskRepository()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,232 @@
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+from backend.domain.value_objects.task_status import TaskStatus
+from backend.infrastructure.persistence.task_export import (
+    ExportOptions, SegmentExportProgress, TaskExport, export_segment
+)
+
+
+def _item(task_id, title="テストタスク"):
+    return {
+        "task_id": task_id,
+        "title": title,
+        "description": None,
+        "status": TaskStatus.NOT_STARTED.value,
+        "due_date": "2023-12-31T00:00:00",
+        "user_id": "test-user-id",
+        "created_at": "2023-01-01T00:00:00",
+        "updated_at": "2023-01-02T00:00:00",
+    }
+
+
+class TestTaskExport(unittest.TestCase):
+    def setUp(self):
+        # セグメントごとのScanの結果（(項目, 次のページの開始キー) のリスト）
+        self.pages = {}
+        self.lock = threading.Lock()
+        self.repository = MagicMock()
+
+        def scan_items(segment, total_segments, limit=None, exclusive_start_key=None):
+            with self.lock:
+                page = self.pages[segment].pop(0)
+            if isinstance(page, Exception):
+                raise page
+            return page
+
+        self.repository.scan_items.side_effect = scan_items
+        patcher = patch(
+            "backend.infrastructure.persistence.task_export.DynamoDBTaskRepository",
+            return_value=self.repository
+        )
+        self.repository_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.output_dir = temp_dir.name
+
+    def _options(self, **kwargs):
+        return ExportOptions(output_dir=self.output_dir, total_segments=2, table_name="Tasks-dev", **kwargs)
+
+    def _read_ndjson(self, name):
+        with open(os.path.join(self.output_dir, name), encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_exports_all_segments_to_ndjson(self):
+        # ページの区切りでファイルを分け、マニフェストにすべてのファイルを書き出す
+        self.pages = {
+            0: [
+                ([_item("task-1"), _item("task-2")], {"task_id": "task-2"}),
+                ([_item("task-3")], None),
+            ],
+            1: [([_item("task-4")], None)],
+        }
+
+        # テスト実行
+        manifest = TaskExport(self._options(rows_per_file=2)).run()
+
+        # 検証
+        self.assertEqual(manifest["rows"], 4)
+        self.assertEqual(manifest["files"], [
+            "tasks-0000-00000.ndjson", "tasks-0000-00001.ndjson", "tasks-0001-00000.ndjson"
+        ])
+        rows = self._read_ndjson("tasks-0000-00000.ndjson")
+        self.assertEqual([row["task_id"] for row in rows], ["task-1", "task-2"])
+        self.assertEqual(rows[0]["title"], "テストタスク")
+        self.assertEqual(rows[0]["due_date"], "2023-12-31T00:00:00")
+        self.assertEqual(manifest["table"], "Tasks-dev")
+        self.assertIsNotNone(manifest["started_at"])
+        self.assertEqual(self.repository_class.call_args.kwargs["table_name"], "Tasks-dev")
+        with open(os.path.join(self.output_dir, "_manifest.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f), manifest)
+        self.assertFalse(any(name.endswith(".partial") for name in os.listdir(self.output_dir)))
+
+    def test_resumes_from_segment_checkpoint(self):
+        # 確定したファイルの次のページから再開し、書き込み中だったファイルは書き直す
+        last_key = {"task_id": "task-1", "user_id": "test-user-id"}
+        throttled = ClientError(
+            {"Error": {"Code": "ProvisionedThroughputExceededException", "Message": "throttled"}}, "Scan"
+        )
+        self.pages = {0: [
+            ([_item("task-1"), _item("task-2")], last_key),
+            ([_item("task-3")], {"task_id": "task-3"}),
+            throttled,
+        ]}
+        options = self._options(rows_per_file=2)
+        with self.assertRaises(ClientError):
+            export_segment(options, 0)
+
+        # テスト実行
+        self.pages[0] = [([_item("task-3")], {"task_id": "task-3"}), ([_item("task-4")], None)]
+        self.repository.scan_items.reset_mock()
+        progress = export_segment(options, 0)
+
+        # 検証
+        self.assertEqual(self.repository.scan_items.call_args_list[0].args[3], last_key)
+        self.assertTrue(progress.done)
+        self.assertEqual(progress.rows, 4)
+        self.assertEqual(progress.files, ["tasks-0000-00000.ndjson", "tasks-0000-00001.ndjson"])
+        self.assertEqual(
+            [row["task_id"] for row in self._read_ndjson("tasks-0000-00001.ndjson")], ["task-3", "task-4"]
+        )
+
+        # 完了したセグメントは読み込まない
+        self.repository.scan_items.reset_mock()
+        export_segment(options, 0)
+        self.repository.scan_items.assert_not_called()
+
+    def test_rejects_checkpoint_of_other_export(self):
+        # 異なる設定のエクスポートのチェックポイントでは再開しない
+        os.makedirs(os.path.join(self.output_dir, "_checkpoints"))
+        with open(os.path.join(self.output_dir, "_checkpoints", "segment-0000.json"), "w", encoding="utf-8") as f:
+            json.dump(SegmentExportProgress(segment=0, output_format="ndjson", total_segments=4).__dict__, f)
+
+        # テスト実行・検証
+        with self.assertRaises(ValueError):
+            export_segment(self._options(), 0)
+
+    def _write_checkpoint(self, segment, **kwargs):
+        os.makedirs(os.path.join(self.output_dir, "_checkpoints"), exist_ok=True)
+        progress = SegmentExportProgress(segment=segment, output_format="ndjson", total_segments=2, **kwargs)
+        path = os.path.join(self.output_dir, "_checkpoints", f"segment-{segment:04d}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(progress.__dict__, f)
+
+    def test_rejects_checkpoint_of_other_table(self):
+        # 別のテーブルのエクスポートのチェックポイントでは再開しない
+        self._write_checkpoint(0, table_name="Tasks-prod", started_at="2024-01-01T00:00:00+00:00")
+
+        # テスト実行・検証
+        with self.assertRaises(ValueError):
+            TaskExport(self._options(), resume=True).run()
+
+    def test_resumes_with_started_at_of_checkpoint(self):
+        # 再開した場合は、チェックポイントの開始時刻を引き継ぐ
+        started_at = "2024-01-01T00:00:00+00:00"
+        self._write_checkpoint(
+            0, table_name="Tasks-dev", started_at=started_at, rows=1, files=["tasks-0000-00000.ndjson"], done=True
+        )
+        self.pages = {1: [([_item("task-2")], None)]}
+
+        # テスト実行
+        manifest = TaskExport(self._options(), resume=True).run()
+
+        # 検証
+        self.assertEqual(manifest["started_at"], started_at)
+        self.assertEqual(manifest["rows"], 2)
+
+    def test_rejects_stale_checkpoints_without_resume(self):
+        # 再開を指定しない場合は、以前のエクスポートのチェックポイントがある出力先には書き出さない
+        self._write_checkpoint(0, table_name="Tasks-dev", started_at="2024-01-01T00:00:00+00:00")
+        self.pages = {0: [([_item("task-1")], None)], 1: [([_item("task-2")], None)]}
+
+        # テスト実行・検証
+        with self.assertRaises(ValueError):
+            TaskExport(self._options()).run()
+        self.repository.scan_items.assert_not_called()
+
+    def test_rejects_completed_export(self):
+        # 完了したエクスポートの出力先は、再開を指定してもマニフェストを書き直さない
+        started_at = "2024-01-01T00:00:00+00:00"
+        for segment in range(2):
+            self._write_checkpoint(segment, table_name="Tasks-dev", started_at=started_at, done=True)
+        manifest_path = os.path.join(self.output_dir, "_manifest.json")
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump({"started_at": started_at, "rows": 0, "files": []}, f)
+
+        # テスト実行・検証
+        for resume in (False, True):
+            with self.subTest(resume=resume), self.assertRaises(ValueError):
+                TaskExport(self._options(), resume=resume).run()
+        with open(manifest_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["started_at"], started_at)
+
+    def test_rejects_resume_without_checkpoints(self):
+        # テスト実行・検証
+        with self.assertRaises(ValueError):
+            TaskExport(self._options(), resume=True).run()
+
+    def test_rejects_checkpoints_of_different_runs(self):
+        # 別の回のエクスポートのチェックポイントが混在する場合は再開しない
+        self._write_checkpoint(0, table_name="Tasks-dev", started_at="2024-01-01T00:00:00+00:00", done=True)
+        self._write_checkpoint(1, table_name="Tasks-dev", started_at="2024-02-01T00:00:00+00:00")
+
+        # テスト実行・検証
+        with self.assertRaises(ValueError):
+            TaskExport(self._options(), resume=True).run()
+
+    def test_rejects_unsupported_format(self):
+        # テスト実行・検証
+        with self.assertRaises(ValueError):
+            TaskExport(self._options(output_format="csv"))
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_exports_parquet_in_row_groups(self):
+        import pyarrow.parquet as pq
+
+        self.pages = {
+            0: [([_item("task-1"), _item("task-2"), _item("task-3")], None)],
+            1: [([], None)],
+        }
+
+        # テスト実行
+        manifest = TaskExport(self._options(output_format="parquet", row_group_size=2)).run()
+
+        # 検証
+        self.assertEqual(manifest["files"], ["tasks-0000-00000.parquet"])
+        parquet_file = pq.ParquetFile(os.path.join(self.output_dir, "tasks-0000-00000.parquet"))
+        self.assertEqual(parquet_file.metadata.num_row_groups, 2)
+        table = parquet_file.read()
+        self.assertEqual(table.column("task_id").to_pylist(), ["task-1", "task-2", "task-3"])
+        self.assertEqual(str(table.schema.field("created_at").type), "timestamp[us]")
+
+
+if __name__ == "__main__":
+    unittest.main()
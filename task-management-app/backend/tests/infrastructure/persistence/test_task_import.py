@@ -0,0 +1,204 @@
+import io
+import json
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+from backend.domain.value_objects.task_status import TaskStatus
+from backend.infrastructure.persistence.task_import import (
+    AdaptiveConcurrency, TaskImporter, is_throttling_error, read_rows, validate_row
+)
+
+
+def _ndjson(rows):
+    return io.StringIO("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+
+
+def _transaction_canceled(reason):
+    return ClientError({
+        "Error": {"Code": "TransactionCanceledException", "Message": "canceled"},
+        "CancellationReasons": [{"Code": reason}],
+    }, "TransactWriteItems")
+
+
+class TestTaskImporter(unittest.TestCase):
+    def setUp(self):
+        self.repository = MagicMock()
+        self.failures = io.StringIO()
+
+    def _importer(self, max_workers=2, **kwargs):
+        return TaskImporter(
+            repository_factory=lambda: self.repository, max_workers=max_workers,
+            default_user_id="test-user-id", failures=self.failures, **kwargs
+        )
+
+    def _failures(self):
+        return [json.loads(line) for line in self.failures.getvalue().splitlines()]
+
+    def test_imports_rows_in_transaction_sized_chunks(self):
+        # 1ユーザーのチャンクは集計の操作の分を空けた99件ずつになる
+        rows = [{"title": f"タスク{i}"} for i in range(250)]
+
+        # テスト実行
+        report = self._importer().run(read_rows(_ndjson(rows), "ndjson"))
+
+        # 検証
+        chunks = [call.args[0] for call in self.repository.save_many.call_args_list]
+        self.assertEqual(sorted(len(chunk) for chunk in chunks), [52, 99, 99])
+        self.assertEqual(report.rows, 250)
+        self.assertEqual(report.imported, 250)
+        self.assertEqual(report.failed, 0)
+        task = chunks[0][0]
+        self.assertEqual(task.user_id, "test-user-id")
+        self.assertEqual(task.status, TaskStatus.NOT_STARTED)
+
+    def test_chunks_leave_room_for_each_users_summary(self):
+        # ユーザーごとに集計の操作が1つずつ加わる
+        rows = [{"title": "タスク", "user_id": f"user-{i % 2}"} for i in range(100)]
+
+        # テスト実行（2人のユーザーを1つのレーンにまとめる）
+        self._importer(max_workers=1).run(read_rows(_ndjson(rows), "ndjson"))
+
+        # 検証
+        chunks = [call.args[0] for call in self.repository.save_many.call_args_list]
+        self.assertEqual(sorted(len(chunk) for chunk in chunks), [2, 98])
+
+    def test_same_user_chunks_are_not_written_concurrently(self):
+        # 同じユーザーのチャンクは同じレーンで順に書き込み、集計項目の更新が競合しない
+        lock = threading.Lock()
+        active = {}
+        max_active = {}
+        max_chunks = [0]
+        writing = [0]
+
+        def save_many(tasks):
+            user_ids = {task.user_id for task in tasks}
+            with lock:
+                writing[0] += 1
+                max_chunks[0] = max(max_chunks[0], writing[0])
+                for user_id in user_ids:
+                    active[user_id] = active.get(user_id, 0) + 1
+                    max_active[user_id] = max(max_active.get(user_id, 0), active[user_id])
+            time.sleep(0.01)
+            with lock:
+                writing[0] -= 1
+                for user_id in user_ids:
+                    active[user_id] -= 1
+            return tasks
+
+        self.repository.save_many.side_effect = save_many
+        rows = [{"title": "タスク", "user_id": f"user-{i % 8}"} for i in range(8 * 99 * 3)]
+
+        # テスト実行
+        report = self._importer(max_workers=4).run(read_rows(_ndjson(rows), "ndjson"))
+
+        # 検証（ユーザーごとの同時の書き込みは1つまでで、レーンの間では並行に書き込む）
+        self.assertEqual(report.imported, len(rows))
+        self.assertEqual(set(max_active.values()), {1})
+        self.assertGreater(max_chunks[0], 1)
+
+    @patch("time.sleep")
+    def test_transaction_conflict_is_retried(self, mock_sleep):
+        # アプリケーションの書き込みとの競合は、同時に書き込む数を減らさずに再試行する
+        self.repository.save_many.side_effect = [_transaction_canceled("TransactionConflict"), None]
+        importer = self._importer()
+
+        # テスト実行
+        report = importer.run(read_rows(_ndjson([{"title": "タスク"}]), "ndjson"))
+
+        # 検証
+        self.assertEqual(self.repository.save_many.call_count, 2)
+        self.assertEqual(report.imported, 1)
+        self.assertEqual(report.throttled, 0)
+        self.assertEqual(importer._concurrency.limit, 2)
+
+    def test_invalid_rows_are_written_to_failures(self):
+        # 検証に失敗した行は書き込まず、行番号と理由を書き出す
+        stream = io.StringIO(
+            '{"title": "タスク"}\n'
+            '{"description": "タイトルなし"}\n'
+            '{"title": "タスク", "status": "保留"}\n'
+            '{"title": "タスク", "due_date": "明日"}\n'
+            'not json\n'
+        )
+
+        # テスト実行
+        report = self._importer().run(read_rows(stream, "ndjson"))
+
+        # 検証
+        self.assertEqual(report.imported, 1)
+        self.assertEqual(report.failed, 4)
+        failures = self._failures()
+        self.assertEqual([failure["line"] for failure in failures], [2, 3, 4, 5])
+        self.assertEqual(failures[0]["error"], "Title is required")
+        self.assertEqual(failures[3]["row"], "not json")
+
+    @patch("time.sleep")
+    def test_throttled_chunk_is_retried_with_reduced_concurrency(self, mock_sleep):
+        # スロットリングされたチャンクは待ってから再試行する
+        self.repository.save_many.side_effect = [_transaction_canceled("ThrottlingError"), None]
+        importer = self._importer()
+
+        # テスト実行
+        report = importer.run(read_rows(_ndjson([{"title": "タスク"}]), "ndjson"))
+
+        # 検証
+        self.assertEqual(self.repository.save_many.call_count, 2)
+        mock_sleep.assert_called_once()
+        self.assertEqual(report.throttled, 1)
+        self.assertEqual(report.imported, 1)
+        self.assertEqual(importer._concurrency.limit, 1)
+
+    def test_failed_chunk_is_written_to_failures(self):
+        # スロットリング以外のエラーはチャンクのすべての行を失敗とする
+        self.repository.save_many.side_effect = _transaction_canceled("ConditionalCheckFailed")
+
+        # テスト実行
+        report = self._importer().run(read_rows(_ndjson([{"title": "タスク1"}, {"title": "タスク2"}]), "ndjson"))
+
+        # 検証
+        self.repository.save_many.assert_called_once()
+        self.assertEqual(report.imported, 0)
+        self.assertEqual(report.failed, 2)
+        self.assertEqual([failure["line"] for failure in self._failures()], [1, 2])
+
+    def test_read_csv_rows(self):
+        # 空の値はNoneとし、行番号はファイルの行に合わせる
+        stream = io.StringIO("title,description,status,due_date\nタスク,,進行中,2024-01-01T09:00:00+09:00\n")
+
+        # テスト実行
+        rows = list(read_rows(stream, "csv"))
+
+        # 検証
+        self.assertEqual(rows[0][0], 2)
+        self.assertIsNone(rows[0][1]["description"])
+        task_dto = validate_row(rows[0][1], "test-user-id")
+        self.assertEqual(task_dto.status, TaskStatus.IN_PROGRESS.value)
+        self.assertEqual(task_dto.due_date, "2024-01-01T00:00:00")
+
+    def test_adaptive_concurrency_recovers_after_successes(self):
+        # スロットリングで半分にし、成功が続くと1つずつ戻す
+        concurrency = AdaptiveConcurrency(4)
+        concurrency.on_throttle()
+        self.assertEqual(concurrency.limit, 2)
+
+        # テスト実行
+        for _ in range(10):
+            concurrency.on_success()
+
+        # 検証
+        self.assertEqual(concurrency.limit, 3)
+
+    def test_is_throttling_error(self):
+        self.assertTrue(is_throttling_error(ClientError(
+            {"Error": {"Code": "ProvisionedThroughputExceededException", "Message": "throttled"}}, "PutItem"
+        )))
+        self.assertTrue(is_throttling_error(_transaction_canceled("ThrottlingError")))
+        self.assertFalse(is_throttling_error(_transaction_canceled("TransactionConflict")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import importlib.util
+import os
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.domain.entities.task import Task
+from backend.domain.value_objects.task_status import TaskStatus
+
+TEMPLATE_PATH = Path(__file__).resolve().parents[4] / "infrastructure" / "template.yaml"
+LISTING_INDEXES = ("UserIdUpdatedAtIndex", "UserStatusIndex", "UserDueDateIndex")
+
+
+def _mock_aws():
+    # moto 5 では mock_aws、4 系では mock_dynamodb
+    import moto
+
+    return moto.mock_aws() if hasattr(moto, "mock_aws") else moto.mock_dynamodb()
+
+
+@unittest.skipUnless(importlib.util.find_spec("moto"), "moto is not installed")
+class TestListingIndexProjection(unittest.TestCase):
+    """GSIから読み込む一覧にもタスクのバージョンが含まれること"""
+
+    def setUp(self):
+        env = patch.dict(os.environ, {
+            "AWS_ACCESS_KEY_ID": "testing",
+            "AWS_SECRET_ACCESS_KEY": "testing",
+            "AWS_DEFAULT_REGION": "ap-northeast-1",
+            "TASK_TABLE_NAME": "Tasks-test",
+            "TASK_SUMMARY_TABLE_NAME": "TaskSummaries-test",
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop("DYNAMODB_ENDPOINT_URL", None)
+        mock = _mock_aws()
+        mock.start()
+        self.addCleanup(mock.stop)
+
+        import boto3
+
+        from backend.infrastructure.persistence.dynamodb_task_repository import DynamoDBTaskRepository
+        from backend.scripts.benchmark_utils import create_task_summary_table, create_task_table
+
+        client = boto3.client("dynamodb")
+        create_task_table(client, "Tasks-test")
+        create_task_summary_table(client, "TaskSummaries-test")
+        self.repository = DynamoDBTaskRepository()
+        self.repository.save(Task(
+            task_id="task-1",
+            title="テストタスク",
+            description="これはテストタスクです",
+            status=TaskStatus.NOT_STARTED,
+            due_date=datetime(2023, 12, 31),
+            user_id="user-1",
+            created_at=datetime(2023, 1, 1),
+            updated_at=datetime(2023, 1, 1)
+        ))
+
+    def test_status_page_includes_version(self):
+        # テスト実行
+        page = self.repository.find_by_user_and_status("user-1", TaskStatus.NOT_STARTED, 10)
+
+        # 検証
+        self.assertEqual(len(page.items), 1)
+        self.assertIn("version", page.items[0])
+
+    def test_due_date_page_includes_version(self):
+        # テスト実行
+        page = self.repository.find_due_between("user-1", None, None, 10)
+
+        # 検証
+        self.assertEqual(len(page.items), 1)
+        self.assertIn("version", page.items[0])
+
+    def test_changes_page_includes_version(self):
+        # テスト実行
+        page = self.repository.find_changes_since("user-1", datetime(2022, 1, 1), 10)
+
+        # 検証
+        self.assertEqual(len(page.items), 1)
+        self.assertIn("version", page.items[0])
+
+
+@unittest.skipUnless(importlib.util.find_spec("yaml"), "PyYAML is not installed")
+class TestTemplateIndexProjection(unittest.TestCase):
+    def _load_template(self):
+        import yaml
+
+        class TemplateLoader(yaml.SafeLoader):
+            pass
+
+        # !Ref や !If などの組み込み関数はタグを無視して値のみ読み込む
+        def construct_tag(loader, _suffix, node):
+            if isinstance(node, yaml.MappingNode):
+                return loader.construct_mapping(node)
+            if isinstance(node, yaml.SequenceNode):
+                return loader.construct_sequence(node)
+            return loader.construct_scalar(node)
+
+        TemplateLoader.add_multi_constructor("!", construct_tag)
+        return yaml.load(TEMPLATE_PATH.read_text(encoding="utf-8"), Loader=TemplateLoader)
+
+    def _index_definitions(self, node):
+        if isinstance(node, dict):
+            if "IndexName" in node and "Projection" in node:
+                yield node
+            for value in node.values():
+                yield from self._index_definitions(value)
+        elif isinstance(node, list):
+            for value in node:
+                yield from self._index_definitions(value)
+
+    def test_listing_indexes_project_version(self):
+        # テスト実行
+        indexes = [
+            index for index in self._index_definitions(self._load_template()["Resources"])
+            if index["IndexName"] in LISTING_INDEXES
+        ]
+
+        # 検証
+        self.assertEqual(len(indexes), 6)
+        for index in indexes:
+            self.assertIn("version", index["Projection"]["NonKeyAttributes"], index["IndexName"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,277 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from backend.infrastructure.persistence.task_table_migration import (
+    MigrationCheckpoint, SegmentProgress, TaskIndexBackfill, TaskSummaryRebuild, TaskTableMigration,
+    index_key_attributes, is_summary_item
+)
+
+
+def _item(task_id, user_id="test-user-id", updated_at="2024-01-01T00:00:00"):
+    return {
+        "task_id": {"S": task_id},
+        "user_id": {"S": user_id},
+        "title": {"S": "テストタスク"},
+        "updated_at": {"S": updated_at},
+    }
+
+
+class TestTaskTableMigration(unittest.TestCase):
+    def setUp(self):
+        # セグメントごとのScanの結果（ページのリスト）
+        self.pages = {}
+        self.lock = threading.Lock()
+        self.client = MagicMock()
+
+        def scan(**kwargs):
+            with self.lock:
+                return self.pages[kwargs["Segment"]].pop(0)
+
+        self.client.scan.side_effect = scan
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.checkpoint_path = os.path.join(temp_dir.name, "checkpoint.json")
+
+    def _migration(self, **kwargs):
+        return TaskTableMigration(
+            self.client, "Tasks", "UserTasks", self.checkpoint_path, total_segments=2, **kwargs
+        )
+
+    def test_copies_all_segments(self):
+        # 各セグメントのページを辿り、すべての項目を条件付きで書き込む
+        self.pages = {
+            0: [
+                {"Items": [_item("task-1")], "LastEvaluatedKey": {"task_id": {"S": "task-1"}}},
+                {"Items": [_item("task-2", "other-user-id")]},
+            ],
+            1: [{"Items": [_item("task-3")]}],
+        }
+
+        # テスト実行
+        checkpoint = self._migration().run()
+
+        # 検証
+        self.assertEqual(self.client.put_item.call_count, 3)
+        kwargs = self.client.put_item.call_args.kwargs
+        self.assertEqual(kwargs["TableName"], "UserTasks")
+        self.assertEqual(kwargs["ConditionExpression"], "attribute_not_exists(task_id) OR #updated_at < :updated_at")
+        self.assertTrue(checkpoint.done)
+        self.assertEqual(checkpoint.totals(), {"scanned": 3, "copied": 3, "skipped": 0})
+        self.assertEqual(checkpoint.user_ids, ["other-user-id", "test-user-id"])
+        # チェックポイントには進捗のみ保存し、ユーザーは別のファイルに追記する
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            saved = json.load(f)
+        self.assertTrue(all(segment["done"] for segment in saved["segments"]))
+        self.assertNotIn("user_ids", saved)
+        with open(self.checkpoint_path + ".users", encoding="utf-8") as f:
+            self.assertEqual(sorted(json.loads(line) for line in f), ["other-user-id", "test-user-id"])
+
+    def test_skips_summary_items_and_rebuilds_summaries(self):
+        # 集計項目はコピーせず、コピーしたユーザーの集計を作り直す
+        self.pages = {
+            0: [{"Items": [_item("task-1"), {"task_id": {"S": "summary#test-user-id"}, "user_id": {"S": "#summary"}}]}],
+            1: [{"Items": []}],
+        }
+        rebuilder = MagicMock()
+
+        # テスト実行
+        self._migration(summary_rebuilder=rebuilder).run()
+
+        # 検証
+        self.assertEqual(self.client.put_item.call_count, 1)
+        rebuilder.assert_called_once_with("test-user-id")
+
+    def test_derives_missing_index_keys(self):
+        # GSIの導入前のタスクは、ステータス・期限からキー属性を導出して書き込む
+        legacy = dict(_item("task-1"), status={"S": "完了"}, due_date={"NULL": True})
+        self.pages = {0: [{"Items": [legacy]}], 1: [{"Items": []}]}
+
+        # テスト実行
+        self._migration().run()
+
+        # 検証
+        item = self.client.put_item.call_args.kwargs["Item"]
+        self.assertEqual(item["user_status"], {"S": "test-user-id#完了"})
+        self.assertEqual(item["due_sort"], {"S": "~"})
+
+    def test_newer_target_items_are_not_overwritten(self):
+        # 移行先に同じか新しい項目がある場合は書き込まない
+        self.pages = {0: [{"Items": [_item("task-1"), _item("task-2")]}], 1: [{"Items": []}]}
+        self.client.put_item.side_effect = [
+            ClientError({"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}}, "PutItem"),
+            {},
+        ]
+
+        # テスト実行
+        checkpoint = self._migration().run()
+
+        # 検証
+        self.assertEqual(checkpoint.totals(), {"scanned": 2, "copied": 1, "skipped": 1})
+
+    def test_resumes_from_checkpoint(self):
+        # 中断したセグメントは保存したLastEvaluatedKeyから再開し、完了したセグメントは読み込まない
+        last_key = {"task_id": {"S": "task-1"}, "user_id": {"S": "test-user-id"}}
+        self.pages = {
+            0: [
+                {"Items": [_item("task-1")], "LastEvaluatedKey": last_key},
+                {"Items": [_item("task-2")]},
+            ],
+            1: [{"Items": [_item("task-3")]}],
+        }
+        # セグメント0の2ページ目の書き込みで中断する
+        self.client.put_item.side_effect = [{}, ClientError(
+            {"Error": {"Code": "ProvisionedThroughputExceededException", "Message": "throttled"}}, "PutItem"
+        ), {}]
+        with self.assertRaises(ClientError):
+            self._migration(max_workers=1).run()
+
+        # テスト実行
+        self.client.put_item.side_effect = None
+        self.pages[0] = [{"Items": [_item("task-2", "other-user-id")]}]
+        self.client.scan.reset_mock()
+        checkpoint = self._migration().run()
+
+        # 検証
+        self.client.scan.assert_called_once()
+        resumed_scan = self.client.scan.call_args.kwargs
+        self.assertEqual(resumed_scan["Segment"], 0)
+        self.assertEqual(resumed_scan["ExclusiveStartKey"], last_key)
+        self.assertTrue(checkpoint.done)
+        self.assertEqual(checkpoint.totals()["copied"], 3)
+        # 中断前に追記したユーザーも集計を作り直す対象に含める
+        self.assertEqual(checkpoint.user_ids, ["other-user-id", "test-user-id"])
+
+    def test_ignores_partially_appended_user_id(self):
+        # ユーザーの追記中に中断した最後の行は読み込まず、書き直す
+        MigrationCheckpoint(
+            source_table="Tasks", target_table="UserTasks", total_segments=2,
+            segments=[SegmentProgress(), SegmentProgress()]
+        ).save(self.checkpoint_path)
+        with open(self.checkpoint_path + ".users", "w", encoding="utf-8") as f:
+            f.write('"user-a"\n"user-b')
+        self.pages = {0: [{"Items": [_item("task-1")]}], 1: [{"Items": []}]}
+
+        # テスト実行
+        checkpoint = self._migration().run()
+
+        # 検証
+        self.assertEqual(checkpoint.user_ids, ["test-user-id", "user-a"])
+        with open(self.checkpoint_path + ".users", encoding="utf-8") as f:
+            self.assertEqual(sorted(json.loads(line) for line in f), ["test-user-id", "user-a"])
+
+    def test_rejects_checkpoint_of_other_migration(self):
+        # 異なる条件の移行のチェックポイントでは再開しない
+        MigrationCheckpoint(source_table="Tasks", target_table="Other", total_segments=2).save(
+            self.checkpoint_path
+        )
+
+        # テスト実行・検証
+        with self.assertRaises(ValueError):
+            self._migration()
+
+    def test_is_summary_item(self):
+        # どちらのキーの構成の集計項目も判定する
+        self.assertTrue(is_summary_item({"task_id": {"S": "summary#u"}, "user_id": {"S": "#summary"}}))
+        self.assertTrue(is_summary_item({"user_id": {"S": "summary#u"}, "task_id": {"S": "#summary"}}))
+        self.assertFalse(is_summary_item(_item("task-1")))
+
+
+class TestTaskIndexBackfill(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.checkpoint_path = os.path.join(temp_dir.name, "backfill.json")
+
+    @staticmethod
+    def _task_item(task_id, status="未着手", due_date=None, updated_at="2024-01-01T00:00:00"):
+        item = dict(_item(task_id, updated_at=updated_at), status={"S": status})
+        item["due_date"] = {"S": due_date} if due_date else {"NULL": True}
+        return item
+
+    def test_writes_index_keys(self):
+        # キー属性のないタスクだけをScanし、ステータス・期限から導出した値を書き込む
+        self.client.scan.return_value = {"Items": [
+            self._task_item("task-1", due_date="2024-02-01T00:00:00"), self._task_item("task-2", status="完了")
+        ]}
+
+        # テスト実行
+        checkpoint = TaskIndexBackfill(self.client, "Tasks", self.checkpoint_path, total_segments=1).run()
+
+        # 検証
+        scan_kwargs = self.client.scan.call_args.kwargs
+        self.assertEqual(scan_kwargs["TableName"], "Tasks")
+        self.assertIn("attribute_not_exists(#user_status)", scan_kwargs["FilterExpression"])
+        first, second = [call.kwargs for call in self.client.update_item.call_args_list]
+        self.assertEqual(first["Key"], {"task_id": {"S": "task-1"}, "user_id": {"S": "test-user-id"}})
+        self.assertEqual(first["ExpressionAttributeValues"][":user_status"], {"S": "test-user-id#未着手"})
+        self.assertEqual(first["ExpressionAttributeValues"][":due_sort"], {"S": "2024-02-01T00:00:00"})
+        self.assertEqual(first["ExpressionAttributeValues"][":updated_at"], {"S": "2024-01-01T00:00:00"})
+        self.assertEqual(second["ExpressionAttributeValues"][":due_sort"], {"S": "~"})
+        self.assertEqual(checkpoint.totals(), {"scanned": 2, "copied": 2, "skipped": 0})
+
+    def test_rereads_tasks_updated_during_backfill(self):
+        # 読み込んだ後に更新されたタスクは読み込み直し、まだキー属性がない場合のみ書き直す
+        self.client.scan.return_value = {"Items": [self._task_item("task-1"), self._task_item("task-2")]}
+        condition_failed = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}}, "UpdateItem"
+        )
+        self.client.update_item.side_effect = [condition_failed, {}, condition_failed]
+        updated_task_1 = self._task_item("task-1", status="進行中", updated_at="2024-01-02T00:00:00")
+        updated_task_2 = dict(
+            self._task_item("task-2"), user_status={"S": "test-user-id#未着手"}, due_sort={"S": "~"}
+        )
+        self.client.get_item.side_effect = [{"Item": updated_task_1}, {"Item": updated_task_2}]
+
+        # テスト実行
+        checkpoint = TaskIndexBackfill(self.client, "Tasks", self.checkpoint_path, total_segments=1).run()
+
+        # 検証（task-1は新しいステータスで書き込み、キー属性を持つようになったtask-2は書き込まない）
+        retried = self.client.update_item.call_args_list[1].kwargs
+        self.assertEqual(retried["ExpressionAttributeValues"][":user_status"], {"S": "test-user-id#進行中"})
+        self.assertEqual(retried["ExpressionAttributeValues"][":updated_at"], {"S": "2024-01-02T00:00:00"})
+        self.assertEqual(self.client.update_item.call_count, 3)
+        self.assertEqual(checkpoint.totals(), {"scanned": 2, "copied": 1, "skipped": 1})
+
+    def test_index_key_attributes(self):
+        # 期限のないタスクのdue_sortは最後に並ぶ値
+        self.assertEqual(
+            index_key_attributes(self._task_item("task-1")),
+            {"user_status": {"S": "test-user-id#未着手"}, "due_sort": {"S": "~"}}
+        )
+
+
+class TestTaskSummaryRebuild(unittest.TestCase):
+    def test_rebuilds_summaries_of_scanned_users(self):
+        # user_idのみをScanし、タスク・墓標のあるユーザーの集計を作り直す（項目は書き込まない）
+        client = MagicMock()
+        client.scan.return_value = {"Items": [
+            {"user_id": {"S": "user-b"}}, {"user_id": {"S": "user-a"}}, {"user_id": {"S": "user-b"}}
+        ]}
+        rebuilder = MagicMock()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            rebuild = TaskSummaryRebuild(
+                client, "Tasks", os.path.join(temp_dir, "summaries.json"), rebuilder, total_segments=1
+            )
+
+            # テスト実行
+            checkpoint = rebuild.run()
+
+        # 検証
+        scan_kwargs = client.scan.call_args.kwargs
+        self.assertEqual(scan_kwargs["ProjectionExpression"], "user_id")
+        self.assertEqual(scan_kwargs["FilterExpression"], "attribute_exists(#status) OR attribute_exists(deleted)")
+        self.assertEqual([call.args for call in rebuilder.call_args_list], [("user-a",), ("user-b",)])
+        self.assertEqual(checkpoint.totals()["scanned"], 3)
+        client.put_item.assert_not_called()
+        client.update_item.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
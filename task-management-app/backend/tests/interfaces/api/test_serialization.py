@@ -0,0 +1,47 @@
+import json
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+from backend.application.dtos.task_dto import TaskDTO
+from backend.domain.entities.task import Task
+from backend.interfaces.api import serialization
+from backend.interfaces.api.serialization import to_json, to_json_bytes
+
+
+class TestSerialization(unittest.TestCase):
+    def setUp(self):
+        self.test_task = Task(
+            task_id="test-task-id",
+            title="テストタスク",
+            user_id="test-user-id",
+            created_at=datetime(2023, 1, 1),
+            updated_at=datetime(2023, 1, 2)
+        )
+        self.test_task_dto = TaskDTO.from_entity(self.test_task)
+
+    def _assert_encodes(self):
+        # DTO・エンティティ・Decimalを直接エンコードできる
+        body = json.loads(to_json({"dto": self.test_task_dto, "task": self.test_task, "version": Decimal("3")}))
+
+        self.assertEqual(body["dto"], self.test_task_dto.__dict__)
+        self.assertEqual(body["task"], self.test_task.to_dict())
+        self.assertEqual(body["version"], 3)
+
+    def test_encode(self):
+        self._assert_encodes()
+
+    def test_encode_without_orjson(self):
+        # 高速なエンコーダーがない場合は標準ライブラリを使用する
+        with patch.object(serialization, "orjson", None):
+            self._assert_encodes()
+
+    def test_non_ascii_is_not_escaped(self):
+        # 日本語はエスケープせずUTF-8で出力する
+        with patch.object(serialization, "orjson", None):
+            self.assertEqual(to_json_bytes({"title": "テスト"}), '{"title":"テスト"}'.encode("utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
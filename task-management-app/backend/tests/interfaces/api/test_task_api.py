@@ -4,7 +4,10 @@ from unittest.mock import Mock, patch
 from datetime import datetime
 
 from backend.interfaces.api.task_api import TaskAPI
-from backend.application.dtos.task_dto import TaskDTO
+from backend.application.dtos.task_dto import TaskDTO, TaskSummaryDTO
+from backend.domain.repositories.task_repository import TaskChangePage, TaskItemPage
+from backend.domain.exceptions.task_exceptions import TaskConflictError, TaskNotFoundError
+from backend.domain.value_objects.task_status import TaskStatus
 
 
 class TestTaskAPI(unittest.TestCase):
@@ -23,7 +26,8 @@ class TestTaskAPI(unittest.TestCase):
             due_date=datetime(2023, 12, 31).isoformat(),
             user_id="test-user-id",
             created_at=datetime(2023, 1, 1).isoformat(),
-            updated_at=datetime(2023, 1, 1).isoformat()
+            updated_at=datetime(2023, 1, 1).isoformat(),
+            version=1
         )
         
         # テスト用のイベント
@@ -46,16 +50,21 @@ class TestTaskAPI(unittest.TestCase):
         self.mock_auth_service.get_user_id_from_token.return_value = "test-user-id"
     
     def test_handle_get_all_tasks(self):
-        # get_all_tasksのモック設定
-        self.mock_task_use_cases.get_all_tasks.return_value = [self.test_task_dto]
+        # get_all_task_itemsのモック設定
+        self.mock_task_use_cases.get_all_task_items.return_value = TaskItemPage(
+            items=[self.test_task_dto.__dict__]
+        )
         
         # テスト実行
         result = self.task_api.handle_get_all_tasks(self.test_event)
         
         # 検証
         self.mock_auth_service.get_user_id_from_token.assert_called_once_with("test-token")
-        self.mock_task_use_cases.get_all_tasks.assert_called_once_with("test-user-id")
+        self.mock_task_use_cases.get_all_task_items.assert_called_once_with(
+            "test-user-id", limit=None, next_token=None
+        )
         self.assertEqual(result["statusCode"], 200)
+        self.assertNotIn("X-Next-Token", result["headers"])
         
         # レスポンスボディの検証
         body = json.loads(result["body"])
@@ -63,6 +72,103 @@ class TestTaskAPI(unittest.TestCase):
         self.assertEqual(body[0]["task_id"], "test-task-id")
         self.assertEqual(body[0]["title"], "テストタスク")
     
+    def test_handle_get_all_tasks_with_pagination(self):
+        # get_all_task_itemsのモック設定（次のページあり）
+        self.mock_task_use_cases.get_all_task_items.return_value = TaskItemPage(
+            items=[self.test_task_dto.__dict__], next_token="next-token"
+        )
+        self.test_event["queryStringParameters"] = {"limit": "10", "next_token": "prev-token"}
+        
+        # テスト実行
+        result = self.task_api.handle_get_all_tasks(self.test_event)
+        
+        # 検証
+        self.mock_task_use_cases.get_all_task_items.assert_called_once_with(
+            "test-user-id", limit=10, next_token="prev-token"
+        )
+        self.assertEqual(result["statusCode"], 200)
+        self.assertEqual(result["headers"]["X-Next-Token"], "next-token")
+    
+    def test_handle_get_all_tasks_invalid_limit(self):
+        # 数値以外のlimit
+        self.test_event["queryStringParameters"] = {"limit": "abc"}
+        
+        # テスト実行
+        result = self.task_api.handle_get_all_tasks(self.test_event)
+        
+        # 検証
+        self.mock_task_use_cases.get_all_task_items.assert_not_called()
+        self.assertEqual(result["statusCode"], 400)
+    
+    def test_handle_get_all_tasks_with_filters(self):
+        # 絞り込み・並べ替えのモック設定
+        self.mock_task_use_cases.search_task_items.return_value = TaskItemPage(
+            items=[self.test_task_dto.__dict__]
+        )
+        self.test_event["queryStringParameters"] = {"status": "未着手", "sort": "due_date", "limit": "5"}
+        
+        # テスト実行
+        result = self.task_api.handle_get_all_tasks(self.test_event)
+        
+        # 検証
+        self.mock_task_use_cases.search_task_items.assert_called_once_with(
+            "test-user-id", status="未着手", due_after=None, due_before=None, sort="due_date",
+            created_after=None, limit=5, next_token=None
+        )
+        self.mock_task_use_cases.get_all_task_items.assert_not_called()
+        self.assertEqual(result["statusCode"], 200)
+        self.assertEqual(json.loads(result["body"])[0]["task_id"], "test-task-id")
+    
+    def test_handle_get_all_tasks_newest_first(self):
+        # 作成順の並べ替えはテーブルのキーの構成が対応していない場合400
+        self.mock_task_use_cases.search_task_items.side_effect = ValueError(
+            "Ordering by creation time requires TASK_TABLE_KEY_LAYOUT=user"
+        )
+        self.test_event["queryStringParameters"] = {"sort": "-created_at", "created_after": "2024-01-01T00:00:00Z"}
+        
+        # テスト実行
+        result = self.task_api.handle_get_all_tasks(self.test_event)
+        
+        # 検証
+        kwargs = self.mock_task_use_cases.search_task_items.call_args.kwargs
+        self.assertEqual(kwargs["sort"], "-created_at")
+        self.assertEqual(kwargs["created_after"], "2024-01-01T00:00:00Z")
+        self.assertEqual(result["statusCode"], 400)
+    
+    def test_handle_get_all_tasks_since(self):
+        # 差分同期のモック設定
+        self.mock_task_use_cases.get_task_changes.return_value = TaskChangePage(
+            items=[self.test_task_dto.__dict__],
+            deleted_task_ids=["deleted-task-id"],
+            last_updated_at="2023-01-02T00:00:00"
+        )
+        self.test_event["queryStringParameters"] = {"since": "2023-01-01T00:00:00"}
+        
+        # テスト実行
+        result = self.task_api.handle_get_all_tasks(self.test_event)
+        
+        # 検証
+        self.mock_task_use_cases.get_task_changes.assert_called_once_with(
+            "test-user-id", "2023-01-01T00:00:00", limit=None, next_token=None
+        )
+        self.mock_task_use_cases.get_all_task_items.assert_not_called()
+        self.assertEqual(result["statusCode"], 200)
+        body = json.loads(result["body"])
+        self.assertEqual(body["tasks"][0]["task_id"], "test-task-id")
+        self.assertEqual(body["deleted_task_ids"], ["deleted-task-id"])
+        self.assertEqual(body["next_since"], "2023-01-02T00:00:00")
+    
+    def test_handle_get_all_tasks_since_invalid(self):
+        # 不正な時刻は400
+        self.mock_task_use_cases.get_task_changes.side_effect = ValueError("since must be an ISO 8601 timestamp")
+        self.test_event["queryStringParameters"] = {"since": "yesterday"}
+        
+        # テスト実行
+        result = self.task_api.handle_get_all_tasks(self.test_event)
+        
+        # 検証
+        self.assertEqual(result["statusCode"], 400)
+    
     def test_handle_get_task(self):
         # get_taskのモック設定
         self.mock_task_use_cases.get_task.return_value = self.test_task_dto
@@ -80,6 +186,96 @@ class TestTaskAPI(unittest.TestCase):
         self.assertEqual(body["task_id"], "test-task-id")
         self.assertEqual(body["title"], "テストタスク")
     
+    def test_handle_get_task_not_modified(self):
+        # get_taskのモック設定
+        self.mock_task_use_cases.get_task.return_value = self.test_task_dto
+        first = self.task_api.handle_get_task(self.test_event)
+        etag = first["headers"]["ETag"]
+        self.assertEqual(first["headers"]["Cache-Control"], "private, no-cache")
+
+        # テスト実行（取得したETagで再検証）
+        self.test_event["headers"]["if-none-match"] = etag
+        result = self.task_api.handle_get_task(self.test_event)
+
+        # 検証
+        self.assertEqual(result["statusCode"], 304)
+        self.assertEqual(result["body"], "")
+        self.assertEqual(result["headers"]["ETag"], etag)
+
+    def test_handle_get_task_modified(self):
+        # 古いETagで再検証した後にタスクが更新されている場合
+        self.mock_task_use_cases.get_task.return_value = self.test_task_dto
+        etag = self.task_api.handle_get_task(self.test_event)["headers"]["ETag"]
+        self.test_task_dto.version = 2
+        self.test_event["headers"]["If-None-Match"] = etag
+
+        # テスト実行
+        result = self.task_api.handle_get_task(self.test_event)
+
+        # 検証
+        self.assertEqual(result["statusCode"], 200)
+        self.assertNotEqual(result["headers"]["ETag"], etag)
+
+    def test_handle_get_all_tasks_not_modified(self):
+        # get_all_task_itemsのモック設定
+        self.mock_task_use_cases.get_all_task_items.return_value = TaskItemPage(
+            items=[self.test_task_dto.__dict__]
+        )
+        etag = self.task_api.handle_get_all_tasks(self.test_event)["headers"]["ETag"]
+
+        # テスト実行（複数のETagを指定）
+        self.test_event["headers"]["If-None-Match"] = f'"other", {etag}'
+        result = self.task_api.handle_get_all_tasks(self.test_event)
+
+        # 検証
+        self.assertEqual(result["statusCode"], 304)
+        self.assertEqual(result["body"], "")
+
+        # タスクが追加されるとETagが変わる
+        self.mock_task_use_cases.get_all_task_items.return_value = TaskItemPage(
+            items=[self.test_task_dto.__dict__, dict(self.test_task_dto.__dict__, task_id="other-id")]
+        )
+        result = self.task_api.handle_get_all_tasks(self.test_event)
+        self.assertEqual(result["statusCode"], 200)
+
+    def test_handle_get_task_summary(self):
+        # get_task_summaryのモック設定
+        self.mock_task_use_cases.get_task_summary.return_value = TaskSummaryDTO(
+            total=3, by_status={"未着手": 2, "進行中": 0, "完了": 1}
+        )
+        
+        # テスト実行
+        result = self.task_api.handle_get_task_summary(self.test_event)
+        
+        # 検証
+        self.mock_task_use_cases.get_task_summary.assert_called_once_with("test-user-id")
+        self.assertEqual(result["statusCode"], 200)
+        self.assertEqual(
+            json.loads(result["body"]), {"total": 3, "by_status": {"未着手": 2, "進行中": 0, "完了": 1}}
+        )
+        
+        # 件数が変わらなければ304を返す
+        self.test_event["headers"]["If-None-Match"] = result["headers"]["ETag"]
+        self.assertEqual(self.task_api.handle_get_task_summary(self.test_event)["statusCode"], 304)
+    
+    def test_handle_get_task_summary_changed(self):
+        # 件数が変わるとETagも変わる
+        self.mock_task_use_cases.get_task_summary.return_value = TaskSummaryDTO(
+            total=1, by_status={"未着手": 1, "進行中": 0, "完了": 0}
+        )
+        etag = self.task_api.handle_get_task_summary(self.test_event)["headers"]["ETag"]
+        self.mock_task_use_cases.get_task_summary.return_value = TaskSummaryDTO(
+            total=1, by_status={"未着手": 0, "進行中": 1, "完了": 0}
+        )
+        self.test_event["headers"]["If-None-Match"] = etag
+        
+        # テスト実行
+        result = self.task_api.handle_get_task_summary(self.test_event)
+        
+        # 検証
+        self.assertEqual(result["statusCode"], 200)
+        self.assertNotEqual(result["headers"]["ETag"], etag)
+    
     def test_handle_create_task(self):
         # create_taskのモック設定
         self.mock_task_use_cases.create_task.return_value = self.test_task_dto
@@ -97,24 +293,167 @@ class TestTaskAPI(unittest.TestCase):
         self.assertEqual(body["task_id"], "test-task-id")
         self.assertEqual(body["title"], "テストタスク")
     
+    def test_handle_create_task_without_status_defaults_to_not_started(self):
+        # ステータスを省略したボディ
+        self.mock_task_use_cases.create_task.return_value = self.test_task_dto
+        event = dict(self.test_event, body=json.dumps({"title": "テストタスク"}))
+
+        # テスト実行
+        result = self.task_api.handle_create_task(event)
+
+        # 検証（未指定のステータスはエンティティへの変換時に未着手となる）
+        self.assertEqual(result["statusCode"], 201)
+        task_dto = self.mock_task_use_cases.create_task.call_args[0][0]
+        self.assertEqual(task_dto.to_entity().status, TaskStatus.NOT_STARTED)
+
     def test_handle_update_task(self):
-        # get_taskとupdate_taskのモック設定
-        self.mock_task_use_cases.get_task.return_value = self.test_task_dto
-        self.mock_task_use_cases.update_task.return_value = self.test_task_dto
+        # patch_taskのモック設定
+        self.mock_task_use_cases.patch_task.return_value = self.test_task_dto
         
         # テスト実行
         result = self.task_api.handle_update_task(self.test_event)
         
-        # 検証
+        # 検証（事前の取得は行わず、ボディのフィールドを1回の書き込みで更新する）
         self.mock_auth_service.get_user_id_from_token.assert_called_once_with("test-token")
-        self.mock_task_use_cases.get_task.assert_called_once_with("test-task-id", "test-user-id")
-        self.mock_task_use_cases.update_task.assert_called_once()
+        self.mock_task_use_cases.get_task.assert_not_called()
+        self.mock_task_use_cases.patch_task.assert_called_once_with(
+            "test-task-id",
+            "test-user-id",
+            {"title": "テストタスク", "description": "これはテストタスクです", "status": "未着手", "due_date": "2023-12-31"},
+            None
+        )
         self.assertEqual(result["statusCode"], 200)
         
         # レスポンスボディの検証
         body = json.loads(result["body"])
         self.assertEqual(body["task_id"], "test-task-id")
         self.assertEqual(body["title"], "テストタスク")
+        self.assertEqual(body["version"], 1)
+        self.assertEqual(result["headers"]["ETag"], '"1"')
+    
+    def test_handle_update_task_merges_fields(self):
+        # ボディに含まれないフィールドは変更しない（未知の属性は無視する）
+        self.mock_task_use_cases.patch_task.return_value = self.test_task_dto
+        self.test_event["body"] = json.dumps({"status": "完了", "task_id": "other-task-id"})
+        
+        # テスト実行
+        result = self.task_api.handle_update_task(self.test_event)
+        
+        # 検証
+        self.mock_task_use_cases.patch_task.assert_called_once_with(
+            "test-task-id", "test-user-id", {"status": "完了"}, None
+        )
+        self.assertEqual(result["statusCode"], 200)
+    
+    def test_handle_update_task_empty_title(self):
+        # 空のタイトルには更新できない
+        self.test_event["body"] = json.dumps({"title": ""})
+        
+        # テスト実行
+        result = self.task_api.handle_update_task(self.test_event)
+        
+        # 検証
+        self.assertEqual(result["statusCode"], 400)
+        self.mock_task_use_cases.patch_task.assert_not_called()
+    
+    def test_handle_update_task_if_match(self):
+        # If-MatchのETagの版を条件に更新し、一致しない場合は412
+        self.test_event["headers"]["If-Match"] = '"3"'
+        self.mock_task_use_cases.patch_task.side_effect = TaskConflictError("test-task-id")
+        
+        # テスト実行
+        result = self.task_api.handle_update_task(self.test_event)
+        
+        # 検証
+        self.assertEqual(self.mock_task_use_cases.patch_task.call_args[0][3], 3)
+        self.assertEqual(result["statusCode"], 412)
+    
+    def test_handle_update_task_version_conflict(self):
+        # ボディの版が一致しない場合は409（版は更新するフィールドに含めない）
+        self.test_event["body"] = json.dumps({"title": "更新されたタスク", "version": 3})
+        self.mock_task_use_cases.patch_task.side_effect = TaskConflictError("test-task-id")
+        
+        # テスト実行
+        result = self.task_api.handle_update_task(self.test_event)
+        
+        # 検証
+        self.mock_task_use_cases.patch_task.assert_called_once_with(
+            "test-task-id", "test-user-id", {"title": "更新されたタスク"}, 3
+        )
+        self.assertEqual(result["statusCode"], 409)
+    
+    def test_handle_update_task_invalid_if_match(self):
+        # タスクのETagではないIf-Matchは400
+        for value in ('W/"3"', '"3", "4"', '"abc"'):
+            self.test_event["headers"]["If-Match"] = value
+            
+            # テスト実行
+            result = self.task_api.handle_update_task(self.test_event)
+            
+            # 検証
+            self.assertEqual(result["statusCode"], 400)
+        self.mock_task_use_cases.patch_task.assert_not_called()
+    
+    def test_handle_update_task_not_found(self):
+        # 存在しないタスクの更新は404
+        self.mock_task_use_cases.patch_task.side_effect = TaskNotFoundError("test-task-id")
+        
+        # テスト実行
+        result = self.task_api.handle_update_task(self.test_event)
+        
+        # 検証
+        self.assertEqual(result["statusCode"], 404)
+    
+    def test_handle_patch_task(self):
+        # patch_taskのモック設定
+        self.mock_task_use_cases.patch_task.return_value = self.test_task_dto
+        self.test_event["body"] = json.dumps({"status": "進行中"})
+        
+        # テスト実行
+        result = self.task_api.handle_patch_task(self.test_event)
+        
+        # 検証
+        self.mock_task_use_cases.patch_task.assert_called_once_with(
+            "test-task-id", "test-user-id", {"status": "進行中"}, None
+        )
+        self.assertEqual(result["statusCode"], 200)
+    
+    def test_handle_patch_task_with_version(self):
+        # ボディの版は変更するフィールドに含めない
+        self.mock_task_use_cases.patch_task.return_value = self.test_task_dto
+        self.test_event["body"] = json.dumps({"status": "進行中", "version": 1})
+        self.test_event["headers"]["if-match"] = '"1"'
+        
+        # テスト実行
+        result = self.task_api.handle_patch_task(self.test_event)
+        
+        # 検証
+        self.mock_task_use_cases.patch_task.assert_called_once_with(
+            "test-task-id", "test-user-id", {"status": "進行中"}, 1
+        )
+        self.assertEqual(result["headers"]["ETag"], '"1"')
+    
+    def test_handle_patch_task_only_version(self):
+        # 版のみの場合は更新するフィールドがないため400
+        self.test_event["body"] = json.dumps({"version": 1})
+        
+        # テスト実行
+        result = self.task_api.handle_patch_task(self.test_event)
+        
+        # 検証
+        self.mock_task_use_cases.patch_task.assert_not_called()
+        self.assertEqual(result["statusCode"], 400)
+    
+    def test_handle_patch_task_empty_body(self):
+        # 更新するフィールドがない場合は400
+        self.test_event["body"] = json.dumps({})
+        
+        # テスト実行
+        result = self.task_api.handle_patch_task(self.test_event)
+        
+        # 検証
+        self.mock_task_use_cases.patch_task.assert_not_called()
+        self.assertEqual(result["statusCode"], 400)
     
     def test_handle_delete_task(self):
         # delete_taskのモック設定
@@ -128,6 +467,56 @@ class TestTaskAPI(unittest.TestCase):
         self.mock_task_use_cases.delete_task.assert_called_once_with("test-task-id", "test-user-id")
         self.assertEqual(result["statusCode"], 204)
     
+    def test_handle_delete_task_not_found(self):
+        # 存在しないタスクの削除は404
+        self.mock_task_use_cases.delete_task.side_effect = TaskNotFoundError("test-task-id")
+        
+        # テスト実行
+        result = self.task_api.handle_delete_task(self.test_event)
+        
+        # 検証
+        self.assertEqual(result["statusCode"], 404)
+    
+    def test_handle_batch_create(self):
+        # create_tasksのモック設定
+        self.mock_task_use_cases.create_tasks.return_value = [self.test_task_dto]
+        self.test_event["body"] = json.dumps({"operation": "create", "tasks": [{"title": "テストタスク"}]})
+        
+        # テスト実行
+        result = self.task_api.handle_batch_tasks(self.test_event)
+        
+        # 検証（ユーザーIDはトークンから設定される）
+        task_dtos = self.mock_task_use_cases.create_tasks.call_args.args[0]
+        self.assertEqual(task_dtos[0].user_id, "test-user-id")
+        self.assertEqual(result["statusCode"], 201)
+    
+    def test_handle_batch_get_and_delete(self):
+        # get_tasksとdelete_tasksのモック設定
+        self.mock_task_use_cases.get_tasks.return_value = [self.test_task_dto]
+        self.mock_task_use_cases.delete_tasks.return_value = 1
+        
+        # テスト実行
+        self.test_event["body"] = json.dumps({"operation": "get", "task_ids": ["test-task-id"]})
+        get_result = self.task_api.handle_batch_tasks(self.test_event)
+        self.test_event["body"] = json.dumps({"operation": "delete", "task_ids": ["test-task-id"]})
+        delete_result = self.task_api.handle_batch_tasks(self.test_event)
+        
+        # 検証
+        self.mock_task_use_cases.get_tasks.assert_called_once_with(["test-task-id"], "test-user-id")
+        self.assertEqual(json.loads(get_result["body"])[0]["task_id"], "test-task-id")
+        self.mock_task_use_cases.delete_tasks.assert_called_once_with(["test-task-id"], "test-user-id")
+        self.assertEqual(json.loads(delete_result["body"]), {"deleted_count": 1})
+    
+    def test_handle_batch_invalid_operation(self):
+        # 不明な操作は400
+        self.test_event["body"] = json.dumps({"operation": "update"})
+        
+        # テスト実行
+        result = self.task_api.handle_batch_tasks(self.test_event)
+        
+        # 検証
+        self.assertEqual(result["statusCode"], 400)
+    
     def test_unauthorized_request(self):
         # 認証失敗のモック設定
         self.mock_auth_service.get_user_id_from_token.return_value = None
@@ -137,7 +526,7 @@ class TestTaskAPI(unittest.TestCase):
         
         # 検証
         self.mock_auth_service.get_user_id_from_token.assert_called_once_with("test-token")
-        self.mock_task_use_cases.get_all_tasks.assert_not_called()
+        self.mock_task_use_cases.get_all_task_items.assert_not_called()
         self.assertEqual(result["statusCode"], 401)
         
         # レスポンスボディの検証
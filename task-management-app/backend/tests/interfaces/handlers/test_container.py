@@ -0,0 +1,46 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from backend.infrastructure.persistence.caching_task_repository import CachingTaskRepository
+from backend.infrastructure.persistence.dynamodb_task_repository import DynamoDBTaskRepository
+from backend.interfaces.handlers.container import Container
+
+
+class TestContainer(unittest.TestCase):
+    def setUp(self):
+        # boto3のリソースとセッションのモック
+        resource_patcher = patch("boto3.resource", return_value=MagicMock())
+        session_patcher = patch("boto3.session.Session", return_value=MagicMock())
+        resource_patcher.start()
+        session_patcher.start()
+        self.addCleanup(resource_patcher.stop)
+        self.addCleanup(session_patcher.stop)
+
+    def test_cache_disabled(self):
+        # キャッシュが無効な場合はリポジトリをそのまま使用する
+        with patch.dict(os.environ, {"TASK_CACHE_ENABLED": "false"}):
+            container = Container()
+
+            # テスト実行
+            repository = container.task_repository
+
+        # 検証
+        self.assertIsNone(container.task_cache_store)
+        self.assertIsInstance(repository, DynamoDBTaskRepository)
+
+    def test_cache_enabled(self):
+        # キャッシュが有効な場合は、コンテナの保存先のキャッシュで包む
+        with patch.dict(os.environ, {"TASK_CACHE_ENABLED": "true"}):
+            container = Container()
+
+            # テスト実行
+            repository = container.task_repository
+
+        # 検証
+        self.assertIsInstance(repository, CachingTaskRepository)
+        self.assertIs(container.task_cache_store, repository._store)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import io
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+from backend.interfaces.handlers import lambda_handler
+from backend.interfaces.handlers.container import Container
+from backend.shared import structured_logging, tracing
+
+
+class TestLambdaHandler(unittest.TestCase):
+    def setUp(self):
+        # テストごとに新しいコンテナを使用する
+        self.container = Container()
+        patcher = patch.object(lambda_handler, "container", self.container)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_options_does_not_build_components(self):
+        # プリフライトリクエストでは依存関係を構築しない
+        result = lambda_handler.handler({"httpMethod": "OPTIONS", "resource": "/tasks"}, None)
+
+        self.assertEqual(result["statusCode"], 200)
+        self.assertEqual(self.container.init_timings, {})
+
+    def test_not_found_does_not_build_components(self):
+        # 未定義のルートでは依存関係を構築しない
+        result = lambda_handler.handler({"httpMethod": "GET", "resource": "/unknown"}, None)
+
+        self.assertEqual(result["statusCode"], 404)
+        self.assertEqual(self.container.init_timings, {})
+
+    def test_task_route_builds_task_api_once(self):
+        # タスクのルートでは初回のみTaskAPIが構築される
+        mock_task_api = Mock()
+        mock_task_api.handle_get_all_tasks.return_value = {"statusCode": 200}
+
+        with patch.object(Container, "_create_task_api", return_value=mock_task_api) as mock_create:
+            for _ in range(2):
+                result = lambda_handler.handler(
+                    {"httpMethod": "GET", "resource": "/tasks", "headers": {"Authorization": "Bearer test-token"}},
+                    None
+                )
+
+        self.assertEqual(result["statusCode"], 200)
+        mock_create.assert_called_once()
+        self.assertIn("task_api", self.container.init_timings)
+
+    def test_summary_route_is_matched_before_task_id(self):
+        # /tasks/summary は /tasks/{taskId} より先に照合される
+        mock_task_api = Mock()
+        mock_task_api.handle_get_task_summary.return_value = {"statusCode": 200}
+
+        with patch.object(Container, "_create_task_api", return_value=mock_task_api):
+            result = lambda_handler.handler(
+                {
+                    "httpMethod": "GET", "resource": "/tasks/summary",
+                    "headers": {"Authorization": "Bearer test-token"}
+                },
+                None
+            )
+
+        self.assertEqual(result["statusCode"], 200)
+        mock_task_api.handle_get_task_summary.assert_called_once()
+        mock_task_api.handle_get_task.assert_not_called()
+
+    def test_missing_token_is_rejected_before_building_components(self):
+        # Bearerトークンのないリクエストは依存関係を構築せずに401を返す
+        result = lambda_handler.handler({"httpMethod": "GET", "resource": "/tasks", "headers": {}}, None)
+
+        self.assertEqual(result["statusCode"], 401)
+        self.assertEqual(self.container.init_timings, {})
+
+    def test_unsupported_method_returns_405(self):
+        # 登録されていないメソッドは405を返す
+        result = lambda_handler.handler({"httpMethod": "PATCH", "resource": "/tasks"}, None)
+
+        self.assertEqual(result["statusCode"], 405)
+        self.assertIn("POST", result["headers"]["Allow"])
+
+
+    def test_handler_exports_trace_per_request(self):
+        # トレースを有効にしてタスクのルートを呼び出す
+        exporter = tracing.InMemoryTraceExporter()
+        tracing.configure(exporter)
+        self.addCleanup(tracing.configure, None)
+        mock_task_api = Mock()
+        mock_task_api.handle_get_all_tasks.return_value = {"statusCode": 200}
+
+        # テスト実行
+        with patch.object(Container, "_create_task_api", return_value=mock_task_api):
+            lambda_handler.handler(
+                {
+                    "httpMethod": "GET",
+                    "resource": "/tasks",
+                    "headers": {"Authorization": "Bearer test-token"},
+                    "requestContext": {"requestId": "req-1"},
+                },
+                None
+            )
+
+        # 検証
+        self.assertEqual(len(exporter.records), 1)
+        self.assertEqual(exporter.records[0].name, "GET /tasks")
+        self.assertEqual(exporter.records[0].attributes, {"request_id": "req-1"})
+
+    def test_sampled_request_logs_redacted_event(self):
+        # すべてのリクエストをサンプリングする
+        stream = io.StringIO()
+        structured_logging.configure(level="INFO", sample_rate=1.0, stream=stream)
+        self.addCleanup(structured_logging.configure)
+        mock_task_api = Mock()
+        mock_task_api.handle_get_all_tasks.return_value = {"statusCode": 200}
+
+        # テスト実行
+        with patch.object(Container, "_create_task_api", return_value=mock_task_api):
+            lambda_handler.handler(
+                {
+                    "httpMethod": "GET",
+                    "resource": "/tasks",
+                    "headers": {"Authorization": "Bearer secret-token"},
+                    "requestContext": {"requestId": "req-1"},
+                },
+                None
+            )
+
+        # 検証
+        output = stream.getvalue()
+        self.assertNotIn("secret-token", output)
+        record = json.loads(output.splitlines()[0])
+        self.assertEqual(record["message"], "Received event")
+        self.assertEqual(record["request_id"], "req-1")
+        self.assertEqual(record["event"]["headers"]["Authorization"], "[REDACTED]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import json
+import unittest
+from unittest.mock import Mock
+
+from backend.interfaces.handlers.router import Router, bearer_auth_middleware, timing_middleware
+
+
+class TestRouter(unittest.TestCase):
+    def setUp(self):
+        self.router = Router()
+        self.get_handler = Mock(return_value={"statusCode": 200, "headers": {}, "body": "[]"})
+        self.post_handler = Mock(return_value={"statusCode": 201, "headers": {}, "body": "{}"})
+        self.router.add_route("GET", "/tasks", self.get_handler)
+        self.router.add_route("POST", "/tasks", self.post_handler)
+
+    def test_dispatch(self):
+        # メソッドとリソースに対応するハンドラーが呼ばれる
+        event = {"httpMethod": "POST", "resource": "/tasks"}
+
+        result = self.router.dispatch(event)
+
+        self.post_handler.assert_called_once_with(event)
+        self.get_handler.assert_not_called()
+        self.assertEqual(result["statusCode"], 201)
+
+    def test_route_decorator(self):
+        # デコレーターでもルートを登録できる
+        @self.router.route("DELETE", "/tasks/{taskId}")
+        def delete_task(event):
+            return {"statusCode": 204, "headers": {}, "body": ""}
+
+        result = self.router.dispatch({"httpMethod": "DELETE", "resource": "/tasks/{taskId}"})
+
+        self.assertEqual(result["statusCode"], 204)
+
+    def test_options(self):
+        # プリフライトではリソースで許可されたメソッドを返す
+        result = self.router.dispatch({"httpMethod": "OPTIONS", "resource": "/tasks"})
+
+        self.assertEqual(result["statusCode"], 200)
+        self.assertEqual(result["headers"]["Access-Control-Allow-Methods"], "GET,HEAD,POST,OPTIONS")
+        # 条件付きのリクエストのヘッダーを許可する
+        allowed_headers = result["headers"]["Access-Control-Allow-Headers"].split(",")
+        self.assertIn("If-None-Match", allowed_headers)
+        self.assertIn("If-Match", allowed_headers)
+
+    def test_head(self):
+        # HEADはGETのハンドラーで処理され、ボディは空になる
+        result = self.router.dispatch({"httpMethod": "HEAD", "resource": "/tasks"})
+
+        self.get_handler.assert_called_once()
+        self.assertEqual(result["statusCode"], 200)
+        self.assertEqual(result["body"], "")
+
+    def test_method_not_allowed(self):
+        # リソースは存在するがメソッドが未登録の場合は405
+        result = self.router.dispatch({"httpMethod": "PUT", "resource": "/tasks"})
+
+        self.assertEqual(result["statusCode"], 405)
+        self.assertEqual(result["headers"]["Allow"], "GET,HEAD,POST,OPTIONS")
+
+    def test_not_found(self):
+        # 未定義のリソースは404
+        result = self.router.dispatch({"httpMethod": "GET", "resource": "/unknown"})
+
+        self.assertEqual(result["statusCode"], 404)
+        self.assertEqual(json.loads(result["body"])["message"], "Not Found")
+
+    def test_middlewares_are_applied_in_order(self):
+        # 先頭のミドルウェアが最も外側で実行される
+        calls = []
+
+        def outer(event, handler):
+            calls.append("outer")
+            return handler(event)
+
+        def inner(event, handler):
+            calls.append("inner")
+            return handler(event)
+
+        self.router.add_route("GET", "/tasks/{taskId}", self.get_handler, (outer, inner))
+        self.router.dispatch({"httpMethod": "GET", "resource": "/tasks/{taskId}"})
+
+        self.assertEqual(calls, ["outer", "inner"])
+
+    def test_bearer_auth_middleware(self):
+        # トークンがない場合はハンドラーを呼ばずに401
+        handler = Mock()
+
+        result = bearer_auth_middleware({"headers": {}}, handler)
+
+        handler.assert_not_called()
+        self.assertEqual(result["statusCode"], 401)
+
+    def test_timing_middleware(self):
+        # Server-Timingヘッダーが付与される
+        result = timing_middleware({}, self.get_handler)
+
+        self.assertTrue(result["headers"]["Server-Timing"].startswith("app;dur="))
+
+
+if __name__ == "__main__":
+    unittest.main()
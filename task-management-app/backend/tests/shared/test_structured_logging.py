@@ -0,0 +1,99 @@
+import io
+import json
+import unittest
+from unittest.mock import Mock
+
+from backend.shared import structured_logging
+
+
+class TestStructuredLogging(unittest.TestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.addCleanup(structured_logging.configure)
+        self.logger = structured_logging.get_logger("test")
+
+    def _configure(self, level="INFO", sample_rate=0.0):
+        structured_logging.configure(level=level, sample_rate=sample_rate, stream=self.stream)
+
+    def _records(self):
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_records_are_buffered_until_request_ends(self):
+        self._configure()
+
+        # テスト実行
+        with structured_logging.request_context("req-1"):
+            self.logger.info("Initialized component", extra={"fields": {"component": "task_api"}})
+            buffered = self.stream.getvalue()
+
+        # 検証
+        self.assertEqual(buffered, "")
+        records = self._records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["level"], "INFO")
+        self.assertEqual(records[0]["message"], "Initialized component")
+        self.assertEqual(records[0]["request_id"], "req-1")
+        self.assertEqual(records[0]["component"], "task_api")
+
+    def test_error_flushes_immediately(self):
+        self._configure()
+
+        # テスト実行
+        with structured_logging.request_context("req-1"):
+            self.logger.error("Unexpected error")
+            flushed = self.stream.getvalue()
+
+        # 検証
+        self.assertIn("Unexpected error", flushed)
+
+    def test_debug_is_not_evaluated_below_level(self):
+        self._configure(level="INFO")
+        compute = Mock(return_value={"large": "event"})
+
+        # テスト実行
+        with structured_logging.request_context("req-1"):
+            self.logger.debug("Received event", extra={"fields": {"event": structured_logging.Lazy(compute)}})
+
+        # 検証
+        compute.assert_not_called()
+        self.assertEqual(self._records(), [])
+
+    def test_sampled_request_emits_debug_with_lazy_value(self):
+        self._configure(level="INFO", sample_rate=1.0)
+
+        # テスト実行
+        with structured_logging.request_context("req-1"):
+            self.assertTrue(structured_logging.is_sampled())
+            self.logger.debug(
+                "Received event",
+                extra={"fields": {"event": structured_logging.Lazy(lambda: {"path": "/tasks"})}}
+            )
+
+        # 検証
+        records = self._records()
+        self.assertEqual(records[0]["level"], "DEBUG")
+        self.assertEqual(records[0]["event"], {"path": "/tasks"})
+
+    def test_redact_event_hides_credentials(self):
+        event = {
+            "resource": "/tasks",
+            "headers": {"Authorization": "Bearer secret", "Content-Type": "application/json"},
+            "multiValueHeaders": {"authorization": ["Bearer secret"]},
+        }
+
+        # テスト実行
+        redacted = structured_logging.redact_event(event)
+
+        # 検証
+        self.assertEqual(redacted["headers"]["Authorization"], "[REDACTED]")
+        self.assertEqual(redacted["headers"]["Content-Type"], "application/json")
+        self.assertEqual(redacted["multiValueHeaders"]["authorization"], "[REDACTED]")
+        self.assertEqual(event["headers"]["Authorization"], "Bearer secret")
+
+    def test_invalid_level_raises(self):
+        with self.assertRaises(ValueError):
+            structured_logging.configure(level="VERBOSE")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import asyncio
+import contextvars
+import io
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.shared import tracing
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.exporter = tracing.InMemoryTraceExporter()
+        tracing.configure(self.exporter)
+        self.addCleanup(tracing.configure, None)
+
+    def test_spans_are_recorded_in_trace(self):
+        # テスト実行
+        with tracing.start_trace("GET /tasks", request_id="req-1"):
+            with tracing.span("api.authenticate"):
+                pass
+            with tracing.span("dynamodb.query") as attributes:
+                attributes["consumed_capacity"] = 0.5
+
+        # 検証
+        self.assertEqual(len(self.exporter.records), 1)
+        record = self.exporter.records[0]
+        self.assertEqual(record.name, "GET /tasks")
+        self.assertEqual(record.attributes, {"request_id": "req-1"})
+        self.assertEqual([s.name for s in record.spans], ["api.authenticate", "dynamodb.query"])
+        self.assertEqual(record.spans[1].attributes, {"consumed_capacity": 0.5})
+        self.assertGreaterEqual(record.duration_ms, record.spans[1].start_ms)
+
+    def test_span_without_trace_is_noop(self):
+        # テスト実行
+        with tracing.span("api.serialize") as attributes:
+            attributes["ignored"] = True
+
+        # 検証
+        self.assertIsNone(tracing.current_trace())
+        self.assertEqual(self.exporter.records, [])
+
+    def test_start_trace_is_noop_when_disabled(self):
+        tracing.configure(None)
+
+        # テスト実行
+        with tracing.start_trace("GET /tasks") as record:
+            with tracing.span("api.authenticate"):
+                pass
+
+        # 検証
+        self.assertIsNone(record)
+        self.assertFalse(tracing.is_enabled())
+
+    def test_span_records_error_name(self):
+        # テスト実行
+        with self.assertRaises(ValueError):
+            with tracing.start_trace("POST /tasks"):
+                with tracing.span("use_case.create_task"):
+                    raise ValueError("invalid")
+
+        # 検証
+        span_record = self.exporter.records[0].spans[0]
+        self.assertEqual(span_record.attributes, {"error": "ValueError"})
+
+    def test_traced_records_sync_and_async_functions(self):
+        @tracing.traced("service.sync")
+        def sync_function():
+            return "sync"
+
+        @tracing.traced("service.async")
+        async def async_function():
+            return "async"
+
+        # テスト実行
+        with tracing.start_trace("GET /tasks/{taskId}"):
+            sync_result = sync_function()
+            async_result = asyncio.run(async_function())
+
+        # 検証
+        self.assertEqual((sync_result, async_result), ("sync", "async"))
+        self.assertEqual(
+            [s.name for s in self.exporter.records[0].spans], ["service.sync", "service.async"]
+        )
+
+    def test_record_consumed_capacity_sums_units(self):
+        # テスト実行
+        with tracing.start_trace("POST /tasks/batch") as record:
+            tracing.record_consumed_capacity({"ConsumedCapacity": {"CapacityUnits": 1.0}})
+            tracing.record_consumed_capacity({"ConsumedCapacity": [
+                {"CapacityUnits": 2.0}, {"CapacityUnits": 0.5}
+            ]})
+            tracing.record_consumed_capacity({})
+
+        # 検証
+        self.assertEqual(record.consumed_capacity, 3.5)
+
+    def test_record_consumed_capacity_from_threads(self):
+        # スレッドプールから並行に記録しても、すべての加算が反映される
+        with tracing.start_trace("POST /tasks/batch") as record:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                for _ in range(1000):
+                    executor.submit(
+                        contextvars.copy_context().run,
+                        tracing.record_consumed_capacity, {"ConsumedCapacity": {"CapacityUnits": 1.0}}
+                    )
+
+        # 検証
+        self.assertEqual(record.consumed_capacity, 1000.0)
+
+    def test_emf_exporter_writes_one_line_per_request(self):
+        stream = io.StringIO()
+        tracing.configure(tracing.EmfStdoutTraceExporter(namespace="Test", stream=stream))
+
+        # テスト実行
+        with tracing.start_trace("GET /tasks", request_id="req-1"):
+            for _ in range(2):
+                with tracing.span("dynamodb.query"):
+                    pass
+            tracing.record_consumed_capacity({"ConsumedCapacity": {"CapacityUnits": 0.5}})
+
+        # 検証
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        document = json.loads(lines[0])
+        metrics = document["_aws"]["CloudWatchMetrics"][0]
+        self.assertEqual(metrics["Namespace"], "Test")
+        self.assertEqual(metrics["Dimensions"], [["route"]])
+        self.assertEqual(
+            [m["Name"] for m in metrics["Metrics"]], ["duration", "dynamodb.query", "consumed_capacity"]
+        )
+        self.assertEqual(document["route"], "GET /tasks")
+        self.assertEqual(document["request_id"], "req-1")
+        self.assertEqual(document["consumed_capacity"], 0.5)
+        self.assertEqual(len(document["spans"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()